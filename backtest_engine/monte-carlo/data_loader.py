@@ -16,6 +16,12 @@ from config import (
 )
 
 logging.basicConfig(level=logging.INFO)
+# Shared exchange calendar (DST, holidays, early closes) when the polygon package is on the path
+try:
+    from polygon.calendar import session_mask
+except ImportError:
+    session_mask = None
+
 logger = logging.getLogger(__name__)
 
 class DataLoader:
@@ -68,18 +74,24 @@ class DataLoader:
             df = pd.DataFrame(all_bars)
             df.set_index('timestamp', inplace=True)
             
-            # Filter to trading hours only (13:30 - 19:50 UTC)
-            df['hour'] = df.index.hour
-            df['minute'] = df.index.minute
-            
-            # Filter to trading window
-            mask = (
-                (df['hour'] > 13) | 
-                ((df['hour'] == 13) & (df['minute'] >= 30))
-            ) & (
-                (df['hour'] < 19) | 
-                ((df['hour'] == 19) & (df['minute'] <= 50))
-            )
+            # Filter to trading hours only (open until 10 minutes before the close)
+            if session_mask is not None:
+                mask = session_mask(
+                    df.index, 'regular', end_offset=pd.Timedelta(minutes=-10), inclusive='both'
+                )
+            else:
+                # Fixed UTC window (13:30 - 19:50 UTC)
+                df['hour'] = df.index.hour
+                df['minute'] = df.index.minute
+                
+                # Filter to trading window
+                mask = (
+                    (df['hour'] > 13) | 
+                    ((df['hour'] == 13) & (df['minute'] >= 30))
+                ) & (
+                    (df['hour'] < 19) | 
+                    ((df['hour'] == 19) & (df['minute'] <= 50))
+                )
             
             df_filtered = df[mask].copy()
             
@@ -20,6 +20,12 @@ from config import (
     MIN_ZONE_SIZE, MAX_ZONE_SIZE
 )
 
+# Shared exchange calendar (DST, holidays, early closes) when the polygon package is on the path
+try:
+    from polygon.calendar import session_mask
+except ImportError:
+    session_mask = None
+
 logger = logging.getLogger(__name__)
 
 class DataLoader:
@@ -75,21 +81,27 @@ class DataLoader:
             df = pd.DataFrame(all_bars)
             df.set_index('timestamp', inplace=True)
             
-            # Filter to trading hours only (13:30 - 19:50 UTC)
-            df['hour'] = df.index.hour
-            df['minute'] = df.index.minute
-            
-            # Filter to trading window  
-            mask = (
-                (df['hour'] > 13) | 
-                ((df['hour'] == 13) & (df['minute'] >= 30))
-            ) & (
-                (df['hour'] < 19) | 
-                ((df['hour'] == 19) & (df['minute'] <= 50))
-            )
+            # Filter to trading hours only (open until 10 minutes before the close)
+            if session_mask is not None:
+                mask = session_mask(
+                    df.index, 'regular', end_offset=pd.Timedelta(minutes=-10), inclusive='both'
+                )
+            else:
+                # Fixed UTC window (13:30 - 19:50 UTC)
+                df['hour'] = df.index.hour
+                df['minute'] = df.index.minute
+                
+                # Filter to trading window  
+                mask = (
+                    (df['hour'] > 13) | 
+                    ((df['hour'] == 13) & (df['minute'] >= 30))
+                ) & (
+                    (df['hour'] < 19) | 
+                    ((df['hour'] == 19) & (df['minute'] <= 50))
+                )
             
             df_filtered = df[mask].copy()
-            df_filtered = df_filtered.drop(['hour', 'minute'], axis=1)
+            df_filtered = df_filtered.drop(columns=['hour', 'minute'], errors='ignore')
             
             logger.info(f"Loaded {len(df_filtered)} minute bars for trading hours on {trade_date}")
             return df_filtered
@@ -9,6 +9,12 @@ import logging
 
 from config import STOP_OFFSET, POSITION_CLOSE_TIME, CONFLUENCE_WEIGHTS
 
+# Shared exchange calendar (DST, holidays, early closes) when the polygon package is on the path
+try:
+    from polygon.calendar import session_mask
+except ImportError:
+    session_mask = None
+
 logger = logging.getLogger(__name__)
 
 class TradeSimulator:
@@ -48,6 +54,9 @@ class TradeSimulator:
         total_bars = len(bars_df)
         logger.info(f"Starting simulation with {total_bars} bars and {len(zones_list)} zones")
         
+        # Entry-hour filter for every bar at once
+        valid_entry = self._valid_entry_mask(bars_df.index)
+        
         # Iterate through every minute bar
         for entry_idx, (timestamp, entry_bar) in enumerate(bars_df.iterrows()):
             
@@ -56,7 +65,7 @@ class TradeSimulator:
                 logger.info(f"Processing bar {entry_idx}/{total_bars} ({entry_idx/total_bars*100:.1f}%)")
             
             # Time filter - only enter trades during valid hours
-            if not self._is_valid_entry_time(timestamp):
+            if not valid_entry[entry_idx]:
                 continue
             
             # Get zones active for this bar's date
@@ -253,11 +262,14 @@ class TradeSimulator:
         
         return trade_record
     
-    def _is_valid_entry_time(self, timestamp: datetime) -> bool:
-        """Check if timestamp is during valid trading hours"""
-        hour_decimal = timestamp.hour + timestamp.minute / 60
+    def _valid_entry_mask(self, index: pd.DatetimeIndex) -> np.ndarray:
+        """Mark bars during valid trading hours (open until 30 minutes before the close)"""
+        if session_mask is not None:
+            return session_mask(index, 'regular', end_offset=pd.Timedelta(minutes=-30), inclusive='both')
+        
+        hour_decimal = index.hour + index.minute / 60
         # Trade between 13:30 and 19:30 UTC (9:30 AM - 3:30 PM ET)
-        return 13.5 <= hour_decimal <= 19.5
+        return np.asarray((hour_decimal >= 13.5) & (hour_decimal <= 19.5))
     
     def _calculate_confluence_edge(self, zone: Dict) -> float:
         """Calculate expected edge based on confluence factors"""
@@ -13,6 +13,12 @@ from datetime import datetime, timedelta
 from typing import Dict, Tuple, Optional, List
 from dataclasses import dataclass
 
+# Shared exchange calendar (DST, holidays, early closes) when the polygon package is on the path
+try:
+    from polygon.calendar import session_mask
+except ImportError:
+    session_mask = None
+
 import logging
 logger = logging.getLogger(__name__)
 
@@ -115,6 +121,31 @@ class VolumeProfile:
             
         return False
     
+    def market_hours_mask(self, timestamps: pd.Series,
+                          include_pre: bool = True,
+                          include_post: bool = True) -> np.ndarray:
+        """
+        Vectorized market-hours filter for a column of UTC timestamps.
+        
+        Uses the exchange session calendar when available, otherwise the
+        fixed UTC hours of is_market_hours.
+        """
+        if session_mask is not None:
+            sessions = ['regular']
+            if include_pre:
+                sessions.append('pre')
+            if include_post:
+                sessions.append('post')
+            return session_mask(timestamps, sessions)
+            
+        hour = timestamps.dt.hour + timestamps.dt.minute / 60.0
+        mask = (hour >= 13.5) & (hour < 20)
+        if include_pre:
+            mask |= (hour >= 8) & (hour < 13.5)
+        if include_post:
+            mask |= hour >= 20
+        return mask.to_numpy()
+    
     def build_volume_profile(self, 
                            data: pd.DataFrame,
                            include_pre: bool = True,
@@ -156,9 +187,7 @@ class VolumeProfile:
         
         # Filter for market hours
         try:
-            mask = working_data['timestamp'].apply(
-                lambda x: self.is_market_hours(x, include_pre, include_post)
-            )
+            mask = self.market_hours_mask(working_data['timestamp'], include_pre, include_post)
             filtered_data = working_data[mask]
         except:
             # If filtering fails, use all data
@@ -5,6 +5,7 @@ Simplified Polygon Client for Zone Scanner
 Focused on essential data fetching operations
 """
 
+import json
 import logging
 import requests
 from typing import Dict, List, Optional, Any
@@ -15,8 +16,17 @@ import numpy as np
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
 logger = logging.getLogger(__name__)
 
+# /bars response formats (Arrow needs pyarrow; columnar JSON works everywhere)
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+BARS_FORMAT = "arrow" if pa is not None else "columnar"
+
 
 class PolygonClient:
     """
@@ -65,6 +75,31 @@ class PolygonClient:
         except Exception as e:
             return False, f"Connection error: {str(e)}"
     
+    def _decode_bars(self, response) -> pd.DataFrame:
+        """
+        Build a bar DataFrame from a /bars response.
+        
+        Handles Arrow IPC, column-oriented JSON and the original per-bar JSON,
+        so older servers that ignore the requested format still work.
+        """
+        if response.headers.get('Content-Type', '').startswith(ARROW_MEDIA_TYPE):
+            table = pa.ipc.open_stream(response.content).read_all()
+            return table.to_pandas().set_index('timestamp')
+        
+        data = response.json()
+        
+        if data.get('columns'):
+            columns = dict(data['columns'])
+            index = pd.to_datetime(columns.pop('timestamp'), unit='ms', utc=True)
+            return pd.DataFrame(columns, index=index.rename('timestamp'))
+        
+        if data.get('data'):
+            df = pd.DataFrame(data['data'])
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            return df.set_index('timestamp')
+        
+        return pd.DataFrame()
+
     def fetch_bars(self, 
                    symbol: str,
                    start_date: str,
@@ -102,7 +137,8 @@ class PolygonClient:
                 "start_date": start_date,
                 "end_date": end_date,
                 "use_cache": True,
-                "validate": False
+                "validate": False,
+                "format": BARS_FORMAT
             }
             
             logger.debug(f"Fetching bars with payload: {payload}")
@@ -116,17 +152,9 @@ class PolygonClient:
             logger.debug(f"Response status: {response.status_code}")
             
             if response.status_code == 200:
-                data = response.json()
+                df = self._decode_bars(response)
                 
-                # The server returns data in a 'data' field
-                if 'data' in data and data['data']:
-                    df = pd.DataFrame(data['data'])
-                    
-                    # Convert timestamp to datetime index
-                    if 'timestamp' in df.columns:
-                        df['timestamp'] = pd.to_datetime(df['timestamp'])
-                        df.set_index('timestamp', inplace=True)
-                    
+                if not df.empty:
                     # Ensure we have the required columns
                     required_cols = ['open', 'high', 'low', 'close']
                     if all(col in df.columns for col in required_cols):
@@ -159,6 +187,95 @@ class PolygonClient:
             logger.error(traceback.format_exc())
             return None
     
+    def _iter_bar_stream(self, response):
+        """
+        Yield (symbol, DataFrame, error) from a streamed /bars/multiple response.
+        
+        Reads Arrow record batches or NDJSON lines as they arrive.
+        """
+        if response.headers.get('Content-Type', '').startswith(ARROW_MEDIA_TYPE):
+            reader = pa.ipc.open_stream(response.raw)
+            while True:
+                try:
+                    batch, metadata = reader.read_next_batch_with_custom_metadata()
+                except StopIteration:
+                    break
+                symbol = metadata[b'symbol'].decode()
+                if b'error' in metadata:
+                    yield symbol, None, metadata[b'error'].decode()
+                else:
+                    df = batch.to_pandas().drop(columns='symbol').set_index('timestamp')
+                    yield symbol, df, None
+            return
+        
+        for line in response.iter_lines():
+            if not line:
+                continue
+            item = json.loads(line)
+            if 'error' in item:
+                yield item['symbol'], None, item['error']
+                continue
+            columns = item['columns']
+            index = pd.to_datetime(columns.pop('timestamp'), unit='ms', utc=True)
+            yield item['symbol'], pd.DataFrame(columns, index=index.rename('timestamp')), None
+    
+    def fetch_bars_batch(self,
+                         symbols: List[str],
+                         start_date: str,
+                         end_date: str,
+                         timeframe: str = "5min") -> Dict[str, pd.DataFrame]:
+        """
+        Fetch bars for many symbols in one streamed request.
+        
+        Args:
+            symbols: Stock tickers
+            start_date: YYYY-MM-DD
+            end_date: YYYY-MM-DD
+            timeframe: Bar timeframe
+            
+        Returns:
+            Dict of symbol -> DataFrame; failed symbols are logged and omitted
+        """
+        payload = {
+            "symbols": [symbol.upper() for symbol in symbols],
+            "timeframe": timeframe,
+            "start_date": start_date,
+            "end_date": end_date,
+            "use_cache": True,
+            "validate": False,
+            "stream": True,
+            "format": "arrow" if pa is not None else "ndjson"
+        }
+        
+        results = {}
+        try:
+            with self.session.post(
+                f"{self.base_url}/bars/multiple",
+                json=payload,
+                timeout=30,
+                stream=True
+            ) as response:
+                if response.status_code != 200:
+                    logger.error(f"Failed to fetch batch: HTTP {response.status_code}")
+                    return results
+                
+                content_type = response.headers.get('Content-Type', '')
+                if content_type.startswith('application/json'):
+                    logger.error("Server does not support streamed batches; use fetch_bars per symbol")
+                    return results
+                
+                for symbol, df, error in self._iter_bar_stream(response):
+                    if error:
+                        logger.warning(f"Batch fetch failed for {symbol}: {error}")
+                    else:
+                        results[symbol] = df
+                        
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Request error fetching batch: {e}")
+        
+        logger.info(f"Fetched {len(results)}/{len(symbols)} symbols in one batch")
+        return results
+    
     def get_latest_price(self, symbol: str) -> Optional[float]:
         """Get latest price for symbol"""
         try:
@@ -19,7 +19,7 @@ import sys
 import os
 
 # Polygon Connection
-from polygon import DataFetcher, PolygonWebSocketClient
+from polygon import DataFetcher, PolygonWebSocketClient, request_priority
 from polygon.config import PolygonConfig
 
 # Import HVN components
@@ -146,15 +146,17 @@ class PolygonHVNBridge:
         
         try:
             # Fetch raw data from Polygon
-            df = self.fetcher.fetch_data(
-                symbol=symbol,
-                timeframe=timeframe,
-                start_date=start_date,
-                end_date=end_date,
-                use_cache=True,
-                validate=True,
-                fill_gaps=True
-            )
+            # Analyst-facing request: schedule ahead of bulk backfills
+            with request_priority('interactive', caller='hvn_analyzer', override=False):
+                df = self.fetcher.fetch_data(
+                    symbol=symbol,
+                    timeframe=timeframe,
+                    start_date=start_date,
+                    end_date=end_date,
+                    use_cache=True,
+                    validate=True,
+                    fill_gaps=True
+                )
         except Exception as e:
             logger.error(f"Failed to fetch data for {symbol}: {e}")
             raise ValueError(f"Failed to fetch data for {symbol}: {str(e)}")
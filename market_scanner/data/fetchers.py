@@ -7,7 +7,7 @@ from typing import Optional
 import pandas as pd
 import logging
 
-from polygon import DataFetcher
+from polygon import DataFetcher, request_priority
 from polygon.config import PolygonConfig
 
 from ..config import config
@@ -49,15 +49,17 @@ class PolygonDataFetcher(DataFetcherInterface):
                         end_date: datetime) -> pd.DataFrame:
         """Fetch historical daily data from Polygon."""
         try:
-            df = self.fetcher.fetch_data(
-                symbol=symbol,
-                timeframe='1d',
-                start_date=start_date,
-                end_date=end_date,
-                use_cache=True,
-                validate=True,
-                fill_gaps=True
-            )
+            # Scans sweep whole universes; yield to interactive requests
+            with request_priority('bulk', caller='market_scanner', override=False):
+                df = self.fetcher.fetch_data(
+                    symbol=symbol,
+                    timeframe='1d',
+                    start_date=start_date,
+                    end_date=end_date,
+                    use_cache=True,
+                    validate=True,
+                    fill_gaps=True
+                )
             return df
         except Exception as e:
             logger.error(f"Failed to fetch historical data for {symbol}: {e}")
@@ -70,14 +72,15 @@ class PolygonDataFetcher(DataFetcherInterface):
                       timeframe: str = '1min') -> pd.DataFrame:
         """Fetch intraday data from Polygon."""
         try:
-            df = self.fetcher.fetch_data(
-                symbol=symbol,
-                timeframe=timeframe,
-                start_date=start_time,
-                end_date=end_time,
-                use_cache=True,
-                validate=True
-            )
+            with request_priority('bulk', caller='market_scanner', override=False):
+                df = self.fetcher.fetch_data(
+                    symbol=symbol,
+                    timeframe=timeframe,
+                    start_date=start_time,
+                    end_date=end_time,
+                    use_cache=True,
+                    validate=True
+                )
             return df
         except Exception as e:
             logger.error(f"Failed to fetch intraday data for {symbol}: {e}")
@@ -1,17 +1,20 @@
 """
 Market timing utilities.
 """
-from datetime import datetime, time, timezone, timedelta
-from typing import Tuple
-import pytz
-import pandas_market_calendars as mcal
+from datetime import datetime, timezone, timedelta
+from typing import Optional
+import pandas as pd
+
+from polygon.calendar import session_bounds, session_mask
 
 class MarketTiming:
     """Utilities for market hours and timing."""
     
     def __init__(self, exchange: str = 'NYSE'):
-        """Initialize with market calendar."""
-        self.calendar = mcal.get_calendar(exchange)
+        """Initialize with market calendar (sessions come from polygon.calendar)."""
+        if exchange != 'NYSE':
+            raise ValueError(f"Unsupported exchange: {exchange}")
+        self.exchange = exchange
     
     def is_market_open(self, timestamp: datetime) -> bool:
         """Check if market is open at given time."""
@@ -19,19 +22,7 @@ class MarketTiming:
         if timestamp.tzinfo is None:
             timestamp = timestamp.replace(tzinfo=timezone.utc)
         
-        # Get market schedule for the date
-        schedule = self.calendar.schedule(
-            start_date=timestamp.date(),
-            end_date=timestamp.date()
-        )
-        
-        if schedule.empty:
-            return False
-        
-        market_open = schedule.iloc[0]['market_open']
-        market_close = schedule.iloc[0]['market_close']
-        
-        return market_open <= timestamp <= market_close
+        return bool(session_mask([timestamp], 'regular', inclusive='both')[0])
     
     def is_premarket(self, timestamp: datetime) -> bool:
         """Check if in pre-market hours."""
@@ -39,24 +30,19 @@ class MarketTiming:
         if timestamp.tzinfo is None:
             timestamp = timestamp.replace(tzinfo=timezone.utc)
         
-        # Pre-market: 4:00 AM - 9:30 AM ET
-        et_tz = pytz.timezone('US/Eastern')
-        et_time = timestamp.astimezone(et_tz)
-        
-        premarket_start = time(4, 0)
-        market_open = time(9, 30)
-        
-        return premarket_start <= et_time.time() < market_open
+        # Pre-market: 4:00 AM - 9:30 AM ET on trading days
+        return bool(session_mask([timestamp], 'pre')[0])
     
-    def get_next_market_open(self, from_date: datetime) -> datetime:
+    def get_next_market_open(self, from_date: datetime) -> Optional[datetime]:
         """Get next market open time."""
         # Get schedule for next few days
-        schedule = self.calendar.schedule(
-            start_date=from_date.date(),
-            end_date=from_date.date() + timedelta(days=10)
+        _, opens, _ = session_bounds(
+            from_date.date(),
+            from_date.date() + timedelta(days=10),
+            extended=False
         )
         
-        if not schedule.empty:
-            return schedule.iloc[0]['market_open']
+        if len(opens):
+            return pd.Timestamp(opens[0], tz='UTC')
         
-        return None
\ No newline at end of file
+        return None
@@ -13,12 +13,21 @@ import numpy as np
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
 import json
 
 from data.models import TradingSession
 
 logger = logging.getLogger(__name__)
 
+# /bars response formats (Arrow needs pyarrow; columnar JSON works everywhere)
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+BARS_FORMAT = "arrow" if pa is not None else "columnar"
+
 
 class PolygonBridge:
     """
@@ -111,6 +120,31 @@ class PolygonBridge:
             logger.error(f"Error validating ticker {ticker}: {e}")
             return False
     
+    def _decode_bars(self, response) -> pd.DataFrame:
+        """
+        Build a bar DataFrame from a /bars response.
+        
+        Handles Arrow IPC, column-oriented JSON and the original per-bar JSON,
+        so older servers that ignore the requested format still work.
+        """
+        if response.headers.get('Content-Type', '').startswith(ARROW_MEDIA_TYPE):
+            table = pa.ipc.open_stream(response.content).read_all()
+            return table.to_pandas().set_index('timestamp')
+        
+        data = response.json()
+        
+        if data.get('columns'):
+            columns = dict(data['columns'])
+            index = pd.to_datetime(columns.pop('timestamp'), unit='ms', utc=True)
+            return pd.DataFrame(columns, index=index.rename('timestamp'))
+        
+        if data.get('data'):
+            df = pd.DataFrame(data['data'])
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            return df.set_index('timestamp')
+        
+        return pd.DataFrame()
+
     def fetch_bars(self, 
                symbol: str,
                start_date: Optional[str] = None,
@@ -136,7 +170,9 @@ class PolygonBridge:
                 "symbol": symbol.upper(),
                 "timeframe": timeframe,  # Just the string, not {"value": timeframe}
                 "use_cache": True,
-                "validate": False
+                "validate": False,
+                "format": BARS_FORMAT,
+                "priority": "interactive"  # UI request: ahead of server-side backfills
             }
             
             if start_date:
@@ -154,14 +190,9 @@ class PolygonBridge:
             )
             
             if response.status_code == 200:
-                data = response.json()
+                df = self._decode_bars(response)
                 
-                # Convert to DataFrame
-                if data.get("data"):
-                    df = pd.DataFrame(data["data"])
-                    df['timestamp'] = pd.to_datetime(df['timestamp'])
-                    df.set_index('timestamp', inplace=True)
-                    
+                if not df.empty:
                     logger.info(f"Fetched {len(df)} bars for {symbol}")
                     return df
                 else:
@@ -52,8 +52,14 @@ from .exceptions import (
 # Import main components
 from .core import PolygonClient
 from .fetcher import DataFetcher, BatchDataFetcher
+from .async_fetcher import AsyncDataFetcher
 from .storage import StorageManager, get_storage_manager
-from .rate_limiter import RateLimiter, get_rate_limiter
+from .bar_cache import BarCache, get_bar_cache
+from .bar_aggregator import RealtimeBarAggregator, get_bar_aggregator
+from .rate_limiter import (
+    RateLimiter, get_rate_limiter, request_priority,
+    PRIORITY_INTERACTIVE, PRIORITY_NORMAL, PRIORITY_BULK
+)
 
 # Import API validator
 from .api_validator import PolygonAPIValidator, validate_polygon_features
@@ -70,7 +76,8 @@ from .utils import (
     is_extended_hours,
     normalize_ohlcv_data,
     validate_ohlcv_data,
-    resample_ohlcv
+    resample_ohlcv,
+    calculate_atr
 )
 
 # Import validators
@@ -206,6 +213,28 @@ def clear_cache(symbol: str = None, older_than_days: int = None) -> dict:
     return storage.clear_cache(symbol=symbol, older_than_days=older_than_days)
 
 
+def warmup_cache(symbols: list, specs: list = None, end_date: str = None,
+                 max_concurrency: int = None) -> dict:
+    """
+    Fill the cache for a watchlist before analysis runs.
+    
+    Args:
+        symbols: Watchlist symbols
+        specs: 'timeframe:sessions' specs (default: config warmup_specs)
+        end_date: Last day to warm (default: today)
+        max_concurrency: Chunk requests in flight (default: config warmup_concurrency)
+        
+    Returns:
+        Dictionary with job/chunk counts, throughput and coverage per spec
+        
+    Example:
+        report = warmup_cache(['AAPL', 'SPY'], ['1day:60', '5min:30', '1min:2'])
+    """
+    # Imported here so `python -m polygon.warmup` does not import itself twice
+    from .warmup import warmup_cache as run_warmup
+    return run_warmup(symbols, specs, end_date, max_concurrency)
+
+
 def get_storage_statistics() -> dict:
     """
     Get cache storage statistics.
@@ -392,14 +421,16 @@ class PolygonDataManager:
             older_than_days=older_than_days
         )
         
-    def optimize_storage(self) -> dict:
-        """Optimize cache storage by removing duplicates and recompressing."""
-        return self.storage.optimize_cache()
+    def optimize_storage(self, max_disk_mb: float = None) -> dict:
+        """Compact old partitions, build tiers from 1min bars and enforce the cache disk budget."""
+        return self.storage.optimize_cache(max_disk_mb)
         
     def get_statistics(self) -> dict:
         """Get comprehensive module statistics."""
         return {
             'storage': self.storage.get_cache_statistics(),
+            'memory_cache': get_bar_cache().get_stats(),
+            'realtime_bars': get_bar_aggregator().get_stats(),
             'rate_limit': self.rate_limiter.get_statistics(),
             'config': self.config.to_dict()
         }
@@ -442,6 +473,7 @@ __all__ = [
     'get_latest_bars',
     'validate_ticker',
     'clear_cache',
+    'warmup_cache',
     'get_storage_statistics',
     'get_rate_limit_status',
     'check_market_status',
@@ -455,10 +487,19 @@ __all__ = [
     'PolygonClient',
     'DataFetcher',
     'BatchDataFetcher',
+    'AsyncDataFetcher',
     'StorageManager',
+    'BarCache',
+    'RealtimeBarAggregator',
     'RateLimiter',
     'PolygonAPIValidator',
     
+    # Request scheduling
+    'request_priority',
+    'PRIORITY_INTERACTIVE',
+    'PRIORITY_NORMAL',
+    'PRIORITY_BULK',
+    
     # Configuration
     'PolygonConfig',
     'get_config',
@@ -481,6 +522,8 @@ __all__ = [
     'parse_date',
     'is_market_open',
     'is_extended_hours',
+    'resample_ohlcv',
+    'calculate_atr',
     
     # API validation
     'validate_polygon_features',
@@ -0,0 +1,427 @@
+# polygon/async_fetcher.py - Asyncio data fetching for the Polygon module
+"""
+Asyncio counterpart of DataFetcher/BatchDataFetcher. All API calls go through
+PolygonSession.request_async on a single shared aiohttp session, so hundreds of
+symbol requests can be fanned out without a thread per request. Cache I/O and
+validation run in worker threads via asyncio.to_thread.
+"""
+
+import asyncio
+import pandas as pd
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple, Union
+
+from .config import get_config
+from .core import PolygonClient
+from .storage import get_storage_manager
+from .bar_cache import get_bar_cache
+from .request_coalescer import get_request_coalescer
+from .rate_limiter import (
+    get_rate_limiter, AsyncRateLimiter, request_priority, current_request_context,
+    PRIORITY_BULK, PRIORITY_NORMAL
+)
+from .fetcher import BatchDataFetcher
+from .utils import (
+    parse_date,
+    parse_timeframe,
+    validate_symbol,
+    format_date_for_api,
+    normalize_ohlcv_data
+)
+from .exceptions import PolygonAPIError, PolygonSymbolError
+
+
+class AsyncDataFetcher:
+    """
+    [CLASS SUMMARY]
+    Purpose: Asyncio interface for fetching market data
+    Responsibilities:
+        - Same cache/validation semantics as DataFetcher.fetch_data
+        - Concurrent chunk and symbol requests on one aiohttp connection pool
+        - Single-flight coalescing shared with the sync fetchers
+        - Shared rate limiting with the sync fetchers
+    Usage:
+        async with AsyncDataFetcher() as fetcher:
+            df = await fetcher.fetch_data('AAPL', '5min', start, end)
+            data = await fetcher.fetch_multiple_symbols(['AAPL', 'SPY'], '5min', start, end)
+    """
+
+    def __init__(self, config=None, client=None, storage=None, rate_limiter=None,
+                 bar_cache=None):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Initialize async fetcher with dependencies
+        Parameters:
+            - config (PolygonConfig, optional): Configuration instance
+            - client (PolygonClient, optional): API client (its session is shared)
+            - storage (StorageManager, optional): Storage manager instance
+            - rate_limiter (RateLimiter, optional): Sync limiter to share state with
+            - bar_cache (BarCache, optional): In-memory DataFrame cache
+        Example: fetcher = AsyncDataFetcher()
+        """
+        self.config = config or get_config()
+        self.client = client or PolygonClient(self.config)
+        self.storage = storage or get_storage_manager()
+        self.bar_cache = bar_cache or get_bar_cache()
+        self.coalescer = get_request_coalescer()
+        self.rate_limiter = AsyncRateLimiter(rate_limiter or get_rate_limiter())
+        self.logger = self.config.get_logger(__name__)
+
+        # Sync fetcher reused for chunk planning, validation and universe assembly
+        self._batch = BatchDataFetcher(
+            config=self.config,
+            client=self.client,
+            storage=self.storage,
+            rate_limiter=rate_limiter or get_rate_limiter(),
+            bar_cache=self.bar_cache
+        )
+
+    async def fetch_data(self, symbol: str, timeframe: str,
+                         start_date: Union[str, datetime],
+                         end_date: Union[str, datetime],
+                         use_cache: bool = True,
+                         validate: bool = True,
+                         fill_gaps: bool = False,
+                         adjust_splits: bool = True) -> pd.DataFrame:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Fetch OHLCV data with caching and validation
+        Parameters: Same as DataFetcher.fetch_data
+        Returns: DataFrame - OHLCV data
+        Example: df = await fetcher.fetch_data('AAPL', '5min', '2024-01-02', '2024-01-31')
+        """
+        # Validate inputs
+        symbol = validate_symbol(symbol)
+        start_dt = parse_date(start_date)
+        end_dt = parse_date(end_date)
+        multiplier, timespan = parse_timeframe(timeframe)
+        range_end = end_dt + timedelta(days=1)
+
+        self.logger.info(
+            f"Fetching {symbol} {timeframe} data from {start_dt.date()} to {end_dt.date()} (async)"
+        )
+
+        # Check in-memory cache of decoded frames first
+        memory_key = (symbol, timeframe, validate, fill_gaps, adjust_splits)
+        use_memory_cache = use_cache and self.config.memory_cache_enabled
+        if use_memory_cache:
+            memory_df = self.bar_cache.get(memory_key, start_dt, range_end)
+            if memory_df is not None:
+                self.logger.info(f"Returned {len(memory_df)} rows from memory cache")
+                return memory_df
+
+        # Share an identical (or covering) fetch already in flight, sync or async
+        # at this caller's priority or higher
+        context = current_request_context()
+        flight_key = (symbol, timeframe, use_cache, validate, fill_gaps, adjust_splits)
+        return await self.coalescer.run_async(
+            flight_key, start_dt, range_end,
+            lambda: self._fetch_data_from_sources(
+                symbol, timeframe, start_dt, end_dt,
+                use_cache, validate, fill_gaps, adjust_splits
+            ),
+            priority=context.priority if context else PRIORITY_NORMAL
+        )
+
+    async def _fetch_data_from_sources(self, symbol: str, timeframe: str,
+                                       start_dt: datetime, end_dt: datetime,
+                                       use_cache: bool, validate: bool,
+                                       fill_gaps: bool, adjust_splits: bool) -> pd.DataFrame:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Load from disk cache and/or the API (the coalesced part of fetch_data)
+        Parameters: Same as fetch_data, with parsed symbol and dates
+        Returns: DataFrame - OHLCV data for [start_dt, end_dt]
+        """
+        multiplier, timespan = parse_timeframe(timeframe)
+        range_end = end_dt + timedelta(days=1)
+        memory_key = (symbol, timeframe, validate, fill_gaps, adjust_splits)
+        use_memory_cache = use_cache and self.config.memory_cache_enabled
+
+        new_df = pd.DataFrame()
+        fetched_ranges = []
+
+        if use_cache:
+            cached_df = await asyncio.to_thread(
+                self._batch._fetch_from_cache, symbol, timeframe, start_dt, end_dt
+            )
+
+            if cached_df is not None and not cached_df.empty:
+                missing_ranges = await asyncio.to_thread(
+                    self.storage.get_missing_ranges, symbol, timeframe, start_dt, end_dt
+                )
+
+                if not missing_ranges:
+                    self.logger.info(f"Returned {len(cached_df)} rows from cache")
+                    if validate:
+                        cached_df = await asyncio.to_thread(
+                            self._batch._validate_and_clean, cached_df, symbol, timeframe
+                        )
+                    if use_memory_cache:
+                        self.bar_cache.put(memory_key, cached_df, start_dt, range_end)
+                        cached_df = cached_df.copy()
+                    return cached_df
+
+                # Partial cache hit - fetch missing ranges concurrently
+                self.logger.info(f"Partial cache hit, fetching {len(missing_ranges)} missing ranges")
+                fetched = await asyncio.gather(*(
+                    self._fetch_from_api(
+                        symbol, multiplier, timespan, missing_start, missing_end, adjust_splits
+                    )
+                    for missing_start, missing_end in missing_ranges
+                ))
+                fetched_data = [frame for frame in fetched if not frame.empty]
+
+                # Only newly fetched bars need to be written to cache
+                new_df = pd.concat(fetched_data) if fetched_data else pd.DataFrame()
+                fetched_ranges = missing_ranges
+
+                df = pd.concat([cached_df] + fetched_data).sort_index()
+                df = df[~df.index.duplicated(keep='last')]
+            else:
+                df = await self._fetch_from_api(
+                    symbol, multiplier, timespan, start_dt, end_dt, adjust_splits
+                )
+                new_df = df
+                fetched_ranges = [(start_dt, end_dt)]
+        else:
+            df = await self._fetch_from_api(
+                symbol, multiplier, timespan, start_dt, end_dt, adjust_splits
+            )
+
+        # Save newly fetched bars to cache
+        if use_cache and fetched_ranges:
+            try:
+                if not new_df.empty:
+                    await asyncio.to_thread(self.storage.save_data, new_df, symbol, timeframe)
+                for fetched_start, fetched_end in fetched_ranges:
+                    await asyncio.to_thread(
+                        self.storage.mark_coverage, symbol, timeframe, fetched_start, fetched_end
+                    )
+            except Exception as e:
+                self.logger.warning(f"Failed to save to cache: {e}")
+
+        # Validate and clean if requested
+        if validate and not df.empty:
+            df = await asyncio.to_thread(self._batch._validate_and_clean, df, symbol, timeframe)
+
+        # Fill gaps if requested
+        if fill_gaps and not df.empty:
+            df = await asyncio.to_thread(self._batch._fill_data_gaps, df, timeframe)
+
+        # Final date filtering to ensure we return exactly what was requested
+        if not df.empty:
+            df = df[(df.index >= start_dt) & (df.index <= range_end)]
+
+        if use_memory_cache:
+            self.bar_cache.put(memory_key, df, start_dt, range_end)
+            df = df.copy()
+
+        self.logger.info(f"Returned {len(df)} rows for {symbol} {timeframe}")
+
+        return df
+
+    async def _fetch_from_api(self, symbol: str, multiplier: int, timespan: str,
+                              start_date: datetime, end_date: datetime,
+                              adjust_splits: bool = True) -> pd.DataFrame:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Fetch a range from the API as concurrent chunk requests
+        Parameters:
+            - symbol (str): Stock symbol
+            - multiplier (int): Timeframe multiplier
+            - timespan (str): Timeframe unit
+            - start_date (datetime): Start date
+            - end_date (datetime): End date
+            - adjust_splits (bool): Apply adjustments
+        Returns: DataFrame - Fetched OHLCV data in chronological order
+        """
+        date_ranges = self.plan_chunks(start_date, end_date, multiplier, timespan)
+        semaphore = asyncio.Semaphore(max(1, self.config.max_concurrent_chunks))
+
+        async def fetch_chunk(chunk_start, chunk_end):
+            async with semaphore:
+                return await self.fetch_chunk(
+                    symbol, multiplier, timespan, chunk_start, chunk_end, adjust_splits
+                )
+
+        # gather preserves input order, so chunks reassemble chronologically
+        results = await asyncio.gather(*(
+            fetch_chunk(chunk_start, chunk_end) for chunk_start, chunk_end in date_ranges
+        ))
+
+        all_data = [df_chunk for df_chunk in results if not df_chunk.empty]
+        if not all_data:
+            return pd.DataFrame()
+
+        df = pd.concat(all_data)
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
+        return df[~df.index.duplicated(keep='last')]
+
+    def plan_chunks(self, start_date: datetime, end_date: datetime,
+                    multiplier: int, timespan: str) -> List[Tuple[datetime, datetime]]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Split a range into chunks that each fit in one aggregates page
+        Parameters: Same as DataFetcher.plan_chunks
+        Returns: list - (start, end) tuples in chronological order
+        """
+        return self._batch.plan_chunks(start_date, end_date, multiplier, timespan)
+
+    async def fetch_chunk(self, symbol: str, multiplier: int, timespan: str,
+                           chunk_start: datetime, chunk_end: datetime,
+                           adjust_splits: bool = True) -> pd.DataFrame:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Fetch one chunk, following next_url pagination
+        Parameters: Same as DataFetcher.fetch_chunk
+        Returns: DataFrame - Chunk data (empty if no data)
+        """
+        pages = []
+        next_url = None
+        loop = asyncio.get_running_loop()
+
+        while True:
+            await self.rate_limiter.wait_if_needed()
+
+            try:
+                start_time = loop.time()
+                if next_url:
+                    response = await self.client.get_next_page_async(next_url)
+                else:
+                    response = await self.client.get_aggregates_async(
+                        ticker=symbol,
+                        multiplier=multiplier,
+                        timespan=timespan,
+                        from_date=format_date_for_api(chunk_start),
+                        to_date=format_date_for_api(chunk_end),
+                        adjusted=adjust_splits,
+                        limit=self.config.max_bars_per_request
+                    )
+                self.rate_limiter.record_request(
+                    response_time=loop.time() - start_time, success=True
+                )
+
+            except PolygonAPIError as e:
+                self.rate_limiter.record_request(success=False)
+                if e.status_code == 404:
+                    raise PolygonSymbolError(
+                        symbol,
+                        f"Symbol {symbol} not found or no data available"
+                    )
+                raise
+
+            except Exception as e:
+                self.rate_limiter.record_request(success=False)
+                self.logger.error(f"Async API request failed: {e}")
+                raise
+
+            if response.get('results'):
+                df_page = normalize_ohlcv_data(response['results'])
+                if not df_page.empty:
+                    pages.append(df_page)
+
+            next_url = response.get('next_url')
+            if not next_url:
+                break
+
+        if not pages:
+            self.logger.warning(
+                f"No data returned for {symbol} "
+                f"{chunk_start.date()} to {chunk_end.date()}"
+            )
+            return pd.DataFrame()
+
+        return pd.concat(pages) if len(pages) > 1 else pages[0]
+
+    async def fetch_multiple_symbols(self, symbols: List[str], timeframe: str,
+                                     start_date: Union[str, datetime],
+                                     end_date: Union[str, datetime],
+                                     max_concurrency: int = 20,
+                                     **kwargs) -> Dict[str, pd.DataFrame]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Fetch data for many symbols concurrently
+        Parameters:
+            - symbols (list): List of stock symbols
+            - timeframe (str): Data timeframe
+            - start_date: Start date
+            - end_date: End date
+            - max_concurrency (int): Maximum symbols in flight at once
+            - **kwargs: Additional arguments for fetch_data
+        Returns: dict - {symbol: DataFrame} mapping (failed symbols omitted)
+        Example: data = await fetcher.fetch_multiple_symbols(['AAPL', 'SPY'], '1day', start, end)
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def fetch_one(symbol):
+            async with semaphore:
+                return await self.fetch_data(symbol, timeframe, start_date, end_date, **kwargs)
+
+        outcomes = await asyncio.gather(
+            *(fetch_one(symbol) for symbol in symbols),
+            return_exceptions=True
+        )
+
+        results = {}
+        errors = {}
+        for symbol, outcome in zip(symbols, outcomes):
+            if isinstance(outcome, BaseException):
+                if isinstance(outcome, asyncio.CancelledError):
+                    raise outcome
+                errors[symbol] = str(outcome)
+                self.logger.error(f"Failed to fetch {symbol}: {outcome}")
+            else:
+                results[symbol] = outcome
+
+        self.logger.info(
+            f"Async batch fetch complete: {len(results)} successful, {len(errors)} failed"
+        )
+
+        if errors:
+            self.logger.warning(f"Failed symbols: {list(errors.keys())}")
+
+        return results
+
+    async def fetch_universe(self, symbols: List[str], timeframe: str,
+                             start_date: Union[str, datetime],
+                             end_date: Union[str, datetime],
+                             aligned: bool = True,
+                             min_data_pct: float = 80,
+                             max_concurrency: int = 20) -> pd.DataFrame:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Fetch aligned data for multiple symbols
+        Parameters: Same as BatchDataFetcher.fetch_universe, plus max_concurrency
+        Returns: DataFrame - Multi-index DataFrame with all symbols
+        Example: universe = await fetcher.fetch_universe(['AAPL', 'GOOGL'], '1day', start, end)
+        Note: Runs at bulk priority unless the caller set a request_priority()
+        """
+        with request_priority(PRIORITY_BULK, caller='fetch_universe', override=False):
+            all_data = await self.fetch_multiple_symbols(
+                symbols, timeframe, start_date, end_date,
+                max_concurrency=max_concurrency,
+                validate=True, use_cache=True
+            )
+
+        return self._batch._build_universe(
+            all_data, timeframe, start_date, end_date, aligned, min_data_pct
+        )
+
+    async def close(self):
+        """Close the shared aiohttp session"""
+        await self.client.close_async()
+
+    async def __aenter__(self):
+        """Async context manager entry"""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit - close sessions"""
+        await self.close()
+
+
+__all__ = [
+    'AsyncDataFetcher'
+]
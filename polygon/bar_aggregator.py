@@ -0,0 +1,493 @@
+# polygon/bar_aggregator.py - Real-time OHLCV bars built from the WebSocket stream
+"""
+Incremental bar builder fed by PolygonWebSocketClient. Trades (T) or minute
+aggregates (AM) are folded into 1/5/15-minute bars per symbol; closed bars
+live in fixed-size numpy ring buffers and are flushed to the parquet cache,
+so intraday readers get live bars from memory instead of re-polling REST.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+from .utils import parse_timeframe
+
+# Milliseconds per timespan for intraday timeframes
+_TIMESPAN_MS = {'second': 1000, 'minute': 60_000, 'hour': 3_600_000}
+
+# Bar fields held per slot: open, high, low, close, volume, price*volume, transactions
+_FIELDS = 7
+
+
+def timeframe_ms(timeframe: str) -> int:
+    """
+    [FUNCTION SUMMARY]
+    Purpose: Bar length of an intraday timeframe in milliseconds
+    Parameters:
+        - timeframe (str): Timeframe such as '1min' or '15min'
+    Returns: int - Bar length in milliseconds
+    Raises: ValueError for daily and longer timeframes
+    """
+    multiplier, timespan = parse_timeframe(timeframe)
+    if timespan not in _TIMESPAN_MS:
+        raise ValueError(f"Real-time bars support intraday timeframes only, got {timeframe}")
+    return multiplier * _TIMESPAN_MS[timespan]
+
+
+class _BarRing:
+    """
+    [CLASS SUMMARY]
+    Purpose: Closed bars for one symbol/timeframe plus the bar being built
+    Attributes:
+        - starts: Bar start times (epoch ms) in ring order
+        - values: Bar fields (see _FIELDS) in ring order
+        - head: Next slot to write
+        - size: Number of closed bars held
+        - current: Open bar as [start, open, high, low, close, volume, pv, n]
+        - partial: True while current started after its bar had already begun
+        - closed_through: Start of the newest closed or dropped bar (-1 if none)
+    """
+
+    __slots__ = ('capacity', 'starts', 'values', 'head', 'size', 'current',
+                 'partial', 'closed_through')
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.starts = np.zeros(capacity, dtype=np.int64)
+        self.values = np.zeros((capacity, _FIELDS), dtype=np.float64)
+        self.head = 0
+        self.size = 0
+        self.current: Optional[list] = None
+        self.partial = False
+        self.closed_through = -1
+
+    def push(self, bar: list):
+        """Append a closed bar, overwriting the oldest when full"""
+        self.starts[self.head] = bar[0]
+        self.values[self.head] = bar[1:]
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def arrays(self, count: Optional[int], include_current: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """Newest `count` bars in time order as (starts, values)"""
+        size = self.size
+        if count is not None:
+            size = min(size, max(count - (1 if include_current and self.current else 0), 0))
+        order = (self.head - size + np.arange(size)) % self.capacity
+        starts, values = self.starts[order], self.values[order]
+
+        if include_current and self.current is not None:
+            starts = np.append(starts, self.current[0])
+            values = np.vstack([values, np.asarray(self.current[1:], dtype=np.float64)])
+        return starts, values
+
+
+def _bars_frame(starts: np.ndarray, values: np.ndarray) -> pd.DataFrame:
+    """Build a DataFrame shaped like normalize_ohlcv_data output"""
+    volume = values[:, 4]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        vwap = np.where(volume > 0, values[:, 5] / volume, values[:, 3])
+
+    index = pd.DatetimeIndex(pd.to_datetime(starts, unit='ms', utc=True), name='datetime')
+    return pd.DataFrame({
+        'open': values[:, 0],
+        'high': values[:, 1],
+        'low': values[:, 2],
+        'close': values[:, 3],
+        'volume': volume,
+        'vwap': vwap,
+        'transactions': values[:, 6]
+    }, index=index)
+
+
+class RealtimeBarAggregator:
+    """
+    [CLASS SUMMARY]
+    Purpose: Build intraday OHLCV bars incrementally from streaming events
+    Responsibilities:
+        - Fold trades or AM minute bars into every configured timeframe
+        - Keep the newest closed bars per symbol/timeframe in ring buffers
+        - Close bars when a later bucket arrives or the bar's end has passed
+        - Flush closed bars to the parquet cache in the background
+    Usage:
+        aggregator = get_bar_aggregator()
+        df = aggregator.get_bars('AAPL', '5min', bars=50)
+    Note: Each symbol is built from the first source it receives (trades or
+          AM aggregates); the other source is ignored so volume is not
+          counted twice. Late trades for an already closed bar are dropped.
+          The first bar of each symbol/timeframe usually starts mid-bar, so it
+          is served while open but never kept or flushed once closed.
+    """
+
+    def __init__(self, timeframes: Optional[List[str]] = None,
+                 capacity: Optional[int] = None, storage=None,
+                 flush_to_cache: Optional[bool] = None, config=None):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Initialize the aggregator
+        Parameters:
+            - timeframes (list, optional): Intraday timeframes to build
+            - capacity (int, optional): Closed bars kept per symbol/timeframe
+            - storage (StorageManager, optional): Cache to flush closed bars to
+            - flush_to_cache (bool, optional): Write closed bars to parquet
+            - config (PolygonConfig, optional): Configuration instance
+        """
+        self.config = config or get_config()
+        self.logger = self.config.get_logger(__name__)
+
+        timeframes = timeframes or self.config.realtime_bar_timeframes
+        self.timeframes = {timeframe: timeframe_ms(timeframe) for timeframe in timeframes}
+        self.capacity = capacity or self.config.realtime_bar_capacity
+        self.flush_to_cache = (
+            self.config.realtime_bar_flush if flush_to_cache is None else flush_to_cache
+        )
+        self.close_grace_ms = int(self.config.realtime_bar_close_grace_seconds * 1000)
+        self._storage = storage
+
+        self._rings: Dict[Tuple[str, str], _BarRing] = {}
+        self._sources: Dict[str, str] = {}
+        self._last_minute: Dict[str, int] = {}
+        self._pending: Dict[Tuple[str, str], List[list]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_task: Optional[asyncio.Future] = None
+        self._next_sweep = 0.0
+        self._clock = 0  # Latest event time seen (epoch ms)
+
+        # Counters
+        self._events = 0
+        self._ignored = 0
+        self._late = 0
+        self._bars_closed = 0
+        self._bars_dropped = 0
+        self._bars_flushed = 0
+        self._flush_errors = 0
+
+    @property
+    def storage(self):
+        """Storage manager, resolved lazily to avoid import cycles"""
+        if self._storage is None:
+            from .storage import get_storage_manager
+            self._storage = get_storage_manager()
+        return self._storage
+
+    def process(self, data: Dict[str, Any]) -> bool:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Fold one processed WebSocket event into the bars
+        Parameters:
+            - data (dict): Output of PolygonWebSocketClient._process_trade or
+              _process_aggregate
+        Returns: bool - True if the event updated any bar
+        """
+        event_type = data.get('event_type')
+        if event_type == 'trade':
+            return self.on_trade(data['symbol'], data['timestamp'], data['price'], data['size'])
+        if event_type == 'aggregate':
+            return self.on_aggregate(
+                data['symbol'], data['timestamp'], data['open'], data['high'],
+                data['low'], data['close'], data['volume'],
+                data.get('vwap'), data.get('transactions')
+            )
+        return False
+
+    def on_trade(self, symbol: str, timestamp: int, price: float, size: float) -> bool:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Add a trade to the open bar of every timeframe
+        Parameters:
+            - symbol (str): Stock symbol
+            - timestamp (int): Trade time in epoch milliseconds
+            - price (float): Trade price
+            - size (float): Trade size
+        Returns: bool - True if the trade was applied
+        """
+        price = float(price)
+        size = float(size or 0)
+        return self._apply(symbol.upper(), 'trade', int(timestamp),
+                           price, price, price, price, size, price * size, 1)
+
+    def on_aggregate(self, symbol: str, timestamp: int, open_: float, high: float,
+                     low: float, close: float, volume: float,
+                     vwap: Optional[float] = None,
+                     transactions: Optional[int] = None) -> bool:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Merge a streamed minute bar (AM) into every timeframe
+        Parameters:
+            - symbol (str): Stock symbol
+            - timestamp (int): Bar start in epoch milliseconds
+            - open_, high, low, close, volume: Bar values
+            - vwap (float, optional): Bar VWAP (close is used when missing)
+            - transactions (int, optional): Trade count
+        Returns: bool - True if the bar was applied
+        """
+        symbol = symbol.upper()
+        timestamp = int(timestamp)
+        volume = float(volume or 0)
+        pv = (float(vwap) if vwap is not None else float(close)) * volume
+
+        with self._lock:
+            # Repeated minute bars would double count volume
+            if timestamp <= self._last_minute.get(symbol, -1):
+                self._ignored += 1
+                return False
+            self._last_minute[symbol] = timestamp
+
+        return self._apply(symbol, 'aggregate', timestamp, float(open_), float(high),
+                           float(low), float(close), volume, pv, int(transactions or 0))
+
+    def _apply(self, symbol: str, source: str, timestamp: int, open_: float,
+               high: float, low: float, close: float, volume: float,
+               pv: float, transactions: int) -> bool:
+        """Merge one bar-shaped update into the open bar of each timeframe"""
+        with self._lock:
+            if self._sources.setdefault(symbol, source) != source:
+                self._ignored += 1
+                return False
+            self._events += 1
+            if timestamp > self._clock:
+                self._clock = timestamp
+
+            applied = False
+            for timeframe, interval in self.timeframes.items():
+                ring = self._ring(symbol, timeframe)
+                start = timestamp - timestamp % interval
+                bar = ring.current
+
+                if bar is not None and start < bar[0]:
+                    continue
+                if bar is None and start <= ring.closed_through:
+                    continue
+
+                if bar is not None and start > bar[0]:
+                    self._close(symbol, timeframe, ring)
+                    bar = None
+
+                if bar is None:
+                    ring.current = [start, open_, high, low, close, volume, pv, transactions]
+                    # Only an AM bar at the bucket start proves nothing was missed
+                    ring.partial = ring.closed_through < 0 and not (
+                        source == 'aggregate' and timestamp == start
+                    )
+                else:
+                    if high > bar[2]:
+                        bar[2] = high
+                    if low < bar[3]:
+                        bar[3] = low
+                    bar[4] = close
+                    bar[5] += volume
+                    bar[6] += pv
+                    bar[7] += transactions
+                applied = True
+
+            if not applied:
+                self._late += 1
+            return applied
+
+    def _ring(self, symbol: str, timeframe: str) -> _BarRing:
+        """Get or create the ring buffer for a symbol/timeframe"""
+        key = (symbol, timeframe)
+        ring = self._rings.get(key)
+        if ring is None:
+            ring = self._rings[key] = _BarRing(self.capacity)
+        return ring
+
+    def _close(self, symbol: str, timeframe: str, ring: _BarRing):
+        """Move the open bar into the ring and queue it for flushing (lock held)"""
+        bar = ring.current
+        ring.current = None
+        ring.closed_through = bar[0]
+        if ring.partial:
+            # Started mid-bar (first bar after subscribe or restart): incomplete
+            ring.partial = False
+            self._bars_dropped += 1
+            return
+        ring.push(bar)
+        self._bars_closed += 1
+        if self.flush_to_cache:
+            self._pending.setdefault((symbol, timeframe), []).append(bar)
+
+    def close_bars(self, now_ms: Optional[int] = None) -> int:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Close open bars whose period has ended
+        Parameters:
+            - now_ms (int, optional): Current time in epoch milliseconds,
+              defaults to the latest event time seen on the stream
+        Returns: int - Number of bars closed
+        Note: Needed for quiet symbols, where no later event closes the bar.
+              The stream clock keeps delayed or replayed feeds consistent.
+        """
+        closed = 0
+        with self._lock:
+            if now_ms is None:
+                now_ms = self._clock
+            for (symbol, timeframe), ring in self._rings.items():
+                bar = ring.current
+                if bar is not None and bar[0] + self.timeframes[timeframe] + self.close_grace_ms <= now_ms:
+                    self._close(symbol, timeframe, ring)
+                    closed += 1
+        return closed
+
+    async def update_realtime(self, symbol: str, data: Dict[str, Any]):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: WebSocket hook - apply an event and flush closed bars
+        Parameters:
+            - symbol (str): Stock symbol
+            - data (dict): Processed WebSocket event
+        """
+        await self.update_realtime_batch([data])
+
+    async def update_realtime_batch(self, events: List[Dict[str, Any]]):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Apply the events of one WebSocket frame and flush closed bars
+        Parameters:
+            - events (list): Processed WebSocket events
+        Note: Parquet writes run in the default executor, one flush at a time
+        """
+        for data in events:
+            self.process(data)
+
+        # Periodically close bars of symbols that went quiet
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self._next_sweep = now + 1.0
+            self.close_bars()
+
+        if self._pending and (self._flush_task is None or self._flush_task.done()):
+            loop = asyncio.get_running_loop()
+            self._flush_task = loop.run_in_executor(None, self.flush)
+
+    def flush(self) -> int:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Write closed bars waiting in memory to the parquet cache
+        Returns: int - Number of bars written
+        Note: Bars already in the cache are kept, and streamed bars never
+              mark sessions as covered (see StorageManager.save_realtime_bars)
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+
+            written = 0
+            for (symbol, timeframe), bars in pending.items():
+                starts = np.array([bar[0] for bar in bars], dtype=np.int64)
+                values = np.array([bar[1:] for bar in bars], dtype=np.float64)
+                try:
+                    self.storage.save_realtime_bars(_bars_frame(starts, values), symbol, timeframe)
+                    written += len(bars)
+                except Exception as e:
+                    self._flush_errors += 1
+                    self.logger.error(f"Failed to flush real-time bars for {symbol} {timeframe}: {e}")
+
+            self._bars_flushed += written
+            return written
+
+    def supports(self, timeframe: str) -> bool:
+        """Check whether a timeframe is built by this aggregator"""
+        try:
+            return timeframe_ms(timeframe) in self.timeframes.values()
+        except ValueError:
+            return False
+
+    def get_bars(self, symbol: str, timeframe: str, bars: Optional[int] = None,
+                 include_partial: bool = True) -> Optional[pd.DataFrame]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Latest real-time bars for a symbol
+        Parameters:
+            - symbol (str): Stock symbol
+            - timeframe (str): Timeframe built by this aggregator
+            - bars (int, optional): Maximum number of bars (all if None)
+            - include_partial (bool): Include the bar still being built
+        Returns: DataFrame or None - Bars in time order, None if not tracked
+        Example: df = aggregator.get_bars('AAPL', '5min', bars=20)
+        """
+        interval = timeframe_ms(timeframe)
+        name = next((tf for tf, ms in self.timeframes.items() if ms == interval), None)
+        if name is None:
+            return None
+
+        self.close_bars()
+        with self._lock:
+            ring = self._rings.get((symbol.upper(), name))
+            if ring is None:
+                return None
+            starts, values = ring.arrays(bars, include_partial)
+
+        return _bars_frame(starts, values)
+
+    def symbols(self) -> List[str]:
+        """Symbols with real-time bars"""
+        with self._lock:
+            return sorted(self._sources)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Aggregator statistics
+        Returns: dict - Symbols, event and bar counters
+        """
+        with self._lock:
+            return {
+                'symbols': len(self._sources),
+                'timeframes': list(self.timeframes),
+                'capacity': self.capacity,
+                'events': self._events,
+                'ignored': self._ignored,
+                'late': self._late,
+                'bars_closed': self._bars_closed,
+                'bars_dropped': self._bars_dropped,
+                'bars_pending_flush': sum(len(bars) for bars in self._pending.values()),
+                'bars_flushed': self._bars_flushed,
+                'flush_errors': self._flush_errors
+            }
+
+    def clear(self, symbol: Optional[str] = None):
+        """Drop real-time bars for one symbol or all symbols"""
+        with self._lock:
+            if symbol is None:
+                self._rings.clear()
+                self._sources.clear()
+                self._last_minute.clear()
+                self._pending.clear()
+                return
+            symbol = symbol.upper()
+            for key in [key for key in self._rings if key[0] == symbol]:
+                del self._rings[key]
+                self._pending.pop(key, None)
+            self._sources.pop(symbol, None)
+            self._last_minute.pop(symbol, None)
+
+
+# Global aggregator instance
+_bar_aggregator = None
+
+
+def get_bar_aggregator() -> RealtimeBarAggregator:
+    """
+    [FUNCTION SUMMARY]
+    Purpose: Get or create singleton real-time bar aggregator
+    Returns: RealtimeBarAggregator - Shared aggregator
+    Example: aggregator = get_bar_aggregator()
+    """
+    global _bar_aggregator
+    if _bar_aggregator is None:
+        _bar_aggregator = RealtimeBarAggregator()
+    return _bar_aggregator
+
+
+__all__ = [
+    'RealtimeBarAggregator',
+    'get_bar_aggregator',
+    'timeframe_ms'
+]
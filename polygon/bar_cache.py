@@ -0,0 +1,265 @@
+# polygon/bar_cache.py - In-process LRU cache of decoded bar DataFrames
+"""
+Memory-bounded LRU cache that sits in front of the parquet/SQLite cache.
+Repeated requests for the same (or a narrower) window are sliced from an
+already decoded DataFrame instead of going back to disk.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple, Any, Hashable
+
+import pandas as pd
+
+from .config import get_config, POLYGON_TIMEZONE
+
+
+class BarCacheEntry:
+    """
+    [CLASS SUMMARY]
+    Purpose: Single cached DataFrame and the time range it covers
+    Attributes:
+        - df: Cached bars (never handed out directly)
+        - start: Covered range start (inclusive)
+        - end: Covered range end (inclusive)
+        - nbytes: Memory footprint used for accounting
+        - expires_at: Expiry time, None for purely historical ranges
+    """
+
+    __slots__ = ('df', 'start', 'end', 'nbytes', 'expires_at')
+
+    def __init__(self, df: pd.DataFrame, start: datetime, end: datetime,
+                 expires_at: Optional[datetime]):
+        """Initialize entry and compute its byte size"""
+        self.df = df
+        self.start = start
+        self.end = end
+        self.nbytes = int(df.memory_usage(index=True, deep=False).sum())
+        self.expires_at = expires_at
+
+    def covers(self, start: datetime, end: datetime) -> bool:
+        """Check whether the entry contains the requested range"""
+        return self.start <= start and end <= self.end
+
+    def is_expired(self, now: datetime) -> bool:
+        """Check whether the entry's TTL has elapsed"""
+        return self.expires_at is not None and now >= self.expires_at
+
+
+class BarCache:
+    """
+    [CLASS SUMMARY]
+    Purpose: Thread-safe LRU of decoded OHLCV DataFrames
+    Responsibilities:
+        - Serve exact or contained ranges by slicing a cached superset
+        - Bound total memory with byte-size accounting and LRU eviction
+        - Expire ranges that touch the current trading day after a TTL
+        - Widen entries when overlapping ranges are stored
+    Usage:
+        cache = get_bar_cache()
+        df = cache.get(('AAPL', '5min'), start, end)
+        cache.put(('AAPL', '5min'), df, start, end)
+    Note: Keys are (symbol, timeframe, ...) tuples; the first two items are
+          used for invalidation.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None,
+                 ttl_minutes: Optional[int] = None, config=None):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Initialize the cache
+        Parameters:
+            - max_bytes (int, optional): Memory budget, defaults to config
+            - ttl_minutes (int, optional): TTL for current-day ranges
+            - config (PolygonConfig, optional): Configuration instance
+        Example: cache = BarCache(max_bytes=64 * 1024 * 1024)
+        """
+        self.config = config or get_config()
+        self.max_bytes = max_bytes if max_bytes is not None else int(
+            self.config.memory_cache_max_mb * 1024 * 1024
+        )
+        self.ttl = timedelta(
+            minutes=ttl_minutes if ttl_minutes is not None else self.config.cache_ttl_minutes
+        )
+
+        self._entries: 'OrderedDict[Hashable, BarCacheEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+
+        # Statistics
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Tuple, start: datetime, end: datetime) -> Optional[pd.DataFrame]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Return cached bars for a range if fully covered
+        Parameters:
+            - key (tuple): Cache key, e.g. (symbol, timeframe, validate)
+            - start (datetime): Range start (inclusive)
+            - end (datetime): Range end (inclusive)
+        Returns: DataFrame or None - Copy of the matching slice
+        """
+        now = datetime.now(POLYGON_TIMEZONE)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            if entry.is_expired(now):
+                self._remove(key)
+                self._misses += 1
+                return None
+
+            if not entry.covers(start, end):
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            df = entry.df
+
+        # Slice outside the lock; index is sorted so searchsorted is O(log n)
+        lo = df.index.searchsorted(start, side='left')
+        hi = df.index.searchsorted(end, side='right')
+        return df.iloc[lo:hi].copy()
+
+    def put(self, key: Tuple, df: pd.DataFrame, start: datetime, end: datetime):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Store bars covering [start, end]
+        Parameters:
+            - key (tuple): Cache key
+            - df (DataFrame): Bars with a sorted DatetimeIndex
+            - start (datetime): Covered range start (inclusive)
+            - end (datetime): Covered range end (inclusive)
+        Note: An overlapping existing entry is merged so coverage widens
+        """
+        if df is None or df.empty:
+            return
+
+        with self._lock:
+            existing = self._entries.get(key)
+
+            # Merge with an overlapping (non-expired) entry to widen coverage
+            if existing is not None and not existing.is_expired(datetime.now(POLYGON_TIMEZONE)):
+                if existing.start <= end and start <= existing.end:
+                    merged = pd.concat([existing.df, df])
+                    merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+                    df = merged
+                    start = min(start, existing.start)
+                    end = max(end, existing.end)
+
+            entry = BarCacheEntry(df, start, end, self._expiry_for(end))
+
+            # Entries larger than the whole budget are not cached
+            if entry.nbytes > self.max_bytes:
+                if key in self._entries:
+                    self._remove(key)
+                return
+
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = entry
+            self._bytes += entry.nbytes
+            self._evict()
+
+    def invalidate(self, symbol: Optional[str] = None, timeframe: Optional[str] = None):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Drop cached entries for a symbol and/or timeframe
+        Parameters:
+            - symbol (str, optional): Symbol to drop, None for all
+            - timeframe (str, optional): Timeframe to drop, None for all
+        """
+        symbol = symbol.upper() if symbol else None
+
+        with self._lock:
+            for key in list(self._entries):
+                if symbol and key[0] != symbol:
+                    continue
+                if timeframe and key[1] != timeframe:
+                    continue
+                self._remove(key)
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Get cache usage statistics
+        Returns: dict - Entries, memory use and hit rate
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'size_mb': self._bytes / 1024 / 1024,
+                'max_size_mb': self.max_bytes / 1024 / 1024,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / lookups if lookups else 0.0,
+                'evictions': self._evictions
+            }
+
+    def _expiry_for(self, end: datetime) -> Optional[datetime]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Compute TTL expiry for a covered range
+        Parameters:
+            - end (datetime): Covered range end
+        Returns: datetime or None - Expiry if the range reaches today
+        """
+        now = datetime.now(POLYGON_TIMEZONE)
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        # Ranges that reach into the current day can still receive bars
+        if end + timedelta(days=1) > today_start:
+            return now + self.ttl
+        return None
+
+    def _remove(self, key: Hashable):
+        """Remove an entry (lock must be held)"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.nbytes
+
+    def _evict(self):
+        """Evict least recently used entries until within budget (lock held)"""
+        while self._bytes > self.max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.nbytes
+            self._evictions += 1
+
+
+# Public convenience functions
+_bar_cache = None
+
+
+def get_bar_cache() -> BarCache:
+    """
+    [FUNCTION SUMMARY]
+    Purpose: Get or create singleton bar cache
+    Returns: BarCache - Shared in-process cache
+    Example: cache = get_bar_cache()
+    """
+    global _bar_cache
+    if _bar_cache is None:
+        _bar_cache = BarCache()
+    return _bar_cache
+
+
+__all__ = [
+    'BarCache',
+    'get_bar_cache'
+]
@@ -0,0 +1,374 @@
+# polygon/calendar.py - US equity market calendar for the Polygon module
+"""
+Rule-based NYSE trading calendar. Holidays are computed from the exchange's
+published rules (observed-date shifts, Good Friday, Juneteenth from 2022) and
+cached per year, so trading-day queries are array operations rather than
+per-date datetime arithmetic. Session boundaries (pre-market, regular and
+post-market, DST-aware, with early closes) are precomputed per year as UTC
+arrays, so session_mask()/session_id() classify whole indexes with a
+binary search instead of per-bar datetime arithmetic.
+"""
+
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .utils import parse_date
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """Return the n-th given weekday (Mon=0) of a month; n=-1 for the last one"""
+    if n > 0:
+        first = date(year, month, 1)
+        offset = (weekday - first.weekday()) % 7
+        return first + timedelta(days=offset + 7 * (n - 1))
+
+    next_month = date(year + (month // 12), month % 12 + 1, 1)
+    last = next_month - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _observed(holiday: date) -> date:
+    """Shift a fixed-date holiday falling on a weekend to its observed weekday"""
+    if holiday.weekday() == 5:
+        return holiday - timedelta(days=1)
+    if holiday.weekday() == 6:
+        return holiday + timedelta(days=1)
+    return holiday
+
+
+@lru_cache(maxsize=None)
+def nyse_holidays(year: int) -> tuple:
+    """
+    [FUNCTION SUMMARY]
+    Purpose: Full-day NYSE holidays for a year
+    Parameters:
+        - year (int): Calendar year
+    Returns: tuple - Sorted datetime.date holidays
+    Example: nyse_holidays(2024) -> (date(2024, 1, 1), date(2024, 1, 15), ...)
+    Note: New Year's Day falling on a Saturday is not observed on the prior Friday
+    """
+    holidays = []
+
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        holidays.append(_observed(new_year))
+
+    holidays.append(_nth_weekday(year, 1, 0, 3))      # Martin Luther King Jr. Day
+    holidays.append(_nth_weekday(year, 2, 0, 3))      # Washington's Birthday
+    holidays.append(_easter(year) - timedelta(days=2))  # Good Friday
+    holidays.append(_nth_weekday(year, 5, 0, -1))     # Memorial Day
+
+    if year >= 2022:
+        holidays.append(_observed(date(year, 6, 19)))  # Juneteenth
+
+    holidays.append(_observed(date(year, 7, 4)))      # Independence Day
+    holidays.append(_nth_weekday(year, 9, 0, 1))      # Labor Day
+    holidays.append(_nth_weekday(year, 11, 3, 4))     # Thanksgiving
+    holidays.append(_observed(date(year, 12, 25)))    # Christmas
+
+    return tuple(sorted(holidays))
+
+
+def holidays_between(start: Union[str, datetime, date],
+                     end: Union[str, datetime, date]) -> np.ndarray:
+    """
+    [FUNCTION SUMMARY]
+    Purpose: Holidays between two dates as a datetime64[D] array
+    Parameters:
+        - start: First date (inclusive)
+        - end: Last date (inclusive)
+    Returns: ndarray - Sorted datetime64[D] holidays
+    """
+    start_day, end_day = _to_day(start), _to_day(end)
+    days = [
+        holiday
+        for year in range(start_day.year, end_day.year + 1)
+        for holiday in nyse_holidays(year)
+        if start_day <= holiday <= end_day
+    ]
+    return np.array(days, dtype='datetime64[D]')
+
+
+def trading_days(start: Union[str, datetime, date],
+                 end: Union[str, datetime, date]) -> np.ndarray:
+    """
+    [FUNCTION SUMMARY]
+    Purpose: Trading days in a date range
+    Parameters:
+        - start: First date (inclusive)
+        - end: Last date (inclusive)
+    Returns: ndarray - datetime64[D] trading days in ascending order
+    Example: trading_days('2024-07-01', '2024-07-08') -> 5 sessions (July 4th skipped)
+    """
+    start_day, end_day = _to_day(start), _to_day(end)
+    if end_day < start_day:
+        return np.array([], dtype='datetime64[D]')
+
+    days = np.arange(
+        np.datetime64(start_day, 'D'),
+        np.datetime64(end_day, 'D') + 1,
+        dtype='datetime64[D]'
+    )
+    mask = np.is_busday(days, holidays=holidays_between(start_day, end_day))
+    return days[mask]
+
+
+def is_trading_day(day: Union[str, datetime, date]) -> bool:
+    """
+    [FUNCTION SUMMARY]
+    Purpose: Check if a date is an NYSE trading day
+    Parameters:
+        - day: Date to check
+    Returns: bool - True on weekdays that are not exchange holidays
+    """
+    day = _to_day(day)
+    return day.weekday() < 5 and day not in nyse_holidays(day.year)
+
+
+# Session boundaries in exchange local time (America/New_York)
+EXCHANGE_TIMEZONE = 'America/New_York'
+SESSION_TIMES = {
+    'pre_market_start': pd.Timedelta(hours=4),
+    'regular_start': pd.Timedelta(hours=9, minutes=30),
+    'regular_end': pd.Timedelta(hours=16),
+    'post_market_end': pd.Timedelta(hours=20)
+}
+
+# Boundaries that move on early-close days (13:00 close, 17:00 end of after-hours)
+EARLY_CLOSE_TIMES = {
+    'regular_end': pd.Timedelta(hours=13),
+    'post_market_end': pd.Timedelta(hours=17)
+}
+
+# Session segments in order, with the boundaries that delimit them
+SESSIONS = {
+    'pre': ('pre_market_start', 'regular_start'),
+    'regular': ('regular_start', 'regular_end'),
+    'post': ('regular_end', 'post_market_end')
+}
+
+
+@lru_cache(maxsize=None)
+def early_closes(year: int) -> tuple:
+    """
+    [FUNCTION SUMMARY]
+    Purpose: NYSE early-close (13:00 ET) days for a year
+    Parameters:
+        - year (int): Calendar year
+    Returns: tuple - Sorted datetime.date early-close days
+    Note: July 3rd, the day after Thanksgiving and Christmas Eve, when they are trading days
+    """
+    candidates = [
+        date(year, 7, 3),
+        _nth_weekday(year, 11, 3, 4) + timedelta(days=1),
+        date(year, 12, 24)
+    ]
+    return tuple(day for day in candidates if is_trading_day(day))
+
+
+@lru_cache(maxsize=None)
+def _year_sessions(year: int) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Trading days of a year plus every session boundary as naive-UTC int64 ns"""
+    days = trading_days(date(year, 1, 1), date(year, 12, 31))
+    local_midnight = pd.DatetimeIndex(days.astype('datetime64[ns]'))
+    early = np.isin(days, np.array(early_closes(year), dtype='datetime64[D]'))
+
+    bounds = {}
+    for name, offset in SESSION_TIMES.items():
+        offsets = np.full(len(days), offset.value, dtype=np.int64)
+        if name in EARLY_CLOSE_TIMES:
+            offsets[early] = EARLY_CLOSE_TIMES[name].value
+        local = pd.DatetimeIndex(local_midnight.asi8 + offsets)
+        boundary = local.tz_localize(EXCHANGE_TIMEZONE).tz_convert('UTC').tz_localize(None)
+        bounds[name] = boundary.as_unit('ns').asi8
+
+    days.setflags(write=False)
+    for array in bounds.values():
+        array.setflags(write=False)
+    return days, bounds
+
+
+def _sessions_between(start_day: date, end_day: date) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Trading days and session boundaries from start_day through end_day"""
+    day_parts = []
+    bound_parts = {name: [] for name in SESSION_TIMES}
+    for year in range(start_day.year, end_day.year + 1):
+        days, bounds = _year_sessions(year)
+        in_range = (days >= np.datetime64(start_day, 'D')) & (days <= np.datetime64(end_day, 'D'))
+        day_parts.append(days[in_range])
+        for name in SESSION_TIMES:
+            bound_parts[name].append(bounds[name][in_range])
+
+    if not day_parts:
+        return (np.array([], dtype='datetime64[D]'),
+                {name: np.array([], dtype=np.int64) for name in SESSION_TIMES})
+    return (np.concatenate(day_parts),
+            {name: np.concatenate(parts) for name, parts in bound_parts.items()})
+
+
+def session_bounds(start: Union[str, datetime, date],
+                   end: Union[str, datetime, date],
+                   extended: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    [FUNCTION SUMMARY]
+    Purpose: Session open/close times for every trading day in a date range
+    Parameters:
+        - start: First date (inclusive)
+        - end: Last date (inclusive)
+        - extended (bool): Use pre-market open/post-market close instead of
+          the regular 9:30-16:00 ET session
+    Returns: tuple - (days datetime64[D], opens datetime64[ns], closes datetime64[ns]),
+             opens/closes as naive UTC, all in ascending order
+    Example: days, opens, closes = session_bounds('2024-03-01', '2024-03-31')
+    """
+    open_key, close_key = ('pre_market_start', 'post_market_end') if extended \
+        else ('regular_start', 'regular_end')
+    days, bounds = _sessions_between(_to_day(start), _to_day(end))
+    return (days,
+            bounds[open_key].astype('datetime64[ns]'),
+            bounds[close_key].astype('datetime64[ns]'))
+
+
+def session_mask(index, sessions: Union[str, Sequence[str]] = 'regular',
+                 start_offset=None, end_offset=None,
+                 inclusive: str = 'left') -> np.ndarray:
+    """
+    [FUNCTION SUMMARY]
+    Purpose: Vectorized check of which timestamps fall inside trading sessions
+    Parameters:
+        - index: DatetimeIndex, datetime Series or array (naive values are UTC)
+        - sessions (str | list): 'regular', 'pre', 'post', 'extended' (all
+          three) or a list of segments, e.g. ['pre', 'regular']
+        - start_offset (Timedelta, optional): Shift every window's open
+        - end_offset (Timedelta, optional): Shift every window's close
+          (e.g. -10 minutes to stop before the bell)
+        - inclusive (str): 'left' for [open, close), 'both' for [open, close]
+    Returns: ndarray - bool per timestamp
+    Example: df[session_mask(df.index, ['pre', 'regular'])]
+    Note: Adjacent selected segments form one window per day; holidays, weekends,
+          early closes and DST are taken from the precomputed calendar
+    """
+    times = _utc_nanos(index)
+    mask = np.zeros(len(times), dtype=bool)
+    if not len(times):
+        return mask
+
+    days, bounds = _sessions_for(times)
+    start_shift = pd.Timedelta(start_offset or 0).value
+    end_shift = pd.Timedelta(end_offset or 0).value
+
+    for open_key, close_key in _session_windows(sessions):
+        position = _locate(
+            times, bounds[open_key] + start_shift, bounds[close_key] + end_shift, inclusive
+        )
+        mask |= position >= 0
+    return mask
+
+
+def session_id(index, extended: bool = True) -> np.ndarray:
+    """
+    [FUNCTION SUMMARY]
+    Purpose: Label each timestamp with the trading session it belongs to
+    Parameters:
+        - index: DatetimeIndex, datetime Series or array (naive values are UTC)
+        - extended (bool): Count pre/post-market bars as part of the day's session
+    Returns: ndarray - int64 trading day as days since 1970-01-01, -1 outside sessions
+    Example: df.groupby(session_id(df.index))
+    """
+    times = _utc_nanos(index)
+    if not len(times):
+        return np.zeros(0, dtype=np.int64)
+
+    days, bounds = _sessions_for(times)
+    open_key, close_key = ('pre_market_start', 'post_market_end') if extended \
+        else ('regular_start', 'regular_end')
+    position = _locate(times, bounds[open_key], bounds[close_key], 'left')
+
+    day_numbers = days.astype(np.int64)
+    return np.where(position >= 0, day_numbers[np.maximum(position, 0)], -1)
+
+
+def _utc_nanos(index) -> np.ndarray:
+    """Timestamps as naive-UTC int64 nanoseconds (NaT sorts before every session)"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return index.as_unit('ns').asi8
+
+
+def _sessions_for(times: np.ndarray) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Sessions covering a set of timestamps (after-hours can run past UTC midnight)"""
+    valid = times[times != np.iinfo(np.int64).min]
+    if not len(valid):
+        return _sessions_between(date(1970, 1, 2), date(1970, 1, 1))
+    first = pd.Timestamp(valid.min()).date() - timedelta(days=1)
+    last = pd.Timestamp(valid.max()).date()
+    return _sessions_between(first, last)
+
+
+def _session_windows(sessions: Union[str, Sequence[str]]) -> List[Tuple[str, str]]:
+    """Merge the selected segments into contiguous (open, close) boundary pairs"""
+    if isinstance(sessions, str):
+        sessions = list(SESSIONS) if sessions == 'extended' else [sessions]
+    unknown = set(sessions) - set(SESSIONS)
+    if unknown:
+        raise ValueError(f"Unknown sessions {sorted(unknown)}, expected {list(SESSIONS)} or 'extended'")
+
+    windows = []
+    for name, (open_key, close_key) in SESSIONS.items():
+        if name not in sessions:
+            continue
+        if windows and windows[-1][1] == open_key:
+            windows[-1] = (windows[-1][0], close_key)
+        else:
+            windows.append((open_key, close_key))
+    return windows
+
+
+def _locate(times: np.ndarray, opens: np.ndarray, closes: np.ndarray,
+            inclusive: str) -> np.ndarray:
+    """Position of the session window containing each time, -1 when outside all"""
+    position = np.searchsorted(opens, times, side='right') - 1
+    closes_at = closes[np.maximum(position, 0)] if len(closes) else np.zeros(len(times), dtype=np.int64)
+    inside = times <= closes_at if inclusive == 'both' else times < closes_at
+    return np.where((position >= 0) & inside, position, -1)
+
+
+def _to_day(value: Union[str, datetime, date]) -> date:
+    """Convert supported inputs to a datetime.date (UTC for timestamps)"""
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    if isinstance(value, np.datetime64):
+        return pd.Timestamp(value).date()
+    return parse_date(value).date()
+
+
+__all__ = [
+    'nyse_holidays',
+    'holidays_between',
+    'trading_days',
+    'is_trading_day',
+    'early_closes',
+    'session_bounds',
+    'session_mask',
+    'session_id'
+]
@@ -115,12 +115,45 @@ class PolygonConfig:
         self.cache_ttl_minutes = self.config_override.get('cache_ttl_minutes', 15)  # Real-time data cache
         self.historical_cache_days = self.config_override.get('historical_cache_days', 365)  # Keep 1 year
         
+        # In-process cache of decoded DataFrames (see bar_cache.py)
+        self.memory_cache_enabled = self.config_override.get('memory_cache_enabled', True)
+        self.memory_cache_max_mb = self.config_override.get('memory_cache_max_mb', 256)
+        
+        # Real-time bars built from the WebSocket stream (see bar_aggregator.py)
+        self.realtime_bars_enabled = self.config_override.get('realtime_bars_enabled', True)
+        self.realtime_bar_timeframes = self.config_override.get('realtime_bar_timeframes', ['1min', '5min', '15min'])
+        self.realtime_bar_capacity = self.config_override.get('realtime_bar_capacity', 2000)  # Closed bars kept per symbol/timeframe
+        self.realtime_bar_flush = self.config_override.get('realtime_bar_flush', True)  # Write closed bars to the parquet cache
+        self.realtime_bar_close_grace_seconds = self.config_override.get('realtime_bar_close_grace_seconds', 2.0)  # Wait for late trades before closing a quiet bar
+        
+        # Integrity checks run by fetch_data(validate=True) (see validators/kernel.py)
+        self.validation_checks = self.config_override.get('validation_checks', 'cheap')  # 'cheap' (row checks) or 'all' (adds rolling stats and sessions)
+        
+        # Pre-open cache warmup (see warmup.py)
+        self.warmup_specs = self.config_override.get('warmup_specs', ['1day:60', '5min:30', '15min:10', '1min:2'])  # timeframe:trading sessions
+        self.warmup_concurrency = self.config_override.get('warmup_concurrency', 8)  # Chunk requests in flight
+        
         # Storage settings
         self.use_compression = self.config_override.get('use_compression', True)
         self.compression_type = 'snappy'  # Fast compression for parquet files
+        self.parquet_row_group_size = self.config_override.get('parquet_row_group_size', 10000)  # Rows per row group (min/max stats granularity)
+        self.verify_cache_checksums = self.config_override.get('verify_cache_checksums', False)  # Verify partition checksums on every read
+        self.missing_range_merge_days = self.config_override.get('missing_range_merge_days', 2)  # Refetch up to N covered sessions to save a request
         
         # Cache database path
         self.cache_db_path = self.cache_dir / 'polygon_cache.db'
+        self.cache_db_pool_size = self.config_override.get('cache_db_pool_size', 8)  # Pooled SQLite connections
+        self.access_log_flush_seconds = self.config_override.get('access_log_flush_seconds', 5.0)  # Access log flush interval
+        self.access_log_batch_size = self.config_override.get('access_log_batch_size', 500)  # Flush early when buffer reaches this
+        self.access_log_retention_days = self.config_override.get('access_log_retention_days', 90)  # Access log rows older than this are pruned by optimize_cache
+        
+        # Cache compaction, tiering and disk budget (see StorageManager.optimize_cache)
+        self.compaction_interval_minutes = self.config_override.get('compaction_interval_minutes', 360)  # Background compactor period, 0 disables it
+        self.compaction_age_days = self.config_override.get('compaction_age_days', 7)  # Merge day partitions of months that ended this long ago
+        self.compaction_row_group_size = self.config_override.get('compaction_row_group_size', 2048)  # Rows per row group in merged month partitions
+        self.cache_tier_timeframes = self.config_override.get('cache_tier_timeframes', ['5min', '15min'])  # Built from cached 1min bars
+        self.cache_tier_age_days = self.config_override.get('cache_tier_age_days', 30)  # Build tiers for 1min sessions older than this
+        self.cache_max_disk_mb = self.config_override.get('cache_max_disk_mb', None)  # Evict least recently read symbol/timeframes above this (None = unlimited)
         
     def _load_rate_limit_config(self):
         """
@@ -168,8 +201,17 @@ class PolygonConfig:
         self.max_symbols_per_request = tier_limits['max_symbols_per_request']
         self.max_days_per_request = tier_limits['max_days_per_request']
         
+        # Aggregate request sizing and concurrency
+        self.max_bars_per_request = 50000  # Polygon aggregates page limit
+        self.max_concurrent_chunks = self.config_override.get(
+            'max_concurrent_chunks', int(os.getenv('POLYGON_MAX_CONCURRENT_CHUNKS', '4'))
+        )  # Parallel chunk requests per fetch
+        
         # Rate limiter settings
         self.rate_limit_buffer = 0.9  # Use 90% of limit to be safe
+        self.rate_limit_burst_seconds = self.config_override.get('rate_limit_burst_seconds', 6)  # Token bucket holds this many seconds of refill
+        self.rate_limit_stats_flush_seconds = self.config_override.get('rate_limit_stats_flush_seconds', 30)  # Stats file write interval
+        self.rate_limit_deadline_slack_seconds = self.config_override.get('rate_limit_deadline_slack_seconds', 2.0)  # Promote waiters this close to their deadline
         self.rate_limit_retry_seconds = 60  # Wait time when rate limited
         
     def _load_market_config(self):
@@ -319,7 +361,26 @@ class PolygonConfig:
                 'cache_enabled': self.cache_enabled,
                 'cache_ttl_minutes': self.cache_ttl_minutes,
                 'historical_cache_days': self.historical_cache_days,
+                'memory_cache_enabled': self.memory_cache_enabled,
+                'memory_cache_max_mb': self.memory_cache_max_mb,
+                'realtime_bars_enabled': self.realtime_bars_enabled,
+                'realtime_bar_timeframes': self.realtime_bar_timeframes,
+                'realtime_bar_capacity': self.realtime_bar_capacity,
+                'realtime_bar_flush': self.realtime_bar_flush,
+                'validation_checks': self.validation_checks,
+                'warmup_specs': self.warmup_specs,
+                'warmup_concurrency': self.warmup_concurrency,
                 'use_compression': self.use_compression,
+                'parquet_row_group_size': self.parquet_row_group_size,
+                'verify_cache_checksums': self.verify_cache_checksums,
+                'missing_range_merge_days': self.missing_range_merge_days,
+                'compaction_interval_minutes': self.compaction_interval_minutes,
+                'compaction_age_days': self.compaction_age_days,
+                'compaction_row_group_size': self.compaction_row_group_size,
+                'cache_tier_timeframes': self.cache_tier_timeframes,
+                'cache_tier_age_days': self.cache_tier_age_days,
+                'cache_max_disk_mb': self.cache_max_disk_mb,
+                'access_log_retention_days': self.access_log_retention_days,
                 'compression_type': self.compression_type,
                 'paths': {
                     'data_dir': str(self.data_dir),
@@ -331,7 +392,8 @@ class PolygonConfig:
                 'requests_per_minute': self.requests_per_minute,
                 'requests_per_day': self.requests_per_day,
                 'max_symbols_per_request': self.max_symbols_per_request,
-                'max_days_per_request': self.max_days_per_request
+                'max_days_per_request': self.max_days_per_request,
+                'rate_limit_burst_seconds': self.rate_limit_burst_seconds
             },
             'market_config': {
                 'timezone': 'UTC',  # Always UTC to match Polygon API
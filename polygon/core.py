@@ -7,6 +7,7 @@ Handles HTTP sessions, request execution, and response parsing.
 import asyncio
 import json
 import time
+import threading
 from typing import Dict, Any, Optional, Union, List
 from urllib.parse import urljoin, urlencode
 import aiohttp
@@ -55,7 +56,8 @@ class PolygonSession:
         self._sync_session: Optional[requests.Session] = None
         self._async_session: Optional[aiohttp.ClientSession] = None
         
-        # Request tracking for rate limiting
+        # Request tracking for rate limiting (shared by concurrent chunk fetches)
+        self._rate_lock = threading.Lock()
         self.request_timestamps: List[float] = []
         self.daily_request_count = 0
         self.last_request_day = time.strftime('%Y-%m-%d')
@@ -80,8 +82,13 @@ class PolygonSession:
                 allowed_methods=["GET", "POST", "PUT", "DELETE"]
             )
             
-            # Mount adapter with retry logic
-            adapter = HTTPAdapter(max_retries=retry_strategy)
+            # Mount adapter with retry logic, sized for concurrent chunk requests
+            pool_size = max(10, self.config.max_concurrent_chunks)
+            adapter = HTTPAdapter(
+                max_retries=retry_strategy,
+                pool_connections=pool_size,
+                pool_maxsize=pool_size
+            )
             self._sync_session.mount("http://", adapter)
             self._sync_session.mount("https://", adapter)
             
@@ -127,16 +134,17 @@ class PolygonSession:
         current_time = time.time()
         current_day = time.strftime('%Y-%m-%d')
         
-        # Reset daily counter if new day
-        if current_day != self.last_request_day:
-            self.daily_request_count = 0
-            self.last_request_day = current_day
-        
-        # Remove timestamps older than 1 minute
-        self.request_timestamps = [
-            ts for ts in self.request_timestamps 
-            if current_time - ts < 60
-        ]
+        with self._rate_lock:
+            # Reset daily counter if new day
+            if current_day != self.last_request_day:
+                self.daily_request_count = 0
+                self.last_request_day = current_day
+            
+            # Remove timestamps older than 1 minute
+            self.request_timestamps = [
+                ts for ts in self.request_timestamps 
+                if current_time - ts < 60
+            ]
         
         # Check per-minute limit
         if len(self.request_timestamps) >= self.config.requests_per_minute:
@@ -158,8 +166,9 @@ class PolygonSession:
     def _record_request(self) -> None:
         """Record timestamp for rate limiting"""
         current_time = time.time()
-        self.request_timestamps.append(current_time)
-        self.daily_request_count += 1
+        with self._rate_lock:
+            self.request_timestamps.append(current_time)
+            self.daily_request_count += 1
     
     def _prepare_request(self, method: str, endpoint: str, 
                         params: Optional[Dict[str, Any]] = None,
@@ -588,6 +597,64 @@ class PolygonClient:
         
         return response
     
+    async def get_aggregates_async(self, ticker: str, multiplier: int, timespan: str,
+                                   from_date: str, to_date: str,
+                                   adjusted: bool = True, sort: str = 'asc',
+                                   limit: int = 50000) -> Dict[str, Any]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Async version of get_aggregates on the shared aiohttp session
+        Parameters: Same as get_aggregates
+        Returns: dict - API response with results
+        Example: data = await client.get_aggregates_async('AAPL', 5, 'minute', '2024-01-02', '2024-01-05')
+        """
+        endpoint = f"/v2/aggs/ticker/{ticker}/range/{multiplier}/{timespan}/{from_date}/{to_date}"
+        
+        params = {
+            'adjusted': str(adjusted).lower(),
+            'sort': sort,
+            'limit': limit
+        }
+        
+        response = await self.session.request_async('GET', endpoint, params=params)
+        
+        if 'results' not in response:
+            self.logger.warning(f"No results in aggregate response for {ticker}")
+            response['results'] = []
+            
+        return response
+    
+    async def get_next_page_async(self, next_url: str) -> Dict[str, Any]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Async version of get_next_page
+        Parameters:
+            - next_url (str): Absolute URL from a previous response
+        Returns: dict - API response with results
+        """
+        response = await self.session.request_async('GET', next_url)
+        
+        if 'results' not in response:
+            response['results'] = []
+            
+        return response
+    
+    def get_next_page(self, next_url: str) -> Dict[str, Any]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Follow a paginated response's next_url
+        Parameters:
+            - next_url (str): Absolute URL from a previous response
+        Returns: dict - API response with results
+        Example: page = client.get_next_page(response['next_url'])
+        """
+        response = self.session.request('GET', next_url)
+        
+        if 'results' not in response:
+            response['results'] = []
+            
+        return response
+    
     def get_ticker_details(self, ticker: str, date: Optional[str] = None) -> Dict[str, Any]:
         """
         [FUNCTION SUMMARY]
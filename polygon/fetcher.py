@@ -5,6 +5,7 @@ rate limiting, and data validation for efficient market data retrieval.
 """
 
 import asyncio
+import contextvars
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Union, Any, Callable
@@ -14,7 +15,13 @@ import numpy as np
 from .config import get_config, POLYGON_TIMEZONE
 from .core import PolygonClient
 from .storage import get_storage_manager, StorageManager
-from .rate_limiter import get_rate_limiter, RateLimiter
+from .bar_cache import get_bar_cache
+from .bar_aggregator import get_bar_aggregator
+from .request_coalescer import get_request_coalescer
+from .rate_limiter import (
+    get_rate_limiter, RateLimiter, request_priority, current_request_context,
+    PRIORITY_BULK, PRIORITY_NORMAL
+)
 from .validators import (
     validate_ohlcv_integrity,
     detect_gaps,
@@ -56,7 +63,8 @@ class DataFetcher:
         df = fetcher.fetch_data('AAPL', '5min', start_date, end_date)
     """
     
-    def __init__(self, config=None, client=None, storage=None, rate_limiter=None):
+    def __init__(self, config=None, client=None, storage=None, rate_limiter=None,
+                 bar_cache=None, aggregator=None):
         """
         [FUNCTION SUMMARY]
         Purpose: Initialize data fetcher with dependencies
@@ -65,12 +73,19 @@ class DataFetcher:
             - client (PolygonClient, optional): API client instance
             - storage (StorageManager, optional): Storage manager instance
             - rate_limiter (RateLimiter, optional): Rate limiter instance
+            - bar_cache (BarCache, optional): In-memory DataFrame cache
+            - aggregator (RealtimeBarAggregator, optional): Live bars from the WebSocket
         Example: fetcher = DataFetcher()
         """
         self.config = config or get_config()
         self.client = client or PolygonClient(self.config)
         self.storage = storage or get_storage_manager()
         self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.bar_cache = bar_cache or get_bar_cache()
+        if aggregator is None and self.config.realtime_bars_enabled:
+            aggregator = get_bar_aggregator()
+        self.aggregator = aggregator
+        self.coalescer = get_request_coalescer()
         self.logger = self.config.get_logger(__name__)
         
         # Progress tracking
@@ -110,7 +125,44 @@ class DataFetcher:
             f"Fetching {symbol} {timeframe} data from {start_dt.date()} to {end_dt.date()}"
         )
         
-        # Check cache first
+        # Check in-memory cache of decoded frames first
+        memory_key = (symbol, timeframe, validate, fill_gaps, adjust_splits)
+        use_memory_cache = use_cache and self.config.memory_cache_enabled
+        if use_memory_cache:
+            memory_df = self.bar_cache.get(memory_key, start_dt, end_dt + timedelta(days=1))
+            if memory_df is not None:
+                self.logger.info(f"Returned {len(memory_df)} rows from memory cache")
+                return memory_df
+                
+        # Share an identical (or covering) fetch that is already in flight
+        # at this caller's priority or higher
+        context = current_request_context()
+        flight_key = (symbol, timeframe, use_cache, validate, fill_gaps, adjust_splits)
+        return self.coalescer.run(
+            flight_key, start_dt, end_dt + timedelta(days=1),
+            lambda: self._fetch_data_from_sources(
+                symbol, timeframe, start_dt, end_dt,
+                use_cache, validate, fill_gaps, adjust_splits
+            ),
+            priority=context.priority if context else PRIORITY_NORMAL
+        )
+        
+    def _fetch_data_from_sources(self, symbol: str, timeframe: str,
+                                 start_dt: datetime, end_dt: datetime,
+                                 use_cache: bool, validate: bool,
+                                 fill_gaps: bool, adjust_splits: bool) -> pd.DataFrame:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Load from disk cache and/or the API (the coalesced part of fetch_data)
+        Parameters: Same as fetch_data, with parsed symbol and dates
+        Returns: DataFrame - OHLCV data for [start_dt, end_dt]
+        """
+        multiplier, timespan = parse_timeframe(timeframe)
+        memory_key = (symbol, timeframe, validate, fill_gaps, adjust_splits)
+        use_memory_cache = use_cache and self.config.memory_cache_enabled
+        fetched_ranges = []
+        
+        # Check disk cache
         if use_cache:
             cached_df = self._fetch_from_cache(symbol, timeframe, start_dt, end_dt)
             if cached_df is not None and not cached_df.empty:
@@ -123,21 +175,30 @@ class DataFetcher:
                     self.logger.info(f"Returned {len(cached_df)} rows from cache")
                     if validate:
                         cached_df = self._validate_and_clean(cached_df, symbol, timeframe)
+                    if use_memory_cache:
+                        self.bar_cache.put(
+                            memory_key, cached_df, start_dt, end_dt + timedelta(days=1)
+                        )
+                        cached_df = cached_df.copy()
                     return cached_df
                     
                 # Partial cache hit - fetch missing ranges
                 self.logger.info(f"Partial cache hit, fetching {len(missing_ranges)} missing ranges")
-                all_data = [cached_df]
+                fetched_data = []
                 
                 for missing_start, missing_end in missing_ranges:
                     missing_df = self._fetch_from_api(
                         symbol, multiplier, timespan, missing_start, missing_end, adjust_splits
                     )
                     if not missing_df.empty:
-                        all_data.append(missing_df)
+                        fetched_data.append(missing_df)
                         
+                # Only newly fetched bars need to be written to cache
+                new_df = pd.concat(fetched_data) if fetched_data else pd.DataFrame()
+                fetched_ranges = missing_ranges
+                
                 # Combine all data
-                df = pd.concat(all_data).sort_index()
+                df = pd.concat([cached_df] + fetched_data).sort_index()
                 df = df[~df.index.duplicated(keep='last')]
                 
             else:
@@ -145,16 +206,24 @@ class DataFetcher:
                 df = self._fetch_from_api(
                     symbol, multiplier, timespan, start_dt, end_dt, adjust_splits
                 )
+                new_df = df
+                fetched_ranges = [(start_dt, end_dt)]
         else:
             # Skip cache, fetch directly from API
             df = self._fetch_from_api(
                 symbol, multiplier, timespan, start_dt, end_dt, adjust_splits
             )
+            new_df = df
             
-        # Save to cache
-        if use_cache and not df.empty:
+        # Save newly fetched bars to cache (partitions are merged on disk)
+        if use_cache and fetched_ranges:
             try:
-                self.storage.save_data(df, symbol, timeframe)
+                if not new_df.empty:
+                    self.storage.save_data(new_df, symbol, timeframe)
+                    
+                # Record fetched sessions (with or without bars) as covered
+                for fetched_start, fetched_end in fetched_ranges:
+                    self.storage.mark_coverage(symbol, timeframe, fetched_start, fetched_end)
             except Exception as e:
                 self.logger.warning(f"Failed to save to cache: {e}")
                 
@@ -169,6 +238,10 @@ class DataFetcher:
         # Final date filtering to ensure we return exactly what was requested
         df = df[(df.index >= start_dt) & (df.index <= end_dt + timedelta(days=1))]
         
+        if use_memory_cache:
+            self.bar_cache.put(memory_key, df, start_dt, end_dt + timedelta(days=1))
+            df = df.copy()
+            
         self.logger.info(f"Returned {len(df)} rows for {symbol} {timeframe}")
         
         return df
@@ -205,64 +278,153 @@ class DataFetcher:
             - end_date (datetime): End date
             - adjust_splits (bool): Apply adjustments
         Returns: DataFrame - Fetched OHLCV data
+        Note: Chunks are requested concurrently (up to max_concurrent_chunks),
+              each waiting on the shared rate limiter, and reassembled in order
         """
-        all_data = []
+        date_ranges = self.plan_chunks(start_date, end_date, multiplier, timespan)
+        total_ranges = len(date_ranges)
+        
+        def fetch_chunk(chunk):
+            return self.fetch_chunk(symbol, multiplier, timespan,
+                                     chunk[0], chunk[1], adjust_splits)
+        
+        max_workers = min(self.config.max_concurrent_chunks, total_ranges)
+        
+        if max_workers <= 1:
+            results = []
+            for i, chunk in enumerate(date_ranges):
+                # Check for cancellation
+                if self._cancel_requested:
+                    self.logger.info("Fetch cancelled by user")
+                    break
+                    
+                # Update progress
+                if self._progress_callback:
+                    progress = (i / total_ranges) * 100
+                    self._progress_callback(progress, f"Fetching chunk {i+1}/{total_ranges}")
+                    
+                results.append(fetch_chunk(chunk))
+        else:
+            results = [None] * total_ranges
+            
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Each worker runs in a copy of this context so chunk requests
+                # keep the caller's request_priority()
+                future_to_index = {
+                    executor.submit(contextvars.copy_context().run, fetch_chunk, chunk): i
+                    for i, chunk in enumerate(date_ranges)
+                }
+                
+                try:
+                    completed = 0
+                    for future in as_completed(future_to_index):
+                        # Chunks land in their original slot regardless of completion order
+                        results[future_to_index[future]] = future.result()
+                        completed += 1
+                        
+                        if self._progress_callback:
+                            progress = (completed / total_ranges) * 100
+                            self._progress_callback(
+                                progress, f"Fetched chunk {completed}/{total_ranges}"
+                            )
+                except BaseException:
+                    for pending in future_to_index:
+                        pending.cancel()
+                    raise
+                    
+            if self._cancel_requested:
+                self.logger.info("Fetch cancelled by user")
+                
+        all_data = [df_chunk for df_chunk in results if df_chunk is not None and not df_chunk.empty]
         
-        # Check if we need to split the date range
+        # Combine all chunks
+        if all_data:
+            df = pd.concat(all_data)
+            if not df.index.is_monotonic_increasing:
+                df = df.sort_index()
+            df = df[~df.index.duplicated(keep='last')]
+            return df
+        else:
+            return pd.DataFrame()
+            
+    def plan_chunks(self, start_date: datetime, end_date: datetime,
+                     multiplier: int, timespan: str) -> List[Tuple[datetime, datetime]]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Split a range into chunks that each fit in one aggregates page
+        Parameters:
+            - start_date (datetime): Start date
+            - end_date (datetime): End date
+            - multiplier (int): Timeframe multiplier
+            - timespan (str): Timeframe unit
+        Returns: list - (start, end) tuples in chronological order
+        Note: Sized from extended-hours bars per day so a chunk rarely needs
+              pagination; next_url is still followed when it does
+        """
         max_days = self.config.max_days_per_request
-        # For annual limits, no need to multiply by 365
-        date_ranges = split_large_date_range(start_date, end_date, max_days)
         
-        total_ranges = len(date_ranges)
+        # Bars per calendar day including extended hours (4:00-20:00 ET)
+        bars_per_day = {
+            'second': 16 * 3600,
+            'minute': 16 * 60,
+            'hour': 16
+        }.get(timespan)
+        
+        if bars_per_day:
+            bars_per_day = max(1, bars_per_day // max(multiplier, 1))
+            days_per_page = max(1, self.config.max_bars_per_request // bars_per_day)
+            max_days = min(max_days, days_per_page)
+            
+        return split_large_date_range(start_date, end_date, max_days)
+        
+    def fetch_chunk(self, symbol: str, multiplier: int, timespan: str,
+                     chunk_start: datetime, chunk_end: datetime,
+                     adjust_splits: bool = True) -> pd.DataFrame:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Fetch one chunk, following next_url pagination
+        Parameters:
+            - symbol (str): Stock symbol
+            - multiplier (int): Timeframe multiplier
+            - timespan (str): Timeframe unit
+            - chunk_start (datetime): Chunk start
+            - chunk_end (datetime): Chunk end
+            - adjust_splits (bool): Apply adjustments
+        Returns: DataFrame - Chunk data (empty if cancelled or no data)
+        """
+        pages = []
+        next_url = None
         
-        for i, (chunk_start, chunk_end) in enumerate(date_ranges):
+        while True:
             # Check for cancellation
             if self._cancel_requested:
-                self.logger.info("Fetch cancelled by user")
                 break
                 
-            # Update progress
-            if self._progress_callback:
-                progress = (i / total_ranges) * 100
-                self._progress_callback(progress, f"Fetching chunk {i+1}/{total_ranges}")
-                
-            # Wait for rate limit
-            wait_time = self.rate_limiter.wait_if_needed(priority=3)
+            # Wait for rate limit (priority from the caller's request_priority())
+            wait_time = self.rate_limiter.wait_if_needed()
             if wait_time > 0:
                 self.logger.debug(f"Rate limit wait: {wait_time:.1f}s")
                 
             try:
                 # Make API request
                 start_time = datetime.now()
-                response = self.client.get_aggregates(
-                    ticker=symbol,
-                    multiplier=multiplier,
-                    timespan=timespan,
-                    from_date=format_date_for_api(chunk_start),
-                    to_date=format_date_for_api(chunk_end),
-                    adjusted=adjust_splits,
-                    limit=50000
-                )
-                
+                if next_url:
+                    response = self.client.get_next_page(next_url)
+                else:
+                    response = self.client.get_aggregates(
+                        ticker=symbol,
+                        multiplier=multiplier,
+                        timespan=timespan,
+                        from_date=format_date_for_api(chunk_start),
+                        to_date=format_date_for_api(chunk_end),
+                        adjusted=adjust_splits,
+                        limit=self.config.max_bars_per_request
+                    )
+                    
                 # Record request for rate limiting
                 response_time = (datetime.now() - start_time).total_seconds()
                 self.rate_limiter.record_request(response_time=response_time, success=True)
                 
-                # Process results
-                if response.get('results'):
-                    df_chunk = normalize_ohlcv_data(response['results'])
-                    if not df_chunk.empty:
-                        all_data.append(df_chunk)
-                        self.logger.debug(
-                            f"Fetched {len(df_chunk)} rows for "
-                            f"{chunk_start.date()} to {chunk_end.date()}"
-                        )
-                else:
-                    self.logger.warning(
-                        f"No data returned for {symbol} "
-                        f"{chunk_start.date()} to {chunk_end.date()}"
-                    )
-                    
             except PolygonAPIError as e:
                 self.rate_limiter.record_request(success=False)
                 if e.status_code == 404:
@@ -278,14 +440,30 @@ class DataFetcher:
                 self.logger.error(f"API request failed: {e}")
                 raise
                 
-        # Combine all chunks
-        if all_data:
-            df = pd.concat(all_data).sort_index()
-            df = df[~df.index.duplicated(keep='last')]
-            return df
-        else:
+            # Process results
+            if response.get('results'):
+                df_page = normalize_ohlcv_data(response['results'])
+                if not df_page.empty:
+                    pages.append(df_page)
+                    
+            next_url = response.get('next_url')
+            if not next_url:
+                break
+                
+        if not pages:
+            self.logger.warning(
+                f"No data returned for {symbol} "
+                f"{chunk_start.date()} to {chunk_end.date()}"
+            )
             return pd.DataFrame()
             
+        df_chunk = pd.concat(pages) if len(pages) > 1 else pages[0]
+        self.logger.debug(
+            f"Fetched {len(df_chunk)} rows in {len(pages)} page(s) for "
+            f"{chunk_start.date()} to {chunk_end.date()}"
+        )
+        return df_chunk
+        
     def _validate_and_clean(self, df: pd.DataFrame, symbol: str, 
                            timeframe: str) -> pd.DataFrame:
         """
@@ -301,7 +479,9 @@ class DataFetcher:
             return df
             
         # Run validation
-        report = validate_ohlcv_integrity(df, symbol, timeframe)
+        report = validate_ohlcv_integrity(
+            df, symbol, timeframe, checks=self.config.validation_checks
+        )
         
         if not report.is_valid:
             self.logger.warning(
@@ -339,30 +519,29 @@ class DataFetcher:
             
         # Only fill small gaps (less than 5 bars)
         multiplier, timespan = parse_timeframe(timeframe)
+        freq_mapping = {
+            'minute': pd.Timedelta(minutes=multiplier),
+            'hour': pd.Timedelta(hours=multiplier),
+            'day': pd.Timedelta(days=multiplier)
+        }
+        small_gaps = [gap for gap in gaps['gaps'] if gap['missing_bars'] <= 5]
         
-        for gap in gaps['gaps']:
-            if gap['missing_bars'] <= 5:
-                # Create expected index
-                freq_mapping = {
-                    'minute': f'{multiplier}T',
-                    'hour': f'{multiplier}H',
-                    'day': f'{multiplier}D'
-                }
-                
-                if timespan in freq_mapping:
-                    # Reindex to include missing timestamps
-                    expected_index = pd.date_range(
-                        start=gap['start'],
-                        end=gap['end'],
-                        freq=freq_mapping[timespan]
-                    )
-                    
-                    # Forward fill prices, set volume to 0
-                    df = df.reindex(df.index.union(expected_index))
-                    df[['open', 'high', 'low', 'close']] = df[['open', 'high', 'low', 'close']].fillna(method='ffill')
-                    df['volume'] = df['volume'].fillna(0)
-                    
-        self.logger.info(f"Filled {len(gaps['gaps'])} small gaps in data")
+        if timespan in freq_mapping and small_gaps:
+            # Build the expected timestamps of every small gap at once:
+            # gap i contributes start_i + k * step for k = 0..(end_i - start_i) // step
+            step = freq_mapping[timespan]
+            gap_starts = pd.DatetimeIndex([gap['start'] for gap in small_gaps])
+            gap_ends = pd.DatetimeIndex([gap['end'] for gap in small_gaps])
+            counts = np.asarray((gap_ends - gap_starts) // step) + 1
+            offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            expected_index = (gap_starts.repeat(counts) + offsets * step).unique()
+            
+            # One reindex for all gaps, then forward fill prices and zero volume
+            df = df.reindex(df.index.union(expected_index.as_unit(df.index.unit)))
+            df[['open', 'high', 'low', 'close']] = df[['open', 'high', 'low', 'close']].ffill()
+            df['volume'] = df['volume'].fillna(0)
+            
+            self.logger.info(f"Filled {len(small_gaps)} small gaps in data")
         
         return df
         
@@ -399,6 +578,7 @@ class DataFetcher:
             # Submit all tasks
             future_to_symbol = {
                 executor.submit(
+                    contextvars.copy_context().run,
                     self.fetch_data,
                     symbol,
                     timeframe,
@@ -451,37 +631,63 @@ class DataFetcher:
             - bars (int): Number of recent bars to fetch
         Returns: DataFrame or dict of DataFrames
         Example: df = fetcher.fetch_latest_bars('AAPL', '5min', bars=20)
+        Note: Symbols streamed over the WebSocket are served from the real-time
+              bar aggregator; REST is only used for history it does not hold
         """
-        # Calculate date range
-        end_date = datetime.now(POLYGON_TIMEZONE)
+        symbol_list = [symbols] if isinstance(symbols, str) else list(symbols)
         
-        # Estimate start date based on bars and timeframe
-        multiplier, timespan = parse_timeframe(timeframe)
+        # Live bars from the WebSocket aggregator, when it tracks the symbol
+        live = {}
+        if self.aggregator is not None and self.aggregator.supports(timeframe):
+            for symbol in symbol_list:
+                df = self.aggregator.get_bars(symbol, timeframe, bars)
+                if df is not None and not df.empty:
+                    live[symbol] = df
         
-        # Add buffer for weekends/holidays
-        days_back = {
-            'minute': max(1, bars * multiplier / 390) * 2,  # 390 minutes per trading day
-            'hour': max(1, bars * multiplier / 6.5) * 2,    # 6.5 hours per trading day
-            'day': bars * 2,                                 # Account for weekends
-            'week': bars * 7,
-            'month': bars * 31,
-        }.get(timespan, bars)
+        results = {}
+        missing = [
+            symbol for symbol in symbol_list
+            if symbol not in live or len(live[symbol]) < bars
+        ]
         
-        start_date = end_date - timedelta(days=int(days_back))
+        if missing:
+            # Calculate date range
+            end_date = datetime.now(POLYGON_TIMEZONE)
+            
+            # Estimate start date based on bars and timeframe
+            multiplier, timespan = parse_timeframe(timeframe)
+            
+            # Add buffer for weekends/holidays
+            days_back = {
+                'minute': max(1, bars * multiplier / 390) * 2,  # 390 minutes per trading day
+                'hour': max(1, bars * multiplier / 6.5) * 2,    # 6.5 hours per trading day
+                'day': bars * 2,                                 # Account for weekends
+                'week': bars * 7,
+                'month': bars * 31,
+            }.get(timespan, bars)
+            
+            start_date = end_date - timedelta(days=int(days_back))
+            
+            if isinstance(symbols, str):
+                results[symbols] = self.fetch_data(symbols, timeframe, start_date, end_date)
+            else:
+                results = self.fetch_multiple_symbols(
+                    missing, timeframe, start_date, end_date
+                )
         
-        # Handle single symbol vs multiple
+        # Live bars replace REST bars for the same periods
+        for symbol, df in live.items():
+            history = results.get(symbol)
+            if history is not None and not history.empty:
+                df = pd.concat([history[history.index < df.index[0]], df])
+            results[symbol] = df
+        
+        # Return only the requested number of bars
         if isinstance(symbols, str):
-            df = self.fetch_data(symbols, timeframe, start_date, end_date)
-            # Return only the requested number of bars
-            return df.tail(bars)
-        else:
-            results = self.fetch_multiple_symbols(
-                symbols, timeframe, start_date, end_date
-            )
-            # Trim each result to requested bars
-            return {
-                symbol: df.tail(bars) for symbol, df in results.items()
-            }
+            return results[symbols].tail(bars)
+        return {
+            symbol: df.tail(bars) for symbol, df in results.items()
+        }
             
     def update_cache(self, symbol: str, timeframe: str) -> Dict[str, Any]:
         """
@@ -669,13 +875,37 @@ class BatchDataFetcher(DataFetcher):
             - min_data_pct (float): Minimum data percentage to include symbol
         Returns: DataFrame - Multi-index DataFrame with all symbols
         Example: universe = batch.fetch_universe(['AAPL', 'GOOGL'], '1d', start, end)
+        Note: Runs at bulk priority unless the caller set a request_priority()
         """
         # Fetch all symbols
-        all_data = self.fetch_multiple_symbols(
-            symbols, timeframe, start_date, end_date,
-            validate=True, use_cache=True
+        with request_priority(PRIORITY_BULK, caller='fetch_universe', override=False):
+            all_data = self.fetch_multiple_symbols(
+                symbols, timeframe, start_date, end_date,
+                validate=True, use_cache=True
+            )
+        
+        return self._build_universe(
+            all_data, timeframe, start_date, end_date, aligned, min_data_pct
         )
         
+    def _build_universe(self, all_data: Dict[str, pd.DataFrame], timeframe: str,
+                        start_date: Union[str, datetime],
+                        end_date: Union[str, datetime],
+                        aligned: bool = True,
+                        min_data_pct: float = 80) -> pd.DataFrame:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Combine per-symbol frames into a universe DataFrame
+        Parameters:
+            - all_data (dict): {symbol: DataFrame} mapping
+            - timeframe (str): Data timeframe
+            - start_date: Start date
+            - end_date: End date
+            - aligned (bool): Align all symbols to same timestamps
+            - min_data_pct (float): Minimum data percentage to include symbol
+        Returns: DataFrame - Multi-index DataFrame with all symbols
+        Note: Shared by the sync and async universe fetchers
+        """
         # Filter symbols with insufficient data
         valid_symbols = []
         for symbol, df in all_data.items():
@@ -29,6 +29,19 @@ class ServerConfig:
         # WebSocket settings
         self.ws_heartbeat_interval = int(os.getenv("WS_HEARTBEAT", "30"))
         self.ws_max_connections = int(os.getenv("WS_MAX_CONNECTIONS", "100"))
+        self.ws_send_queue_size = int(os.getenv("WS_SEND_QUEUE_SIZE", "1000"))  # per client
+        self.ws_batch_interval_ms = int(os.getenv("WS_BATCH_INTERVAL_MS", "50"))  # 0 disables batching
+        self.ws_conflate = os.getenv("WS_CONFLATE", "true").lower() == "true"
+        
+        # Bar request worker pool
+        self.fetch_workers = int(os.getenv("FETCH_WORKERS", "8"))
+        self.fetch_queue_size = int(os.getenv("FETCH_QUEUE_SIZE", "100"))
+        self.fetch_timeout = float(os.getenv("FETCH_TIMEOUT", "120"))  # seconds
+        self.fetch_interactive_reserve = int(os.getenv("FETCH_INTERACTIVE_RESERVE", "2"))  # workers bulk requests cannot use
+        
+        # Derived series (resampled bars, indicators)
+        self.derived_cache_mb = float(os.getenv("DERIVED_CACHE_MB", "128"))
+        self.derived_ttl = int(os.getenv("DERIVED_TTL", "60"))  # seconds, for the current day
         
         # Logging
         self.log_level = os.getenv("LOG_LEVEL", "INFO")
@@ -50,7 +63,16 @@ class ServerConfig:
             "cors_origins": self.cors_origins,
             "polygon_tier": self.polygon_tier,
             "cache_dir": str(self.cache_dir),
-            "ws_max_connections": self.ws_max_connections
+            "ws_max_connections": self.ws_max_connections,
+            "fetch_workers": self.fetch_workers,
+            "fetch_queue_size": self.fetch_queue_size,
+            "ws_send_queue_size": self.ws_send_queue_size,
+            "ws_batch_interval_ms": self.ws_batch_interval_ms,
+            "ws_conflate": self.ws_conflate,
+            "fetch_timeout": self.fetch_timeout,
+            "fetch_interactive_reserve": self.fetch_interactive_reserve,
+            "derived_cache_mb": self.derived_cache_mb,
+            "derived_ttl": self.derived_ttl
         }
 
 
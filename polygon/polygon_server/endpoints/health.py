@@ -8,6 +8,7 @@ import os
 
 from ..models import ServerStatus
 from ..config import config
+from ..utils.worker_pool import worker_pool
 
 # Import from parent polygon module
 from ... import get_storage_statistics, get_rate_limit_status, __version__
@@ -59,6 +60,8 @@ async def server_status():
         websocket_clients=ws_clients,
         cache_stats=cache_stats,
         rate_limit_status=rate_limit,
+        queue_depth=worker_pool.queue_depth,
+        worker_pool=worker_pool.get_stats(),
         system_metrics={
             "memory_mb": memory_info.rss / 1024 / 1024,
             "cpu_percent": process.cpu_percent(),
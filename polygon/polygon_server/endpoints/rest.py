@@ -1,12 +1,22 @@
 """
 REST API endpoints for historical data
 """
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Header, Request
+from fastapi.responses import Response, StreamingResponse
 from typing import Optional, List
 import pandas as pd
 from datetime import datetime, timedelta
 import json
+import asyncio
 from ..utils.json_encoder import polygon_json_dumps
+from ..utils.worker_pool import worker_pool, WorkerPoolFullError
+from ..utils.derived_series import DerivedSeries, check_resample
+from ..utils.bar_formats import (
+    ARROW_MEDIA_TYPE, COLUMNAR_MEDIA_TYPE, NDJSON_MEDIA_TYPE,
+    negotiate_bar_format, negotiate_stream_format,
+    columnar_json_body, arrow_ipc_body,
+    ndjson_bars_line, ndjson_error_line, ArrowBatchStreamEncoder
+)
 
 # Import from parent polygon module
 from ... import (
@@ -16,12 +26,16 @@ from ... import (
     get_latest_price,
     validate_ticker,
     validate_symbol_detailed,
-    clear_cache
+    clear_cache,
+    request_priority
 )
+from ...warmup import CacheWarmer, WarmupSpec
+from ...exceptions import PolygonDataError
 
 from ..models import (
     BarsRequest, BarsResponse, MultipleBarsRequest,
-    SymbolValidationRequest, ErrorResponse
+    SymbolValidationRequest, WarmupRequest, ErrorResponse,
+    TimeframeEnum, ATRMethodEnum
 )
 from ..config import config
 
@@ -30,135 +44,345 @@ router = APIRouter(prefix="/api/v1", tags=["market-data"])
 # Initialize data manager
 data_manager = PolygonDataManager()
 
+# Memoized resampled bars and indicators built from cached base bars
+derived_series = DerivedSeries(
+    data_manager,
+    max_mb=config.derived_cache_mb,
+    ttl_seconds=config.derived_ttl
+)
+
+# Background cache warmup (one run at a time)
+warmup_state = {"task": None, "warmer": None, "report": None, "error": None}
+
+
+def _request_caller(http_request: Request, client_id: Optional[str]) -> str:
+    """Caller identity for rate-limit fairness: X-Client-Id, else the client address"""
+    if client_id:
+        return client_id
+    return http_request.client.host if http_request.client else "unknown"
+
+
+def _fetch_bars_frame(symbol: str, timeframe: str,
+                      start_date: Optional[str], end_date: Optional[str],
+                      use_cache: bool, validate: bool,
+                      limit: Optional[int],
+                      resample: Optional[str] = None) -> pd.DataFrame:
+    """Fetch one symbol's bars with the endpoint defaults applied (blocking)"""
+    # Set default dates if not provided
+    end_date = end_date or datetime.now().strftime("%Y-%m-%d")
+    if not start_date:
+        # Default to 30 days of data
+        start = datetime.now() - timedelta(days=30)
+        start_date = start.strftime("%Y-%m-%d")
+    
+    # Fetch data (resampled from the requested timeframe if asked)
+    if resample and resample != timeframe:
+        df = derived_series.resample(
+            symbol, timeframe, resample, start_date, end_date,
+            use_cache=use_cache, validate=validate
+        )
+    else:
+        df = data_manager.fetch_data(
+            symbol=symbol,
+            timeframe=timeframe,
+            start_date=start_date,
+            end_date=end_date,
+            use_cache=use_cache,
+            validate=validate
+        )
+    
+    if df.empty:
+        raise HTTPException(404, f"No data found for {symbol}")
+    
+    # Apply limit if specified
+    if limit and len(df) > limit:
+        df = df.tail(limit)
+    
+    return df
+
+
+def _load_bars(request: BarsRequest, bar_format: str = "records"):
+    """Fetch and format bars for a request (blocking; runs on the worker pool)"""
+    timeframe = request.resample.value if request.resample else request.timeframe.value
+    df = _fetch_bars_frame(
+        request.symbol, request.timeframe.value,
+        request.start_date, request.end_date,
+        request.use_cache, request.validate, request.limit,
+        resample=timeframe
+    )
+    
+    # Get validation results if requested
+    validation = None
+    if request.validate:
+        validation = data_manager.validate_data(df, request.symbol, timeframe)
+        # Convert validation to ensure no numpy types
+        if validation:
+            validation = json.loads(polygon_json_dumps(validation))
+    
+    meta = {
+        "symbol": request.symbol,
+        "timeframe": timeframe,
+        "start_date": df.index[0].strftime("%Y-%m-%d"),
+        "end_date": df.index[-1].strftime("%Y-%m-%d"),
+        "bar_count": len(df),
+        "cached": request.use_cache,
+        "validation": validation
+    }
+    
+    # Binary and columnar formats are encoded straight from the column arrays
+    if bar_format == "arrow":
+        return Response(content=arrow_ipc_body(df, meta), media_type=ARROW_MEDIA_TYPE)
+    if bar_format == "columnar":
+        return Response(content=columnar_json_body(df, meta), media_type=COLUMNAR_MEDIA_TYPE)
+    
+    # Convert to response format
+    data_records = []
+    for idx, row in df.iterrows():
+        data_records.append({
+            "timestamp": idx.isoformat(),
+            "open": float(row["open"]),
+            "high": float(row["high"]),
+            "low": float(row["low"]),
+            "close": float(row["close"]),
+            "volume": int(row["volume"]),
+            "vwap": float(row.get("vwap", 0)),
+            "transactions": int(row.get("transactions", 0))
+        })
+    
+    return {
+        "symbol": meta["symbol"],
+        "timeframe": meta["timeframe"],
+        "start_date": meta["start_date"],
+        "end_date": meta["end_date"],
+        "bar_count": meta["bar_count"],
+        "data": data_records,
+        "cached": meta["cached"],
+        "validation": validation
+    }
+
+
+def _load_multiple_bars(request: MultipleBarsRequest) -> dict:
+    """Fetch and summarize bars for several symbols (blocking; runs on the worker pool)"""
+    # Set default dates
+    end_date = request.end_date or datetime.now()
+    start_date = request.start_date or (datetime.now() - timedelta(days=30))
+    
+    if request.parallel:
+        # Fetch in parallel
+        results = data_manager.fetch_multiple_symbols(
+            symbols=request.symbols,
+            timeframe=request.timeframe.value,
+            start_date=start_date,
+            end_date=end_date
+        )
+    else:
+        # Fetch sequentially
+        results = {}
+        for symbol in request.symbols:
+            try:
+                df = data_manager.fetch_data(
+                    symbol=symbol,
+                    timeframe=request.timeframe.value,
+                    start_date=start_date,
+                    end_date=end_date
+                )
+                results[symbol] = df
+            except Exception as e:
+                results[symbol] = {"error": str(e)}
+    
+    # Format response
+    response = {}
+    for symbol, data in results.items():
+        if isinstance(data, pd.DataFrame) and not data.empty:
+            response[symbol] = {
+                "success": True,
+                "bar_count": len(data),
+                "first_bar": data.index[0].isoformat(),
+                "last_bar": data.index[-1].isoformat()
+            }
+        else:
+            response[symbol] = {
+                "success": False,
+                "error": data.get("error", "No data") if isinstance(data, dict) else "No data"
+            }
+    
+    return response
+
 
 @router.post("/bars")  # Removed response_model=BarsResponse to use custom JSON encoder
-async def get_bars(request: BarsRequest):
+async def get_bars(request: BarsRequest, http_request: Request,
+                   accept: Optional[str] = Header(None),
+                   client_id: Optional[str] = Header(None, alias="X-Client-Id")):
     """
     Get historical OHLCV bars for a symbol
     
-    Returns pandas DataFrame converted to JSON format
+    Returns pandas DataFrame converted to JSON format.
+    Set `resample` to build coarser bars server-side from `timeframe` bars
+    (e.g. timeframe=1min, resample=15min); results are memoized.
+    Set `format` (or the Accept header) to get column arrays instead:
+      - columnar / application/vnd.polygon.columnar+json: JSON with a `columns` object
+        (`timestamp` in epoch milliseconds UTC)
+      - arrow / application/vnd.apache.arrow.stream: Arrow IPC stream with the
+        response metadata as JSON under the `polygon` schema metadata key
+    The fetch runs on the bounded worker pool so the event loop stays free.
+    `priority` (interactive/normal/bulk) and `deadline_seconds` order this
+    request's Polygon API calls against other callers' (see request_priority).
     """
+    bar_format = negotiate_bar_format(
+        request.format.value if request.format else None, accept
+    )
+    
+    if request.resample:
+        try:
+            check_resample(request.timeframe.value, request.resample.value)
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+    
     try:
-        # Set default dates if not provided
-        end_date = request.end_date or datetime.now().strftime("%Y-%m-%d")
-        if not request.start_date:
-            # Default to 30 days of data
-            start = datetime.now() - timedelta(days=30)
-            start_date = start.strftime("%Y-%m-%d")
-        else:
-            start_date = request.start_date
-        
-        # Fetch data
-        df = data_manager.fetch_data(
-            symbol=request.symbol,
-            timeframe=request.timeframe.value,
-            start_date=start_date,
-            end_date=end_date,
-            use_cache=request.use_cache,
-            validate=request.validate
-        )
-        
-        if df.empty:
-            raise HTTPException(404, f"No data found for {request.symbol}")
-        
-        # Apply limit if specified
-        if request.limit and len(df) > request.limit:
-            df = df.tail(request.limit)
-        
-        # Convert to response format
-        data_records = []
-        for idx, row in df.iterrows():
-            data_records.append({
-                "timestamp": idx.isoformat(),
-                "open": float(row["open"]),
-                "high": float(row["high"]),
-                "low": float(row["low"]),
-                "close": float(row["close"]),
-                "volume": int(row["volume"]),
-                "vwap": float(row.get("vwap", 0)),
-                "transactions": int(row.get("transactions", 0))
-            })
-        
-        # Get validation results if requested
-        validation = None
-        if request.validate:
-            validation = data_manager.validate_data(df, request.symbol, request.timeframe.value)
-            # Convert validation to ensure no numpy types
-            if validation:
-                validation = json.loads(polygon_json_dumps(validation))
-        
-        return {
-            "symbol": request.symbol,
-            "timeframe": request.timeframe.value,
-            "start_date": df.index[0].strftime("%Y-%m-%d"),
-            "end_date": df.index[-1].strftime("%Y-%m-%d"),
-            "bar_count": len(df),
-            "data": data_records,
-            "cached": request.use_cache,
-            "validation": validation
-        }
+        with request_priority(request.priority.value,
+                              caller=_request_caller(http_request, client_id),
+                              deadline_seconds=request.deadline_seconds):
+            return await worker_pool.run(_load_bars, request, bar_format)
         
     except HTTPException:
         raise
+    except WorkerPoolFullError as e:
+        raise HTTPException(503, f"Server busy: {str(e)}")
+    except asyncio.TimeoutError:
+        raise HTTPException(504, f"Timed out fetching {request.symbol} after {worker_pool.timeout:g}s")
     except Exception as e:
         raise HTTPException(500, f"Error fetching data: {str(e)}")
 
 
-@router.post("/bars/multiple")
-async def get_multiple_bars(request: MultipleBarsRequest):
+async def _stream_bar_chunks(request: MultipleBarsRequest, stream_format: str, caller: str):
     """
-    Get bars for multiple symbols
+    Yield encoded bars per symbol in completion order
+    
+    Symbols are fetched on the worker pool, at most FETCH_WORKERS at a time
+    per stream; failures (including timeouts) are reported inline.
     """
-    try:
-        # Set default dates
-        end_date = request.end_date or datetime.now()
-        start_date = request.start_date or (datetime.now() - timedelta(days=30))
-        
-        if request.parallel:
-            # Fetch in parallel
-            results = data_manager.fetch_multiple_symbols(
-                symbols=request.symbols,
-                timeframe=request.timeframe.value,
-                start_date=start_date,
-                end_date=end_date
-            )
-        else:
-            # Fetch sequentially
-            results = {}
-            for symbol in request.symbols:
-                try:
-                    df = data_manager.fetch_data(
-                        symbol=symbol,
-                        timeframe=request.timeframe.value,
-                        start_date=start_date,
-                        end_date=end_date
+    symbols = list(dict.fromkeys(symbol.upper() for symbol in request.symbols))
+    semaphore = asyncio.Semaphore(max(1, min(len(symbols), config.fetch_workers)))
+    
+    async def fetch_one(symbol: str):
+        async with semaphore:
+            try:
+                with request_priority(request.priority.value, caller=caller):
+                    df = await worker_pool.run(
+                        _fetch_bars_frame, symbol, request.timeframe.value,
+                        request.start_date, request.end_date,
+                        request.use_cache, request.validate, request.limit
                     )
-                    results[symbol] = df
-                except Exception as e:
-                    results[symbol] = {"error": str(e)}
-        
-        # Format response
-        response = {}
-        for symbol, data in results.items():
-            if isinstance(data, pd.DataFrame) and not data.empty:
-                response[symbol] = {
-                    "success": True,
-                    "bar_count": len(data),
-                    "first_bar": data.index[0].isoformat(),
-                    "last_bar": data.index[-1].isoformat()
-                }
+                return symbol, df, None
+            except HTTPException as e:
+                return symbol, None, str(e.detail)
+            except asyncio.TimeoutError:
+                return symbol, None, f"Timed out after {worker_pool.timeout:g}s"
+            except Exception as e:
+                return symbol, None, str(e)
+    
+    encoder = ArrowBatchStreamEncoder() if stream_format == "arrow" else None
+    if encoder:
+        yield encoder.begin()
+    
+    tasks = [asyncio.create_task(fetch_one(symbol)) for symbol in symbols]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            symbol, df, error = await next_done
+            if encoder:
+                yield encoder.encode_error(symbol, error) if error else encoder.encode(symbol, df)
             else:
-                response[symbol] = {
-                    "success": False,
-                    "error": data.get("error", "No data") if isinstance(data, dict) else "No data"
-                }
+                yield ndjson_error_line(symbol, error) if error else ndjson_bars_line(symbol, df)
         
-        return response
+        if encoder:
+            yield encoder.end()
+    finally:
+        # Client went away: stop waiting on symbols that have not started
+        for task in tasks:
+            task.cancel()
+
+
+@router.post("/bars/multiple")
+async def get_multiple_bars(request: MultipleBarsRequest, http_request: Request,
+                            accept: Optional[str] = Header(None),
+                            client_id: Optional[str] = Header(None, alias="X-Client-Id")):
+    """
+    Get bars for multiple symbols
+    
+    By default returns a per-symbol summary. With `stream: true` the bars
+    themselves are streamed, one symbol at a time as each becomes ready:
+      - ndjson / application/x-ndjson: one line per symbol,
+        {"symbol", "bar_count", "columns"} or {"symbol", "error"}
+      - arrow / application/vnd.apache.arrow.stream: Arrow IPC stream with one
+        record batch per symbol; batch metadata holds `symbol` (and `error`)
+    Requests default to bulk priority, so interactive /bars calls go first.
+    """
+    caller = _request_caller(http_request, client_id)
+    
+    if request.stream:
+        stream_format = negotiate_stream_format(
+            request.format.value if request.format else None, accept
+        )
+        return StreamingResponse(
+            _stream_bar_chunks(request, stream_format, caller),
+            media_type=ARROW_MEDIA_TYPE if stream_format == "arrow" else NDJSON_MEDIA_TYPE
+        )
+    
+    try:
+        with request_priority(request.priority.value, caller=caller):
+            return await worker_pool.run(_load_multiple_bars, request)
         
+    except WorkerPoolFullError as e:
+        raise HTTPException(503, f"Server busy: {str(e)}")
+    except asyncio.TimeoutError:
+        raise HTTPException(504, f"Timed out fetching {len(request.symbols)} symbols after {worker_pool.timeout:g}s")
     except Exception as e:
         raise HTTPException(500, f"Error fetching multiple symbols: {str(e)}")
 
 
+@router.get("/indicators/atr")
+async def get_atr(
+    symbol: str = Query(..., description="Stock symbol"),
+    timeframe: TimeframeEnum = Query(TimeframeEnum.FIVE_MIN, description="Bar timeframe for the ATR"),
+    date: Optional[str] = Query(None, description="ATR as of the last bar of this day (YYYY-MM-DD, default today)"),
+    period: int = Query(14, ge=1, le=500, description="ATR period"),
+    method: ATRMethodEnum = Query(ATRMethodEnum.SMA, description="Smoothing: sma, ema or wilder"),
+    base_timeframe: Optional[TimeframeEnum] = Query(None, description="Build timeframe bars from this base timeframe")
+):
+    """
+    Average True Range for a symbol as of a day
+    
+    Memoized per (symbol, timeframe, day, period, method, base): completed days
+    are computed once, the current day is refreshed after DERIVED_TTL seconds.
+    """
+    symbol = symbol.upper()
+    day = date or datetime.now().strftime("%Y-%m-%d")
+    base = base_timeframe.value if base_timeframe else None
+    
+    if base:
+        try:
+            check_resample(base, timeframe.value)
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+    
+    try:
+        result = await worker_pool.run(
+            derived_series.atr, symbol, timeframe.value, day,
+            period, method.value, base
+        )
+    except WorkerPoolFullError as e:
+        raise HTTPException(503, f"Server busy: {str(e)}")
+    except asyncio.TimeoutError:
+        raise HTTPException(504, f"Timed out computing ATR for {symbol} after {worker_pool.timeout:g}s")
+    except Exception as e:
+        raise HTTPException(500, f"Error computing ATR: {str(e)}")
+    
+    if result is None:
+        raise HTTPException(404, f"Not enough {timeframe.value} bars for a {period}-period ATR of {symbol} on {day}")
+    
+    return result
+
+
 @router.get("/latest/{symbol}")
 async def get_latest_price_endpoint(symbol: str):  # Renamed to avoid conflict with imported function
     """Get latest price for a symbol"""
@@ -215,11 +439,64 @@ async def get_cache_statistics():
     """Get cache statistics"""
     try:
         stats = get_storage_statistics()
+        stats["derived_series"] = derived_series.get_stats()
         return stats
     except Exception as e:
         raise HTTPException(500, f"Error getting cache stats: {str(e)}")
 
 
+@router.post("/cache/warmup", status_code=202)
+async def start_cache_warmup(request: WarmupRequest):
+    """
+    Start filling the cache for a watchlist in the background
+    
+    Requests run at bulk priority through this server's rate limiter, so
+    interactive /bars calls still go first. Poll GET /cache/warmup for
+    progress and the final report (throughput and coverage per spec).
+    """
+    task = warmup_state["task"]
+    if task is not None and not task.done():
+        raise HTTPException(409, "A cache warmup is already running")
+    
+    try:
+        specs = [WarmupSpec.parse(spec) for spec in (request.specs or [])] or None
+    except PolygonDataError as e:
+        raise HTTPException(400, str(e))
+    
+    warmer = CacheWarmer()
+    
+    async def run():
+        try:
+            warmup_state["report"] = await warmer.run(
+                request.symbols, specs, request.end_date, request.max_concurrency
+            )
+        except Exception as e:
+            warmup_state["error"] = str(e)
+        finally:
+            await warmer.close()
+    
+    warmup_state.update(warmer=warmer, report=None, error=None)
+    warmup_state["task"] = asyncio.create_task(run())
+    return {
+        "status": "started",
+        "symbols": len(request.symbols),
+        "specs": [str(spec) for spec in specs] if specs else list(warmer.config.warmup_specs)
+    }
+
+
+@router.get("/cache/warmup")
+async def get_cache_warmup():
+    """Progress of the running cache warmup, or the last run's report"""
+    task = warmup_state["task"]
+    if task is None:
+        return {"status": "idle"}
+    if not task.done():
+        return {"status": "running", "progress": warmup_state["warmer"].get_progress()}
+    if warmup_state["error"]:
+        return {"status": "failed", "error": warmup_state["error"]}
+    return {"status": "complete", "report": warmup_state["report"]}
+
+
 @router.delete("/cache")
 async def clear_cache_endpoint(  # Renamed to avoid conflict with imported function
     symbol: Optional[str] = Query(None, description="Clear specific symbol"),
@@ -2,11 +2,13 @@
 WebSocket endpoints for real-time data streaming
 """
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from typing import Dict, Set, List, Optional
+from typing import Dict, Set, List, Optional, Tuple
+from collections import defaultdict, deque
 import json
 import asyncio
 from datetime import datetime
 import logging
+import orjson
 
 # Import from parent polygon module
 from ... import PolygonWebSocketClient
@@ -18,35 +20,213 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["websocket"])
 
-# Active WebSocket connections
+# Upstream channel -> processed event type, and the reverse for dispatch
+CHANNEL_EVENTS = {"T": "trade", "Q": "quote", "A": "aggregate", "AM": "aggregate"}
+EVENT_CHANNELS = {"trade": ("T",), "quote": ("Q",), "aggregate": ("A", "AM")}
+
+# Event types where only the latest value per symbol matters to a slow client
+CONFLATED_EVENTS = {"quote", "aggregate"}
+
+# Subscription id for the single shared upstream callback
+UPSTREAM_SUBSCRIPTION_ID = "server_fanout"
+
+
+class ClientConnection:
+    """
+    Outbound buffer and sender task for one WebSocket client
+    
+    Market data is queued without awaiting the socket, so a slow client
+    never delays the others. Per client:
+    - trades go to a bounded queue that drops the oldest when full
+    - quotes/aggregates are conflated to the latest value per symbol
+    - everything pending is sent as one frame every batch interval
+    - control messages (acks, pongs, errors) are sent first and never dropped
+    """
+    
+    def __init__(self, client_id: str, websocket: WebSocket,
+                 max_queue: int, batch_interval: float, conflate: bool):
+        self.client_id = client_id
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.batch_interval = batch_interval
+        self.conflate = conflate
+        
+        self.pending: deque = deque()
+        self.latest: Dict[Tuple[str, str], dict] = {}
+        self.control: deque = deque()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._on_closed = None
+        
+        # Counters
+        self.frames_sent = 0
+        self.messages_sent = 0
+        self.dropped = 0
+        self.conflated = 0
+        
+    def start(self, on_closed=None):
+        """Start the sender task; on_closed(client_id) runs if the socket fails"""
+        self._on_closed = on_closed
+        self._task = asyncio.create_task(self._run())
+        
+    def enqueue(self, data: dict):
+        """Queue a market data item (never blocks)"""
+        if self.conflate and data.get("event_type") in CONFLATED_EVENTS:
+            key = (data.get("symbol"), data.get("event_type"))
+            if key in self.latest:
+                self.conflated += 1
+            self.latest[key] = data
+        else:
+            if len(self.pending) >= self.max_queue:
+                self.pending.popleft()
+                self.dropped += 1
+            self.pending.append(data)
+        self._wakeup.set()
+        
+    def send_control(self, message: dict):
+        """Queue a control message ahead of market data"""
+        self.control.append(message)
+        self._wakeup.set()
+        
+    async def close(self):
+        """Stop the sender task"""
+        if self._task and self._task is not asyncio.current_task():
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._task = None
+        
+    def get_stats(self) -> dict:
+        """Queue and delivery counters"""
+        return {
+            "queued": len(self.pending) + len(self.latest),
+            "frames_sent": self.frames_sent,
+            "messages_sent": self.messages_sent,
+            "dropped": self.dropped,
+            "conflated": self.conflated
+        }
+        
+    async def _run(self):
+        """Sender loop: control first, then micro-batched market data"""
+        try:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                
+                await self._send_control()
+                
+                if not (self.pending or self.latest):
+                    continue
+                
+                # Let more items accumulate so they share one frame
+                if self.batch_interval > 0:
+                    await asyncio.sleep(self.batch_interval)
+                    await self._send_control()
+                
+                items = list(self.pending)
+                items.extend(self.latest.values())
+                self.pending.clear()
+                self.latest.clear()
+                
+                if self.conflate and len(items) > 1:
+                    items.sort(key=lambda item: item.get("timestamp") or 0)
+                
+                await self._send_market_data(items)
+                
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Sender for client {self.client_id} stopped: {e}")
+            if self._on_closed:
+                await self._on_closed(self.client_id)
+                
+    async def _send_control(self):
+        """Send all queued control messages"""
+        while self.control:
+            await self._send(self.control.popleft())
+            
+    async def _send_market_data(self, items: List[dict]):
+        """Send items as one batch frame (or one frame each when batching is off)"""
+        timestamp = datetime.now().isoformat()
+        
+        if self.batch_interval > 0:
+            await self._send({
+                "type": "market_data_batch",
+                "count": len(items),
+                "data": items,
+                "timestamp": timestamp
+            })
+        else:
+            for item in items:
+                await self._send({"type": "market_data", "data": item, "timestamp": timestamp})
+                
+        self.messages_sent += len(items)
+        
+    async def _send(self, message: dict):
+        """Serialize and write one frame"""
+        await self.websocket.send_text(orjson.dumps(message, default=str).decode())
+        self.frames_sent += 1
+
+
 class ConnectionManager:
+    """
+    Fans out one upstream Polygon stream to many WebSocket clients
+    
+    - One upstream subscription per (symbol, channel), shared by all clients
+      and released when the last subscriber leaves
+    - A (symbol, channel) -> clients index, so each message only visits
+      interested clients
+    - Per-client ClientConnection buffers, so delivery never waits on a socket
+    """
+    
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
         self.client_subscriptions: Dict[str, Set[str]] = {}
+        self.clients: Dict[str, ClientConnection] = {}
+        self.channel_clients: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
         self.polygon_client: Optional[PolygonWebSocketClient] = None
         self.listen_task: Optional[asyncio.Task] = None
+        self._subscribe_lock = asyncio.Lock()
         
     async def connect(self, websocket: WebSocket, client_id: str):
         """Accept new WebSocket connection"""
         await websocket.accept()
+        
+        client = ClientConnection(
+            client_id,
+            websocket,
+            max_queue=config.ws_send_queue_size,
+            batch_interval=config.ws_batch_interval_ms / 1000,
+            conflate=config.ws_conflate
+        )
+        client.start(on_closed=self.disconnect)
+        
         self.active_connections[client_id] = websocket
         self.client_subscriptions[client_id] = set()
+        self.clients[client_id] = client
         logger.info(f"Client {client_id} connected")
         
-    def disconnect(self, client_id: str):
-        """Remove WebSocket connection"""
+    async def disconnect(self, client_id: str):
+        """Remove WebSocket connection and release its upstream subscriptions"""
+        client = self.clients.pop(client_id, None)
         if client_id in self.active_connections:
             del self.active_connections[client_id]
             del self.client_subscriptions[client_id]
             logger.info(f"Client {client_id} disconnected")
             
+        if client:
+            await client.close()
+            
+        keys = [key for key, clients in self.channel_clients.items() if client_id in clients]
+        await self._release(client_id, keys)
+            
     async def send_to_client(self, client_id: str, data: dict):
         """Send data to specific client"""
-        if client_id in self.active_connections:
-            try:
-                await self.active_connections[client_id].send_json(data)
-            except Exception as e:
-                logger.error(f"Error sending to client {client_id}: {e}")
+        client = self.clients.get(client_id)
+        if client:
+            client.send_control(data)
                 
     async def broadcast(self, data: dict, symbol: str = None):
         """Broadcast data to all relevant clients"""
@@ -57,7 +237,7 @@ class ConnectionManager:
                     await self.send_to_client(client_id, data)
         else:
             # Broadcast to all
-            for client_id in self.active_connections:
+            for client_id in list(self.clients):
                 await self.send_to_client(client_id, data)
                 
     async def ensure_polygon_connected(self):
@@ -72,28 +252,106 @@ class ConnectionManager:
             
     async def subscribe_client(self, client_id: str, symbols: List[str], channels: List[str]):
         """Subscribe client to symbols"""
-        await self.ensure_polygon_connected()
-        
-        # Update client subscriptions
-        self.client_subscriptions[client_id].update(symbols)
-        
-        # Create callback for this subscription
-        async def data_callback(data):
-            # Format data for client
-            message = {
-                "type": "market_data",
-                "data": data,
-                "timestamp": datetime.now().isoformat()
-            }
+        async with self._subscribe_lock:
+            await self.ensure_polygon_connected()
+            
+            symbols = [symbol.upper() for symbol in symbols]
+            new_upstream: Dict[str, List[str]] = defaultdict(list)
+            
+            # Update client subscriptions and the dispatch index
+            self.client_subscriptions[client_id].update(symbols)
+            for symbol in symbols:
+                for channel in channels:
+                    subscribers = self.channel_clients[(symbol, channel)]
+                    if not subscribers:
+                        new_upstream[channel].append(symbol)
+                    subscribers.add(client_id)
             
-            # Send to subscribing client
-            await self.send_to_client(client_id, message)
+            # Only (symbol, channel) pairs nobody had yet go upstream
+            for channel, channel_symbols in new_upstream.items():
+                await self.polygon_client.subscribe(
+                    channel_symbols, [channel], self._on_market_data,
+                    UPSTREAM_SUBSCRIPTION_ID, batch=True
+                )
         
-        # Subscribe to Polygon
-        sub_id = f"client_{client_id}"
-        await self.polygon_client.subscribe(symbols, channels, data_callback, sub_id)
+        return f"client_{client_id}"
+    
+    async def unsubscribe_client(self, client_id: str, symbols: List[str],
+                                 channels: Optional[List[str]] = None):
+        """Unsubscribe client from symbols (all channels if none given)"""
+        symbols = {symbol.upper() for symbol in symbols}
+        keys = [
+            key for key, clients in self.channel_clients.items()
+            if key[0] in symbols and (channels is None or key[1] in channels)
+            and client_id in clients
+        ]
+        await self._release(client_id, keys)
+        
+        # Drop symbols the client no longer receives on any channel
+        remaining = {symbol for (symbol, _), clients in self.channel_clients.items() if client_id in clients}
+        if client_id in self.client_subscriptions:
+            self.client_subscriptions[client_id] &= remaining
+        
+    async def close(self):
+        """Stop all client senders"""
+        for client in list(self.clients.values()):
+            await client.close()
+        
+    def get_stats(self) -> dict:
+        """Fan-out statistics per client"""
+        return {
+            "upstream_subscriptions": len(self.channel_clients),
+            "clients": {client_id: client.get_stats() for client_id, client in self.clients.items()}
+        }
+        
+    def _on_market_data(self, items: List[dict]):
+        """Shared upstream batch callback: queue each item for every interested client"""
+        channel_clients = self.channel_clients
+        
+        for data in items:
+            symbol = data.get("symbol")
+            channels = EVENT_CHANNELS.get(data.get("event_type"), ())
+            
+            if len(channels) == 1:
+                recipients = channel_clients.get((symbol, channels[0]), ())
+            else:
+                recipients = set()
+                for channel in channels:
+                    recipients.update(channel_clients.get((symbol, channel), ()))
+            
+            for client_id in recipients:
+                client = self.clients.get(client_id)
+                if client:
+                    client.enqueue(data)
+                
+    async def _release(self, client_id: str, keys: List[Tuple[str, str]]):
+        """Remove a client from (symbol, channel) keys, unsubscribing upstream when unused"""
+        released: Dict[str, List[str]] = defaultdict(list)
         
-        return sub_id
+        async with self._subscribe_lock:
+            for key in keys:
+                subscribers = self.channel_clients.get(key)
+                if subscribers is None:
+                    continue
+                subscribers.discard(client_id)
+                if not subscribers:
+                    del self.channel_clients[key]
+                    released[key[1]].append(key[0])
+            
+            if not self.polygon_client:
+                return
+            
+            for channel, channel_symbols in released.items():
+                try:
+                    for symbol in channel_symbols:
+                        # Keep the shared callback while the symbol has other channels
+                        still_used = any(key[0] == symbol for key in self.channel_clients)
+                        await self.polygon_client.unsubscribe(
+                            [symbol], [channel],
+                            subscription_id=None if still_used else UPSTREAM_SUBSCRIPTION_ID
+                        )
+                except Exception as e:
+                    logger.error(f"Upstream unsubscribe failed for {channel_symbols}: {e}")
 
 
 # Global connection manager
@@ -108,14 +366,19 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
     Protocol:
     - Connect: ws://localhost:8200/ws/{client_id}
     - Subscribe: {"action": "subscribe", "symbols": ["AAPL"], "channels": ["T", "Q"]}
-    - Unsubscribe: {"action": "unsubscribe", "symbols": ["AAPL"]}
+    - Unsubscribe: {"action": "unsubscribe", "symbols": ["AAPL"], "channels": ["Q"]}
+      (channels optional, defaults to all)
     - Ping: {"action": "ping"}
+    
+    Market data arrives as {"type": "market_data_batch", "count": n, "data": [...]}
+    frames every WS_BATCH_INTERVAL_MS, or one {"type": "market_data", "data": {...}}
+    frame per item when the interval is 0
     """
     await manager.connect(websocket, client_id)
     
     try:
         # Send welcome message
-        await websocket.send_json({
+        await manager.send_to_client(client_id, {
             "type": "connected",
             "message": "Connected to Polygon data stream",
             "client_id": client_id,
@@ -136,46 +399,48 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
                 if symbols:
                     sub_id = await manager.subscribe_client(client_id, symbols, channels)
                     
-                    await websocket.send_json({
+                    await manager.send_to_client(client_id, {
                         "type": "subscribed",
                         "symbols": symbols,
                         "channels": channels,
                         "subscription_id": sub_id
                     })
                 else:
-                    await websocket.send_json({
+                    await manager.send_to_client(client_id, {
                         "type": "error",
                         "message": "No symbols provided"
                     })
                     
             elif action == "unsubscribe":
-                # Handle unsubscribe
+                # Unsubscribe from symbols
                 symbols = data.get("symbols", [])
-                # TODO: Implement unsubscribe logic
+                channels = data.get("channels")
+                
+                await manager.unsubscribe_client(client_id, symbols, channels)
                 
-                await websocket.send_json({
+                await manager.send_to_client(client_id, {
                     "type": "unsubscribed",
                     "symbols": symbols
                 })
                 
             elif action == "ping":
                 # Respond to ping
-                await websocket.send_json({
+                await manager.send_to_client(client_id, {
                     "type": "pong",
                     "timestamp": datetime.now().isoformat()
                 })
                 
             else:
-                await websocket.send_json({
+                await manager.send_to_client(client_id, {
                     "type": "error",
                     "message": f"Unknown action: {action}"
                 })
                 
     except WebSocketDisconnect:
-        manager.disconnect(client_id)
+        await manager.disconnect(client_id)
     except Exception as e:
         logger.error(f"WebSocket error for client {client_id}: {e}")
-        manager.disconnect(client_id)
+        await manager.disconnect(client_id)
         await websocket.close()
 
 
@@ -190,5 +455,6 @@ async def websocket_status():
         "active_clients": len(manager.active_connections),
         "client_ids": list(manager.active_connections.keys()),
         "polygon_connected": polygon_status.get("connected", False),
-        "polygon_status": polygon_status
-    }
\ No newline at end of file
+        "polygon_status": polygon_status,
+        "fanout": manager.get_stats()
+    }
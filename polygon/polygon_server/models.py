@@ -27,6 +27,26 @@ class DataSourceEnum(str, Enum):
     AUTO = "auto"
 
 
+class BarFormatEnum(str, Enum):
+    """Response formats for /bars"""
+    RECORDS = "records"      # JSON list of per-bar objects
+    COLUMNAR = "columnar"    # JSON object of column arrays
+    ARROW = "arrow"          # Arrow IPC stream
+
+
+class StreamFormatEnum(str, Enum):
+    """Streaming formats for /bars/multiple"""
+    NDJSON = "ndjson"        # One JSON line per symbol
+    ARROW = "arrow"          # Arrow IPC stream, one record batch per symbol
+
+
+class PriorityEnum(str, Enum):
+    """Scheduling priority for upstream API requests"""
+    INTERACTIVE = "interactive"  # A user is waiting (UI analysis, dashboards)
+    NORMAL = "normal"
+    BULK = "bulk"                # Scans and backfills
+
+
 class ChannelEnum(str, Enum):
     """WebSocket channel types"""
     TRADES = "T"
@@ -44,6 +64,10 @@ class BarsRequest(BaseModel):
     limit: Optional[int] = Field(None, description="Maximum number of bars")
     use_cache: bool = Field(True, description="Use cached data if available")
     validate: bool = Field(True, description="Validate data quality")
+    format: Optional[BarFormatEnum] = Field(None, description="Response format (default: negotiated from Accept header)")
+    resample: Optional[TimeframeEnum] = Field(None, description="Resample the timeframe bars server-side (e.g. 15min from 1min)")
+    priority: PriorityEnum = Field(PriorityEnum.NORMAL, description="Scheduling priority for Polygon API requests")
+    deadline_seconds: Optional[float] = Field(None, description="Dispatch API requests within this many seconds")
     
     @validator('symbol')
     def uppercase_symbol(cls, v):
@@ -62,6 +86,13 @@ class BarsResponse(BaseModel):
     validation: Optional[Dict[str, Any]] = None
 
 
+class ATRMethodEnum(str, Enum):
+    """ATR smoothing methods"""
+    SMA = "sma"
+    EMA = "ema"
+    WILDER = "wilder"
+
+
 class MultipleBarsRequest(BaseModel):
     """Request for multiple symbols"""
     symbols: List[str] = Field(..., description="List of symbols")
@@ -69,8 +100,22 @@ class MultipleBarsRequest(BaseModel):
     start_date: Optional[str] = None
     end_date: Optional[str] = None
     parallel: bool = Field(True, description="Fetch in parallel")
+    stream: bool = Field(False, description="Stream each symbol's bars as soon as it is ready")
+    format: Optional[StreamFormatEnum] = Field(None, description="Stream format (default: negotiated from Accept header)")
+    use_cache: bool = Field(True, description="Use cached data if available (stream only)")
+    validate: bool = Field(True, description="Validate data quality (stream only)")
+    limit: Optional[int] = Field(None, description="Maximum bars per symbol (stream only)")
+    priority: PriorityEnum = Field(PriorityEnum.BULK, description="Scheduling priority for Polygon API requests")
     
 
+class WarmupRequest(BaseModel):
+    """Request to warm the cache for a watchlist"""
+    symbols: List[str] = Field(..., description="Watchlist symbols")
+    specs: Optional[List[str]] = Field(None, description="timeframe:sessions specs, e.g. ['1day:60', '5min:30'] (default: server config)")
+    end_date: Optional[str] = Field(None, description="Last day to warm (YYYY-MM-DD, default: today)")
+    max_concurrency: Optional[int] = Field(None, description="Chunk requests in flight")
+
+
 class SymbolValidationRequest(BaseModel):
     """Request to validate symbols"""
     symbols: List[str] = Field(..., description="Symbols to validate")
@@ -93,6 +138,8 @@ class ServerStatus(BaseModel):
     websocket_clients: int
     cache_stats: Dict[str, Any]
     rate_limit_status: Dict[str, Any]
+    queue_depth: int = 0
+    worker_pool: Optional[Dict[str, Any]] = None
     system_metrics: Optional[Dict[str, Any]] = None
 
 
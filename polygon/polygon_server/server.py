@@ -5,6 +5,7 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import ORJSONResponse
 from typing import Any
+import asyncio
 import orjson
 import logging
 import sys
@@ -14,6 +15,7 @@ from .. import (
     PolygonDataManager, 
     get_storage_statistics, 
     get_rate_limit_status,
+    get_storage_manager,
     initialize,
     __version__
 )
@@ -105,6 +107,10 @@ async def startup_event():
     initialize(api_key=config.polygon_api_key)
     logger.info("Polygon module initialized")
     
+    # Compact, tier and trim the parquet cache in the background
+    if get_storage_manager().start_compactor():
+        logger.info("Cache compactor started")
+    
     logger.info(f"Server ready at http://{config.host}:{config.port}")
 
 # Shutdown event
@@ -115,9 +121,17 @@ async def shutdown_event():
     
     # Close WebSocket connections
     from .endpoints.websocket import manager
+    await manager.close()
     if manager.polygon_client:
         await manager.polygon_client.disconnect()
     
+    # Release bar request workers
+    from .utils.worker_pool import worker_pool
+    worker_pool.shutdown()
+    
+    # Stop the compactor after its current symbol, off the event loop
+    await asyncio.to_thread(get_storage_manager().stop_compactor)
+    
     logger.info("Server shutdown complete")
 
 # Root endpoint
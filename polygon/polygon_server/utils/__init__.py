@@ -2,5 +2,17 @@
 Utility modules for Polygon server
 """
 from .json_encoder import PolygonJSONEncoder, polygon_json_dumps, polygon_json_response
+from .worker_pool import WorkerPool, WorkerPoolFullError, worker_pool
+from .bar_formats import (
+    negotiate_bar_format, negotiate_stream_format, bars_to_columns,
+    columnar_json_body, arrow_ipc_body,
+    ndjson_bars_line, ndjson_error_line, ArrowBatchStreamEncoder
+)
+from .derived_series import DerivedSeries, check_resample, timeframe_delta
 
-__all__ = ['PolygonJSONEncoder', 'polygon_json_dumps', 'polygon_json_response']
\ No newline at end of file
+__all__ = ['PolygonJSONEncoder', 'polygon_json_dumps', 'polygon_json_response',
+           'WorkerPool', 'WorkerPoolFullError', 'worker_pool',
+           'negotiate_bar_format', 'negotiate_stream_format', 'bars_to_columns',
+           'columnar_json_body', 'arrow_ipc_body',
+           'ndjson_bars_line', 'ndjson_error_line', 'ArrowBatchStreamEncoder',
+           'DerivedSeries', 'check_resample', 'timeframe_delta']
\ No newline at end of file
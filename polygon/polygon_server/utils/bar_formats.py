@@ -0,0 +1,192 @@
+"""
+Response encoders for OHLCV bars
+Column-oriented JSON and Arrow IPC are built straight from the DataFrame's
+numpy columns, avoiding a per-bar Python dict for every row
+"""
+import json
+from typing import Any, Dict, Optional
+
+import numpy as np
+import orjson
+import pandas as pd
+import pyarrow as pa
+
+# Media types accepted by /bars content negotiation
+JSON_MEDIA_TYPE = "application/json"
+COLUMNAR_MEDIA_TYPE = "application/vnd.polygon.columnar+json"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Bar columns in response order
+BAR_COLUMNS = ["open", "high", "low", "close", "volume", "vwap", "transactions"]
+
+
+def negotiate_bar_format(requested: Optional[str], accept: Optional[str]) -> str:
+    """
+    Pick the response format for /bars
+
+    An explicit `format` in the request body wins; otherwise the Accept header
+    decides, falling back to the original row-oriented JSON
+    """
+    if requested:
+        return requested
+
+    accept = (accept or "").lower()
+    if ARROW_MEDIA_TYPE in accept:
+        return "arrow"
+    if COLUMNAR_MEDIA_TYPE in accept:
+        return "columnar"
+    return "records"
+
+
+def bars_to_columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Column arrays for a bar DataFrame
+
+    `timestamp` holds epoch milliseconds (UTC); other columns keep their dtype
+    """
+    index = df.index if df.index.tz is None else df.index.tz_convert("UTC")
+    columns = {"timestamp": index.as_unit("ms").asi8}
+    for column in BAR_COLUMNS:
+        if column in df.columns:
+            columns[column] = np.ascontiguousarray(df[column].to_numpy())
+    return columns
+
+
+def columnar_json_body(df: pd.DataFrame, meta: Dict[str, Any]) -> bytes:
+    """Serialize bar metadata plus column arrays as one JSON document"""
+    body = dict(meta)
+    body["columns"] = bars_to_columns(df)
+    return orjson.dumps(body, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def arrow_ipc_body(df: pd.DataFrame, meta: Dict[str, Any]) -> bytes:
+    """
+    Serialize bars as an Arrow IPC stream
+
+    The response metadata (symbol, timeframe, validation, ...) is stored as
+    JSON under the `polygon` key of the schema metadata
+    """
+    arrays = {"timestamp": pa.array(df.index.tz_convert("UTC") if df.index.tz is not None else df.index)}
+    for column in BAR_COLUMNS:
+        if column in df.columns:
+            arrays[column] = pa.array(df[column].to_numpy())
+
+    table = pa.table(arrays).replace_schema_metadata(
+        {"polygon": json.dumps(meta, default=str)}
+    )
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+# Streaming batch formats
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+_NDJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+
+# Fixed schema for streamed Arrow batches (every symbol shares one stream)
+BATCH_ARROW_SCHEMA = pa.schema([
+    ("symbol", pa.string()),
+    ("timestamp", pa.timestamp("ms", tz="UTC")),
+    ("open", pa.float64()),
+    ("high", pa.float64()),
+    ("low", pa.float64()),
+    ("close", pa.float64()),
+    ("volume", pa.int64()),
+    ("vwap", pa.float64()),
+    ("transactions", pa.int64()),
+])
+
+
+def negotiate_stream_format(requested: Optional[str], accept: Optional[str]) -> str:
+    """Pick the streaming format: explicit request field, then Accept, then NDJSON"""
+    if requested:
+        return requested
+    if ARROW_MEDIA_TYPE in (accept or "").lower():
+        return "arrow"
+    return "ndjson"
+
+
+def ndjson_bars_line(symbol: str, df: pd.DataFrame) -> bytes:
+    """One NDJSON line with a symbol's bars as column arrays"""
+    return orjson.dumps(
+        {"symbol": symbol, "bar_count": len(df), "columns": bars_to_columns(df)},
+        option=_NDJSON_OPTIONS
+    )
+
+
+def ndjson_error_line(symbol: str, error: str) -> bytes:
+    """One NDJSON line reporting a symbol that failed"""
+    return orjson.dumps({"symbol": symbol, "error": error}, option=_NDJSON_OPTIONS)
+
+
+class _ChunkSink:
+    """File-like sink that hands back whatever was written since the last drain"""
+
+    def __init__(self):
+        self._chunks = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ArrowBatchStreamEncoder:
+    """
+    Incremental Arrow IPC stream of per-symbol record batches
+
+    Each symbol becomes one record batch (with a `symbol` column) whose custom
+    metadata carries the symbol; failed symbols are sent as empty batches with
+    an `error` entry in their metadata. Every method returns the bytes to send.
+    """
+
+    def __init__(self):
+        self._sink = _ChunkSink()
+        self._writer = pa.ipc.new_stream(pa.PythonFile(self._sink, mode="w"), BATCH_ARROW_SCHEMA)
+
+    def begin(self) -> bytes:
+        """Schema message"""
+        return self._sink.drain()
+
+    def encode(self, symbol: str, df: pd.DataFrame) -> bytes:
+        """Record batch for a symbol's bars"""
+        columns = bars_to_columns(df)
+        arrays = [
+            pa.array([symbol] * len(df), type=pa.string()),
+            pa.array(columns["timestamp"], type=pa.int64()).cast(pa.timestamp("ms", tz="UTC"))
+        ]
+        for field in list(BATCH_ARROW_SCHEMA)[2:]:
+            values = columns.get(field.name)
+            if values is None:
+                arrays.append(pa.nulls(len(df), type=field.type))
+            else:
+                arrays.append(pa.array(values, from_pandas=True).cast(field.type, safe=False))
+
+        batch = pa.record_batch(arrays, schema=BATCH_ARROW_SCHEMA)
+        self._writer.write_batch(batch, custom_metadata={"symbol": symbol})
+        return self._sink.drain()
+
+    def encode_error(self, symbol: str, error: str) -> bytes:
+        """Empty record batch carrying a symbol's error"""
+        batch = pa.RecordBatch.from_pylist([], schema=BATCH_ARROW_SCHEMA)
+        self._writer.write_batch(batch, custom_metadata={"symbol": symbol, "error": error})
+        return self._sink.drain()
+
+    def end(self) -> bytes:
+        """End-of-stream marker"""
+        self._writer.close()
+        return self._sink.drain()
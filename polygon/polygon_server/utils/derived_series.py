@@ -0,0 +1,203 @@
+"""
+Derived series computed on the server from a base timeframe
+Resampled bars and ATR are built once from cached base bars and memoized,
+so every consumer asking for 15-min bars or a 5-min ATR shares one result
+"""
+import math
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+# Import from parent polygon module
+from ... import BarCache, parse_timeframe, parse_date, resample_ohlcv, calculate_atr
+
+# Minutes in a regular session, used to size intraday lookbacks
+_SESSION_MINUTES = 390
+
+
+def timeframe_delta(timeframe: str) -> Optional[pd.Timedelta]:
+    """Fixed bar duration of a timeframe (None for months and longer)"""
+    multiplier, timespan = parse_timeframe(timeframe)
+    unit = {"second": "s", "minute": "min", "hour": "h", "day": "D", "week": "W"}.get(timespan)
+    return pd.Timedelta(multiplier, unit=unit) if unit else None
+
+
+def check_resample(base_timeframe: str, target_timeframe: str):
+    """Raise ValueError unless target bars can be built from base bars"""
+    base = timeframe_delta(base_timeframe)
+    target = timeframe_delta(target_timeframe)
+
+    if base is None:
+        raise ValueError(f"Cannot resample from {base_timeframe}")
+    if target is not None and (target < base or target % base):
+        raise ValueError(
+            f"{target_timeframe} is not a multiple of the base timeframe {base_timeframe}"
+        )
+
+
+class DerivedSeries:
+    """
+    Memoized resampling and indicators on top of the data manager
+
+    - Resampled frames are kept in a BarCache keyed by symbol, target and base
+      timeframe; narrower ranges are sliced from a cached wider range
+    - ATR values are memoized per (symbol, timeframe, day, ...); past days are
+      immutable, today's value expires after `ttl_seconds`
+    """
+
+    def __init__(self, data_manager, max_mb: float, ttl_seconds: int,
+                 max_indicators: int = 4096):
+        self.data_manager = data_manager
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.max_indicators = max_indicators
+        self.bars = BarCache(
+            max_bytes=int(max_mb * 1024 * 1024),
+            ttl_minutes=max(1, math.ceil(ttl_seconds / 60))
+        )
+
+        self._indicators: "OrderedDict[Tuple, Tuple[Dict[str, Any], Optional[datetime]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._indicator_hits = 0
+        self._indicator_misses = 0
+
+    def resample(self, symbol: str, base_timeframe: str, target_timeframe: str,
+                 start_date, end_date, use_cache: bool = True,
+                 validate: bool = True) -> pd.DataFrame:
+        """
+        Bars for target_timeframe built from base_timeframe bars
+
+        Covers whole UTC days from start_date through end_date; bars are
+        labelled with their start time, like Polygon aggregates
+        """
+        check_resample(base_timeframe, target_timeframe)
+
+        start = _day_start(start_date)
+        range_end = _day_start(end_date) + timedelta(days=1)
+        key = (symbol, target_timeframe, "resampled", base_timeframe, validate)
+
+        if use_cache:
+            cached = self.bars.get(key, start, range_end)
+            if cached is not None:
+                return cached[cached.index < range_end]
+
+        base = self.data_manager.fetch_data(
+            symbol=symbol,
+            timeframe=base_timeframe,
+            start_date=start,
+            end_date=range_end - timedelta(days=1),
+            use_cache=use_cache,
+            validate=validate
+        )
+        if base.empty:
+            return base
+
+        df = resample_ohlcv(base, target_timeframe, label="left", closed="left")
+        df = df[(df.index >= start) & (df.index < range_end)]
+
+        if use_cache:
+            self.bars.put(key, df, start, range_end)
+        return df
+
+    def atr(self, symbol: str, timeframe: str, day, period: int = 14,
+            method: str = "sma", base_timeframe: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        ATR as of the last bar on `day`
+
+        With base_timeframe the bars are resampled from it (sharing the
+        resample cache); otherwise timeframe bars are fetched directly.
+        Returns None when there are not enough bars.
+        """
+        day_start = _day_start(day)
+        base_timeframe = base_timeframe if base_timeframe and base_timeframe != timeframe else None
+        key = (symbol, timeframe, base_timeframe, period, method, day_start.date())
+
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            memo = self._indicators.get(key)
+            if memo is not None and (memo[1] is None or now < memo[1]):
+                self._indicators.move_to_end(key)
+                self._indicator_hits += 1
+                return memo[0]
+            self._indicator_misses += 1
+
+        lookback_start = day_start - timedelta(days=_lookback_days(timeframe, period))
+        if base_timeframe:
+            bars = self.resample(symbol, base_timeframe, timeframe,
+                                 lookback_start, day_start, validate=False)
+        else:
+            bars = self.data_manager.fetch_data(
+                symbol=symbol,
+                timeframe=timeframe,
+                start_date=lookback_start,
+                end_date=day_start,
+                validate=False
+            )
+
+        if bars.empty:
+            return None
+        bars = bars[bars.index < day_start + timedelta(days=1)]
+
+        atr = calculate_atr(bars, period, method).dropna()
+        if atr.empty:
+            return None
+
+        result = {
+            "symbol": symbol,
+            "timeframe": timeframe,
+            "base_timeframe": base_timeframe or timeframe,
+            "period": period,
+            "method": method,
+            "date": day_start.strftime("%Y-%m-%d"),
+            "atr": float(atr.iloc[-1]),
+            "as_of": atr.index[-1].isoformat(),
+            "bars_used": len(bars)
+        }
+
+        # Completed days never change; today's value is refreshed after the TTL
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        expires_at = now + self.ttl if day_start >= today else None
+
+        with self._lock:
+            self._indicators[key] = (result, expires_at)
+            self._indicators.move_to_end(key)
+            while len(self._indicators) > self.max_indicators:
+                self._indicators.popitem(last=False)
+
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache statistics for resampled bars and indicators"""
+        with self._lock:
+            lookups = self._indicator_hits + self._indicator_misses
+            indicators = {
+                "entries": len(self._indicators),
+                "hits": self._indicator_hits,
+                "misses": self._indicator_misses,
+                "hit_rate": self._indicator_hits / lookups if lookups else 0.0
+            }
+        return {"resampled_bars": self.bars.get_stats(), "indicators": indicators}
+
+
+def _day_start(value) -> datetime:
+    """Midnight UTC of a date, datetime or date string"""
+    return parse_date(value).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _lookback_days(timeframe: str, period: int) -> int:
+    """Calendar days of history needed for `period + 1` bars, with holiday slack"""
+    delta = timeframe_delta(timeframe)
+    bars_needed = period + 1
+
+    if delta is None:
+        multiplier, _ = parse_timeframe(timeframe)
+        return bars_needed * multiplier * 31 + 31
+
+    if delta < pd.Timedelta(days=1):
+        bars_per_session = max(1, int(pd.Timedelta(minutes=_SESSION_MINUTES) // delta))
+        sessions = math.ceil(bars_needed / bars_per_session) + 1
+        return int(sessions * 1.5) + 4
+
+    return int(bars_needed * delta.days * 1.5) + 10
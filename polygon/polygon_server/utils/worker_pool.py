@@ -0,0 +1,199 @@
+"""
+Bounded worker pool for blocking data-manager calls
+Keeps synchronous fetches (API, parquet, validation) off the event loop so
+health checks and WebSocket fan-out stay responsive during slow backfills
+"""
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+# Import from parent polygon module
+from ...rate_limiter import current_request_context, PRIORITY_BULK
+
+from ..config import config
+
+
+class WorkerPoolFullError(Exception):
+    """Raised when the pool's wait queue is at capacity"""
+    pass
+
+
+class WorkerPool:
+    """
+    Thread pool with a bounded wait queue and per-call timeouts
+
+    - At most `max_workers` calls run at once
+    - At most `max_queue` further calls wait; more are rejected immediately
+    - The timeout is end-to-end: it counts from the call to run(), so time
+      spent waiting for a bulk slot or a free worker uses it up too
+    - A call that exceeds its timeout returns control to the caller; the
+      thread finishes in the background (its result still lands in the cache)
+    - Calls run in a copy of the caller's context, so request_priority()
+      reaches the rate limiter; bulk-priority calls may use at most
+      `max_workers - interactive_reserve` workers at once
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, timeout: float,
+                 interactive_reserve: int = 0):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.max_bulk = max(1, max_workers - interactive_reserve)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._bulk_slots: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+
+        # Counters
+        self._queued = 0
+        self._active = 0
+        self._bulk_active = 0
+        self._completed = 0
+        self._failed = 0
+        self._timed_out = 0
+        self._rejected = 0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Create the executor lazily so importing the module starts no threads"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="bars-worker"
+                    )
+        return self._executor
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of calls waiting for a free worker"""
+        return self._queued
+
+    async def run(self, func: Callable[..., Any], *args,
+                  timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run a blocking callable on the pool and await its result
+
+        Raises WorkerPoolFullError when the queue is full and
+        asyncio.TimeoutError when queueing plus running exceeds the timeout
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout or self.timeout)
+
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise WorkerPoolFullError(
+                    f"Worker queue full ({self._queued} requests waiting)"
+                )
+            self._queued += 1
+
+        # Bulk work waits for a bulk slot so interactive calls find a free worker
+        context = current_request_context()
+        bulk = context is not None and context.priority >= PRIORITY_BULK
+        if bulk:
+            if self._bulk_slots is None:
+                self._bulk_slots = asyncio.Semaphore(self.max_bulk)
+            try:
+                await asyncio.wait_for(self._bulk_slots.acquire(), deadline - loop.time())
+            except BaseException as e:
+                with self._lock:
+                    self._queued -= 1
+                    if isinstance(e, asyncio.TimeoutError):
+                        self._timed_out += 1
+                raise
+
+        try:
+            work = self.executor.submit(
+                partial(contextvars.copy_context().run, self._invoke, func, *args, **kwargs)
+            )
+        except BaseException:
+            with self._lock:
+                self._queued -= 1
+            if bulk:
+                self._bulk_slots.release()
+            raise
+
+        # A call cancelled before it starts (e.g. by shutdown) never reaches _invoke
+        work.add_done_callback(self._forget_cancelled)
+        future = asyncio.wrap_future(work)
+
+        if bulk:
+            # Release when the thread finishes, even if the caller timed out
+            self._bulk_active += 1
+            future.add_done_callback(self._release_bulk_slot)
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(future), max(0.0, deadline - loop.time())
+            )
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._timed_out += 1
+            raise
+
+    def _release_bulk_slot(self, _future):
+        """Free a bulk slot (runs on the event loop)"""
+        self._bulk_active -= 1
+        self._bulk_slots.release()
+
+    def _forget_cancelled(self, work):
+        """Drop a call that was cancelled while still queued from the queue depth"""
+        if work.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    def _invoke(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Worker-thread wrapper that maintains queue/active counters"""
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._active -= 1
+
+        with self._lock:
+            self._completed += 1
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool statistics for /status"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "timeout_seconds": self.timeout,
+                "queue_depth": self._queued,
+                "active": self._active,
+                "max_bulk": self.max_bulk,
+                "bulk_active": self._bulk_active,
+                "completed": self._completed,
+                "failed": self._failed,
+                "timed_out": self._timed_out,
+                "rejected": self._rejected
+            }
+
+    def shutdown(self, wait: bool = False):
+        """Stop accepting work and release the threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+# Global pool for bar requests
+worker_pool = WorkerPool(
+    max_workers=config.fetch_workers,
+    max_queue=config.fetch_queue_size,
+    timeout=config.fetch_timeout,
+    interactive_reserve=config.fetch_interactive_reserve
+)
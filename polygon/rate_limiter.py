@@ -11,10 +11,14 @@ Implements intelligent rate limiting with queuing and backoff strategies.
 import time
 import asyncio
 import threading
-from collections import deque
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Callable, Any, Tuple
+from typing import Dict, List, Optional, Callable, Any, Tuple, Union
 import json
+import heapq
+import itertools
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
 from dataclasses import dataclass, field
 from queue import PriorityQueue, Queue
@@ -24,6 +28,87 @@ from .config import get_config, POLYGON_TIMEZONE
 from .exceptions import PolygonRateLimitError, PolygonConfigurationError
 
 
+# Request priorities (lower = served first)
+PRIORITY_INTERACTIVE = 1  # A user waiting on a UI (analysis threads, dashboards)
+PRIORITY_NORMAL = 5       # Default
+PRIORITY_BULK = 8         # Backfills, universe fetches, scanners
+
+PRIORITY_LEVELS = {
+    'interactive': PRIORITY_INTERACTIVE,
+    'normal': PRIORITY_NORMAL,
+    'bulk': PRIORITY_BULK
+}
+
+
+@dataclass(frozen=True)
+class RequestContext:
+    """
+    [CLASS SUMMARY]
+    Purpose: Scheduling hints for API requests made in the current context
+    Attributes:
+        - priority: Request priority (lower = higher priority)
+        - caller: Caller identity; callers of equal priority are served round-robin
+        - deadline: time.monotonic() by which requests should be dispatched
+    """
+    priority: int = PRIORITY_NORMAL
+    caller: str = 'default'
+    deadline: Optional[float] = None
+
+
+_request_context: ContextVar[Optional[RequestContext]] = ContextVar(
+    'polygon_request_context', default=None
+)
+
+
+def current_request_context() -> Optional[RequestContext]:
+    """
+    [FUNCTION SUMMARY]
+    Purpose: Scheduling hints set by the innermost request_priority block
+    Returns: RequestContext or None
+    """
+    return _request_context.get()
+
+
+@contextmanager
+def request_priority(priority: Union[int, str], caller: Optional[str] = None,
+                     deadline_seconds: Optional[float] = None,
+                     override: bool = True):
+    """
+    [FUNCTION SUMMARY]
+    Purpose: Schedule API requests made inside the block at a priority
+    Parameters:
+        - priority: Level name ('interactive', 'normal', 'bulk') or number
+        - caller (str, optional): Caller identity for fairness within a priority
+        - deadline_seconds (float, optional): Dispatch requests within this many
+          seconds, ahead of higher priorities if necessary
+        - override (bool): Replace an enclosing block's hints (False keeps them)
+    Example:
+        with request_priority('interactive', caller='analysis'):
+            df = fetcher.fetch_data('AAPL', '5min', start, end)
+    Note: Context variables follow asyncio tasks automatically; code that
+          hands work to threads must copy the context (contextvars.copy_context)
+    """
+    if not override and _request_context.get() is not None:
+        yield _request_context.get()
+        return
+
+    if isinstance(priority, str):
+        if priority not in PRIORITY_LEVELS:
+            raise ValueError(f"Unknown priority {priority!r}, expected one of {list(PRIORITY_LEVELS)}")
+        priority = PRIORITY_LEVELS[priority]
+
+    context = RequestContext(
+        priority=int(priority),
+        caller=caller or 'default',
+        deadline=time.monotonic() + deadline_seconds if deadline_seconds is not None else None
+    )
+    token = _request_context.set(context)
+    try:
+        yield context
+    finally:
+        _request_context.reset(token)
+
+
 @dataclass
 class RateLimitStats:
     """
@@ -88,21 +173,71 @@ class QueuedRequest:
         return self.priority < other.priority
 
 
+class _Waiter:
+    """
+    [CLASS SUMMARY]
+    Purpose: A caller waiting for a token
+    Attributes:
+        - priority: Request priority (lower = higher priority)
+        - caller: Caller identity used for round-robin within a priority
+        - deadline: time.monotonic() dispatch deadline, or None
+        - seq: Arrival sequence number
+        - event: Set when a sync waiter is granted a token
+        - future/loop: Resolved when an async waiter is granted a token
+        - done: Granted or cancelled (skipped by the scheduler)
+    """
+
+    __slots__ = ('priority', 'caller', 'deadline', 'seq', 'event', 'future', 'loop', 'done')
+
+    def __init__(self, context: RequestContext, seq: int,
+                 future: Optional[asyncio.Future] = None,
+                 loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.priority = context.priority
+        self.caller = context.caller
+        self.deadline = context.deadline
+        self.seq = seq
+        self.event = threading.Event() if future is None else None
+        self.future = future
+        self.loop = loop
+        self.done = False
+
+    def grant(self):
+        """Wake the waiter (called by the dispatcher thread)"""
+        if self.event is not None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(_resolve_future, self.future)
+
+
+def _resolve_future(future: asyncio.Future):
+    """Resolve a waiter future unless its caller already gave up"""
+    if not future.done():
+        future.set_result(None)
+
+
 class RateLimiter:
     """
     [CLASS SUMMARY]
     Purpose: Manage API rate limiting and request throttling
     Responsibilities:
-        - Track request rates per minute and day
+        - Token bucket for the per-minute limit plus a daily counter
+        - Schedule waiting callers (sync and async): priority first,
+          round-robin across callers within a priority, deadlines promoted
         - Queue requests when approaching limits
-        - Implement exponential backoff
-        - Provide usage statistics
+        - Provide usage statistics, persisted on a background timer
         - Handle multiple rate limit tiers
     Usage:
         limiter = RateLimiter()
-        limiter.check_and_wait()  # Will wait if needed
+        limiter.wait_if_needed()  # Takes a token, waiting if needed
         # Make API call
         limiter.record_request()
+    Note: The bucket refills at 90% of the tier's per-minute limit and holds
+          at most `rate_limit_burst_seconds` of refill, so no 60s window can
+          exceed the limit. When a token is free and nobody is waiting, a
+          caller only does O(1) arithmetic under a short lock; otherwise it
+          is queued and a dispatcher thread, sleeping until the next token is
+          due (no polling), grants tokens in scheduling order. Priority and
+          caller come from request_priority() blocks unless passed directly.
     """
     
     def __init__(self, config=None):
@@ -116,17 +251,42 @@ class RateLimiter:
         self.config = config or get_config()
         self.logger = self.config.get_logger(__name__)
         
-        # Thread safety
+        # Thread safety (held only for O(1) bookkeeping, never while sleeping)
         self._lock = threading.Lock()
+        self._dispatch_cond = threading.Condition(self._lock)
+        
+        # Token bucket for the per-minute limit
+        self._rate = max(
+            self.config.requests_per_minute * self.config.rate_limit_buffer, 1.0
+        ) / 60.0  # Tokens per second
+        self._capacity = max(1.0, self._rate * self.config.rate_limit_burst_seconds)
+        self._tokens = self._capacity
+        self._last_refill = time.monotonic()
         
-        # Request tracking
-        self._minute_requests = deque()  # Timestamps of requests in last minute
+        # Daily budget
+        self._daily_limit = int(self.config.requests_per_day * self.config.rate_limit_buffer)
         self._daily_requests = 0
         self._last_daily_reset = datetime.now(POLYGON_TIMEZONE).date()
         
+        # Requests per second over the last minute (60 one-second slots)
+        self._slot_counts = [0] * 60
+        self._slot_seconds = [0] * 60
+        
+        # Waiters: {priority: {caller: FIFO}}, callers rotated round-robin,
+        # plus a deadline heap for promotion
+        self._queues: Dict[int, 'OrderedDict[str, deque]'] = {}
+        self._deadlines: List[Tuple[float, int, _Waiter]] = []
+        self._waiting = 0
+        self._waiter_seq = itertools.count()
+        self._deadline_slack = self.config.rate_limit_deadline_slack_seconds
+        self._dispatcher_thread = None
+        self._stopping = False
+        
         # Statistics
         self.stats = RateLimitStats()
         self._response_times = deque(maxlen=100)  # Keep last 100 response times
+        self._response_time_sum = 0.0
+        self._stats_dirty = False
         
         # Request queue for when rate limited
         self._request_queue = PriorityQueue()
@@ -136,9 +296,11 @@ class RateLimiter:
         # Load persisted stats if available
         self._load_stats()
         
-        # Start queue processor
+        # Start queue processor and periodic stats persistence
         self._start_queue_processor()
-        
+        self._stats_thread = None
+        self._start_stats_timer()
+    
     def _load_stats(self):
         """
         [FUNCTION SUMMARY]
@@ -151,13 +313,13 @@ class RateLimiter:
             try:
                 with open(stats_file, 'r') as f:
                     data = json.load(f)
-                    
+                
                 # Restore daily count if same day
                 last_reset = datetime.fromisoformat(data.get('last_reset_time', ''))
                 if last_reset.date() == datetime.now(POLYGON_TIMEZONE).date():
                     self._daily_requests = data.get('requests_today', 0)
                     self.stats.requests_today = self._daily_requests
-                    
+                
                 # Restore cumulative stats
                 self.stats.total_requests = data.get('total_requests', 0)
                 self.stats.rate_limit_hits = data.get('rate_limit_hits', 0)
@@ -165,51 +327,131 @@ class RateLimiter:
                 self.stats.failed_requests = data.get('failed_requests', 0)
                 
                 self.logger.debug(f"Loaded rate limit stats: {self._daily_requests} requests today")
-                
+            
             except Exception as e:
                 self.logger.warning(f"Failed to load rate limit stats: {e}")
-                
+    
     def _save_stats(self):
         """
         [FUNCTION SUMMARY]
         Purpose: Persist rate limit statistics to disk
-        Note: Called periodically to maintain state
+        Note: Called by the stats timer and on stop
         """
         stats_file = self.config.data_dir / 'rate_limit_stats.json'
         
+        with self._lock:
+            self.stats.requests_today = self._daily_requests
+            self.stats.requests_per_minute = self._minute_usage()
+            data = self.stats.to_dict()
+            self._stats_dirty = False
+        
         try:
             with open(stats_file, 'w') as f:
-                json.dump(self.stats.to_dict(), f, indent=2)
+                json.dump(data, f, indent=2)
         except Exception as e:
             self.logger.error(f"Failed to save rate limit stats: {e}")
-            
+    
+    def _start_stats_timer(self):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Start background thread that persists changed stats
+        Note: Keeps file writes off the request path
+        """
+        interval = self.config.rate_limit_stats_flush_seconds
+        if not interval or interval <= 0:
+            return
+        
+        def run():
+            while not self._stop_processor.wait(interval):
+                if self._stats_dirty:
+                    self._save_stats()
+        
+        self._stats_thread = threading.Thread(
+            target=run,
+            name="RateLimiterStatsWriter",
+            daemon=True
+        )
+        self._stats_thread.start()
+    
     def _reset_daily_counter_if_needed(self):
         """
         [FUNCTION SUMMARY]
         Purpose: Reset daily request counter at midnight
-        Note: Called before checking limits
+        Note: Caller must hold self._lock
         """
         current_date = datetime.now(POLYGON_TIMEZONE).date()
         
         if current_date > self._last_daily_reset:
-            with self._lock:
-                self._daily_requests = 0
-                self._last_daily_reset = current_date
-                self.stats.requests_today = 0
-                self.stats.last_reset_time = datetime.now(POLYGON_TIMEZONE)
-                self.logger.info("Reset daily request counter")
-                
-    def _clean_minute_window(self):
+            self._daily_requests = 0
+            self._last_daily_reset = current_date
+            self.stats.requests_today = 0
+            self.stats.last_reset_time = datetime.now(POLYGON_TIMEZONE)
+            self.logger.info("Reset daily request counter")
+    
+    def _refill(self, now: float):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Add tokens accrued since the last refill
+        Parameters:
+            - now (float): time.monotonic() value
+        Note: Caller must hold self._lock
+        """
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self._capacity, self._tokens + elapsed * self._rate)
+            self._last_refill = now
+    
+    def _time_until_token(self, now: float) -> float:
         """
         [FUNCTION SUMMARY]
-        Purpose: Remove requests older than 1 minute from tracking
-        Note: Maintains sliding window of requests
+        Purpose: Seconds until a token can be taken (0 if one is available)
+        Parameters:
+            - now (float): time.monotonic() value (bucket already refilled)
+        Returns: float - Wait in seconds
+        Note: Caller must hold self._lock
         """
-        cutoff_time = time.time() - 60
+        self._reset_daily_counter_if_needed()
         
-        while self._minute_requests and self._minute_requests[0] < cutoff_time:
-            self._minute_requests.popleft()
-            
+        # Daily budget exhausted: wait until midnight
+        if self._daily_requests >= self._daily_limit:
+            current = datetime.now(POLYGON_TIMEZONE)
+            midnight = (current + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+            return max((midnight - current).total_seconds(), 0.001)
+        
+        if self._tokens >= 1.0:
+            return 0.0
+        return (1.0 - self._tokens) / self._rate
+    
+    def _take_token(self):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Consume one token and count the request
+        Note: Caller must hold self._lock
+        """
+        self._tokens -= 1.0
+        self._daily_requests += 1
+        
+        # Requests-per-second slot for minute usage
+        second = int(time.time())
+        slot = second % 60
+        if self._slot_seconds[slot] != second:
+            self._slot_seconds[slot] = second
+            self._slot_counts[slot] = 0
+        self._slot_counts[slot] += 1
+    
+    def _minute_usage(self) -> int:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Requests granted in the last 60 seconds
+        Returns: int - Request count
+        Note: Caller must hold self._lock
+        """
+        cutoff = int(time.time()) - 60
+        return sum(
+            count for count, second in zip(self._slot_counts, self._slot_seconds)
+            if second > cutoff
+        )
+    
     def get_current_usage(self) -> Dict[str, Any]:
         """
         [FUNCTION SUMMARY]
@@ -218,19 +460,21 @@ class RateLimiter:
         Example: usage = limiter.get_current_usage()
         """
         with self._lock:
-            self._clean_minute_window()
             self._reset_daily_counter_if_needed()
+            self._refill(time.monotonic())
+            minute_used = self._minute_usage()
             
             # Calculate percentages
-            minute_usage_pct = (len(self._minute_requests) / self.config.requests_per_minute) * 100
+            minute_usage_pct = (minute_used / self.config.requests_per_minute) * 100
             daily_usage_pct = (self._daily_requests / self.config.requests_per_day) * 100
             
             return {
                 'minute': {
-                    'used': len(self._minute_requests),
+                    'used': minute_used,
                     'limit': self.config.requests_per_minute,
-                    'remaining': max(0, self.config.requests_per_minute - len(self._minute_requests)),
-                    'usage_pct': round(minute_usage_pct, 2)
+                    'remaining': max(0, self.config.requests_per_minute - minute_used),
+                    'usage_pct': round(minute_usage_pct, 2),
+                    'tokens_available': round(self._tokens, 2)
                 },
                 'daily': {
                     'used': self._daily_requests,
@@ -239,106 +483,246 @@ class RateLimiter:
                     'usage_pct': round(daily_usage_pct, 2)
                 },
                 'queue_size': self._request_queue.qsize(),
+                'waiters': self._waiting,
+                'waiters_by_priority': {
+                    priority: sum(
+                        sum(not waiter.done for waiter in queue) for queue in callers.values()
+                    )
+                    for priority, callers in sorted(self._queues.items())
+                },
                 'tier': self.config.subscription_tier
             }
-            
+    
     def check_limit(self) -> Tuple[bool, Optional[float]]:
         """
         [FUNCTION SUMMARY]
         Purpose: Check if request would exceed rate limits
         Returns: tuple - (is_allowed, wait_time_seconds)
         Example: allowed, wait_time = limiter.check_limit()
+        Note: Does not take a token; use try_acquire or wait_if_needed for that
         """
         with self._lock:
-            self._clean_minute_window()
-            self._reset_daily_counter_if_needed()
-            
-            # Apply buffer to limits
-            minute_limit = int(self.config.requests_per_minute * self.config.rate_limit_buffer)
-            daily_limit = int(self.config.requests_per_day * self.config.rate_limit_buffer)
-            
-            # Check daily limit
-            if self._daily_requests >= daily_limit:
-                # Calculate time until midnight
-                now = datetime.now(POLYGON_TIMEZONE)
-                midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-                wait_seconds = (midnight - now).total_seconds()
-                
-                return False, wait_seconds
-            
-            # Check minute limit
-            current_minute_requests = len(self._minute_requests)
-            if current_minute_requests >= minute_limit:
-                # Calculate wait time
-                oldest_request = self._minute_requests[0]
-                wait_seconds = 60 - (time.time() - oldest_request) + 1
-                
-                return False, max(wait_seconds, 1)
-            
+            now = time.monotonic()
+            self._refill(now)
+            wait_seconds = self._time_until_token(now)
+            if wait_seconds > 0 or self._waiting:
+                return False, max(wait_seconds, 1.0 / self._rate)
             return True, None
-            
-    def wait_if_needed(self, priority: int = 5) -> float:
+    
+    def try_acquire(self) -> bool:
         """
         [FUNCTION SUMMARY]
-        Purpose: Wait if rate limit would be exceeded
+        Purpose: Take a token without waiting
+        Returns: bool - True if a token was taken
+        Example: if limiter.try_acquire(): make_request()
+        """
+        with self._lock:
+            if self._waiting:
+                return False
+            now = time.monotonic()
+            self._refill(now)
+            if self._time_until_token(now) > 0:
+                return False
+            self._take_token()
+            return True
+    
+    def wait_if_needed(self, priority: Optional[int] = None) -> float:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Take a token, waiting if rate limit would be exceeded
         Parameters:
-            - priority (int): Request priority (1=highest, 10=lowest)
+            - priority (int, optional): Request priority (1=highest, 10=lowest);
+              defaults to the request_priority() context, else PRIORITY_NORMAL
         Returns: float - Seconds waited
         Example: wait_time = limiter.wait_if_needed(priority=1)
         """
-        total_wait = 0.0
+        if self.try_acquire():
+            return 0.0
+        
+        start = time.monotonic()
+        waiter = self._enqueue(self._resolve_context(priority))
+        waiter.event.wait()
+        return self._record_wait(start)
+    
+    async def wait_if_needed_async(self, priority: Optional[int] = None) -> float:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Async version of wait_if_needed; waits without a thread
+        Parameters:
+            - priority (int, optional): Request priority (1=highest, 10=lowest);
+              defaults to the request_priority() context, else PRIORITY_NORMAL
+        Returns: float - Seconds waited
+        Example: wait_time = await limiter.wait_if_needed_async(priority=3)
+        """
+        if self.try_acquire():
+            return 0.0
+        
+        start = time.monotonic()
+        loop = asyncio.get_running_loop()
+        waiter = self._enqueue(self._resolve_context(priority), loop.create_future(), loop)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if not waiter.done:
+                    waiter.done = True
+                    self._waiting -= 1
+            raise
+        return self._record_wait(start)
+    
+    @staticmethod
+    def _resolve_context(priority: Optional[int]) -> RequestContext:
+        """Scheduling hints for a request: explicit priority over the context"""
+        context = _request_context.get() or RequestContext()
+        if priority is not None and priority != context.priority:
+            context = RequestContext(priority, context.caller, context.deadline)
+        return context
+        
+    def _enqueue(self, context: RequestContext, future: Optional[asyncio.Future] = None,
+                 loop: Optional[asyncio.AbstractEventLoop] = None) -> _Waiter:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Queue a waiter and wake the dispatcher
+        Parameters:
+            - context (RequestContext): Priority, caller and deadline
+            - future/loop: Set for async waiters
+        Returns: _Waiter - The queued waiter
+        """
+        waiter = _Waiter(context, next(self._waiter_seq), future, loop)
         
-        while True:
-            allowed, wait_time = self.check_limit()
+        with self._dispatch_cond:
+            callers = self._queues.setdefault(waiter.priority, OrderedDict())
+            queue = callers.get(waiter.caller)
+            if queue is None:
+                queue = callers[waiter.caller] = deque()
+            queue.append(waiter)
+            if waiter.deadline is not None:
+                heapq.heappush(self._deadlines, (waiter.deadline, waiter.seq, waiter))
+            self._waiting += 1
             
-            if allowed:
-                break
-                
-            if wait_time:
-                # Log wait reason
-                usage = self.get_current_usage()
-                if usage['daily']['remaining'] == 0:
+            self._start_dispatcher()
+            self._dispatch_cond.notify()
+            
+            if self._waiting == 1:
+                if self._daily_requests >= self._daily_limit:
                     self.logger.warning(
-                        f"Daily rate limit reached ({usage['daily']['used']}/{usage['daily']['limit']}), "
-                        f"waiting {wait_time:.1f} seconds"
+                        f"Daily rate limit reached ({self._daily_requests}/{self._daily_limit}), "
+                        f"requests wait until midnight"
                     )
                 else:
-                    self.logger.debug(
-                        f"Minute rate limit reached ({usage['minute']['used']}/{usage['minute']['limit']}), "
-                        f"waiting {wait_time:.1f} seconds"
-                    )
+                    self.logger.debug("Minute rate limit reached, queuing requests")
+        
+        return waiter
+        
+    def _next_waiter(self, now: float) -> Optional[_Waiter]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Pick the waiter to receive the next token
+        Parameters:
+            - now (float): time.monotonic() value
+        Returns: _Waiter or None
+        Note: Waiters within rate_limit_deadline_slack_seconds of their
+              deadline go first (earliest deadline first); otherwise the
+              lowest priority number wins, rotating across its callers.
+              Caller must hold self._lock.
+        """
+        while self._deadlines:
+            deadline, _, waiter = self._deadlines[0]
+            if waiter.done:
+                heapq.heappop(self._deadlines)
+                continue
+            if deadline - now <= self._deadline_slack:
+                heapq.heappop(self._deadlines)
+                return waiter
+            break
+        
+        for priority in sorted(self._queues):
+            callers = self._queues[priority]
+            while callers:
+                caller, queue = next(iter(callers.items()))
+                while queue and queue[0].done:
+                    queue.popleft()
+                if not queue:
+                    del callers[caller]
+                    continue
                 
-                # High priority requests get shorter waits
-                adjusted_wait = wait_time * (0.5 if priority <= 2 else 1.0)
+                waiter = queue.popleft()
+                if queue:
+                    callers.move_to_end(caller)
+                else:
+                    del callers[caller]
+                return waiter
+            del self._queues[priority]
+        
+        return None
+        
+    def _record_wait(self, start: float) -> float:
+        """Count a rate-limited wait in the stats"""
+        waited = time.monotonic() - start
+        with self._lock:
+            self.stats.rate_limit_hits += 1
+            self.stats.total_wait_time += waited
+            self._stats_dirty = True
+        return waited
+    
+    def _start_dispatcher(self):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Start the thread that grants tokens to waiters
+        Note: Caller must hold self._lock
+        """
+        if self._dispatcher_thread and self._dispatcher_thread.is_alive():
+            return
+        self._dispatcher_thread = threading.Thread(
+            target=self._dispatch_loop,
+            name="RateLimiterDispatcher",
+            daemon=True
+        )
+        self._dispatcher_thread.start()
+    
+    def _dispatch_loop(self):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Grant tokens to waiters in scheduling order
+        Note: Sleeps until a waiter arrives or the next token is due
+        """
+        with self._dispatch_cond:
+            while not self._stopping:
+                if not self._waiting:
+                    self._dispatch_cond.wait()
+                    continue
                 
-                # Update stats
-                self.stats.rate_limit_hits += 1
-                self.stats.total_wait_time += adjusted_wait
-                total_wait += adjusted_wait
+                now = time.monotonic()
+                self._refill(now)
+                delay = self._time_until_token(now)
+                if delay > 0:
+                    self._dispatch_cond.wait(delay)
+                    continue
                 
-                # Wait
-                time.sleep(adjusted_wait)
+                waiter = self._next_waiter(now)
+                if waiter is None:
+                    self._waiting = 0
+                    continue
                 
-        return total_wait
-        
+                self._take_token()
+                waiter.done = True
+                self._waiting -= 1
+                waiter.grant()
+    
     def record_request(self, response_time: Optional[float] = None,
                       success: bool = True):
         """
         [FUNCTION SUMMARY]
-        Purpose: Record that a request was made
+        Purpose: Record the outcome of a request
         Parameters:
             - response_time (float, optional): API response time in seconds
             - success (bool): Whether request succeeded
         Example: limiter.record_request(response_time=0.523, success=True)
+        Note: Rate accounting happens when the token is taken; this only
+              updates statistics, in O(1)
         """
         with self._lock:
-            # Add to tracking
-            current_time = time.time()
-            self._minute_requests.append(current_time)
-            self._daily_requests += 1
-            
             # Update stats
-            self.stats.requests_per_minute = len(self._minute_requests)
             self.stats.requests_today = self._daily_requests
             self.stats.total_requests += 1
             
@@ -347,15 +731,16 @@ class RateLimiter:
             else:
                 self.stats.failed_requests += 1
             
-            # Track response time
+            # Track response time with a running sum over the window
             if response_time is not None:
+                if len(self._response_times) == self._response_times.maxlen:
+                    self._response_time_sum -= self._response_times[0]
                 self._response_times.append(response_time)
-                self.stats.average_response_time = sum(self._response_times) / len(self._response_times)
+                self._response_time_sum += response_time
+                self.stats.average_response_time = self._response_time_sum / len(self._response_times)
             
-            # Save stats periodically
-            if self.stats.total_requests % 100 == 0:
-                self._save_stats()
-                
+            self._stats_dirty = True
+
     def estimate_time_for_requests(self, num_requests: int) -> Dict[str, Any]:
         """
         [FUNCTION SUMMARY]
@@ -546,6 +931,7 @@ class RateLimiter:
         Example: stats = limiter.get_statistics()
         """
         usage = self.get_current_usage()
+        self.stats.requests_per_minute = usage['minute']['used']
         stats_dict = self.stats.to_dict()
         
         # Add calculated metrics
@@ -574,8 +960,10 @@ class RateLimiter:
         Note: Does not reset current rate limit counters
         Example: limiter.reset_statistics()
         """
-        self.stats = RateLimitStats()
-        self._response_times.clear()
+        with self._lock:
+            self.stats = RateLimitStats()
+            self._response_times.clear()
+            self._response_time_sum = 0.0
         self._save_stats()
         self.logger.info("Reset rate limiter statistics")
         
@@ -586,10 +974,29 @@ class RateLimiter:
         Note: Call this before application shutdown
         Example: limiter.stop()
         """
-        # Stop queue processor
+        # Stop queue processor and stats timer
         self._stop_processor.set()
         if self._queue_processor_thread:
             self._queue_processor_thread.join(timeout=5)
+        if self._stats_thread:
+            self._stats_thread.join(timeout=5)
+        
+        # Stop dispatcher; release anyone still waiting
+        with self._dispatch_cond:
+            self._stopping = True
+            waiters = [
+                waiter
+                for callers in self._queues.values()
+                for queue in callers.values()
+                for waiter in queue
+                if not waiter.done
+            ]
+            self._queues.clear()
+            self._deadlines.clear()
+            self._waiting = 0
+            self._dispatch_cond.notify_all()
+        for waiter in waiters:
+            waiter.grant()
         
         # Save final stats
         self._save_stats()
@@ -601,7 +1008,8 @@ class AsyncRateLimiter:
     """
     [CLASS SUMMARY]
     Purpose: Async version of rate limiter for async/await code
-    Note: Shares state with sync RateLimiter through same tracking
+    Note: Shares the sync RateLimiter's token bucket; waiting is done on an
+          asyncio future, so no thread or event-loop time is spent polling
     Usage:
         async with AsyncRateLimiter() as limiter:
             await limiter.wait_if_needed()
@@ -618,33 +1026,16 @@ class AsyncRateLimiter:
         """
         self._sync_limiter = sync_limiter or RateLimiter()
         
-    async def wait_if_needed(self, priority: int = 5) -> float:
+    async def wait_if_needed(self, priority: Optional[int] = None) -> float:
         """
         [FUNCTION SUMMARY]
         Purpose: Async wait if rate limit would be exceeded
         Parameters:
-            - priority (int): Request priority
+            - priority (int, optional): Request priority (context default)
         Returns: float - Seconds waited
         Example: wait_time = await limiter.wait_if_needed()
         """
-        total_wait = 0.0
-        
-        while True:
-            allowed, wait_time = self._sync_limiter.check_limit()
-            
-            if allowed:
-                break
-                
-            if wait_time:
-                # Update stats
-                self._sync_limiter.stats.rate_limit_hits += 1
-                self._sync_limiter.stats.total_wait_time += wait_time
-                total_wait += wait_time
-                
-                # Async wait
-                await asyncio.sleep(wait_time)
-                
-        return total_wait
+        return await self._sync_limiter.wait_if_needed_async(priority)
         
     def record_request(self, response_time: Optional[float] = None,
                       success: bool = True):
@@ -699,6 +1090,13 @@ __all__ = [
     'RateLimiter',
     'AsyncRateLimiter',
     'RateLimitStats',
+    'RequestContext',
+    'request_priority',
+    'current_request_context',
+    'PRIORITY_INTERACTIVE',
+    'PRIORITY_NORMAL',
+    'PRIORITY_BULK',
+    'PRIORITY_LEVELS',
     'get_rate_limiter',
     'get_async_rate_limiter'
 ]
\ No newline at end of file
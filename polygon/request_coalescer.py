@@ -0,0 +1,219 @@
+# polygon/request_coalescer.py - Single-flight de-duplication of fetches
+"""
+Single-flight coalescing for data fetches. When several callers ask for the
+same symbol/timeframe/options at once, and each range is contained in one
+that is already in flight, they wait on that fetch and share its result
+instead of issuing their own API calls and cache writes. A caller never
+waits on a flight running at a lower request priority than its own.
+Works for threads (DataFetcher) and coroutines (AsyncDataFetcher) alike.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+import pandas as pd
+
+from .rate_limiter import PRIORITY_NORMAL
+
+
+class _Flight:
+    """
+    [CLASS SUMMARY]
+    Purpose: One in-flight fetch that other callers can wait on
+    Attributes:
+        - start: Range start (inclusive)
+        - end: Range end (inclusive)
+        - priority: Request priority of the leader (lower = higher priority)
+        - future: Result shared with followers
+        - waiters: Number of followers attached
+    """
+
+    __slots__ = ('start', 'end', 'priority', 'future', 'waiters')
+
+    def __init__(self, start: datetime, end: datetime, priority: int):
+        """Initialize flight for a range"""
+        self.start = start
+        self.end = end
+        self.priority = priority
+        self.future: Future = Future()
+        self.waiters = 0
+
+    def covers(self, start: datetime, end: datetime) -> bool:
+        """Check whether this flight's range contains the requested one"""
+        return self.start <= start and end <= self.end
+
+
+class RequestCoalescer:
+    """
+    [CLASS SUMMARY]
+    Purpose: Share one in-flight fetch between identical or contained requests
+    Responsibilities:
+        - Track in-flight fetches per key with their time ranges
+        - Make later callers whose range is covered wait for the leader
+        - Slice the shared result down to each follower's range
+    Usage:
+        coalescer = get_request_coalescer()
+        df = coalescer.run(key, start, end, lambda: fetch(start, end))
+        df = await coalescer.run_async(key, start, end, lambda: fetch_async(start, end))
+    Note: Followers only attach to flights of equal or higher priority, so an
+          interactive caller is never held behind tokens granted to bulk work
+    """
+
+    def __init__(self):
+        """Initialize empty in-flight table"""
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, List[_Flight]] = {}
+
+        # Statistics
+        self._leaders = 0
+        self._followers = 0
+
+    def run(self, key: Hashable, start: datetime, end: datetime,
+            func: Callable[[], pd.DataFrame],
+            priority: int = PRIORITY_NORMAL) -> pd.DataFrame:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Run func once for overlapping identical requests (threads)
+        Parameters:
+            - key: Request identity excluding the range
+            - start (datetime): Range start (inclusive)
+            - end (datetime): Range end (inclusive)
+            - func (callable): Performs the fetch for [start, end]
+            - priority (int): Caller's request priority (lower = higher priority)
+        Returns: DataFrame - Result for [start, end]
+        """
+        flight, is_leader = self._join(key, start, end, priority)
+
+        if not is_leader:
+            return self._slice(flight.future.result(), start, end)
+
+        try:
+            result = func()
+        except BaseException as e:
+            self._finish(key, flight)
+            flight.future.set_exception(e)
+            raise
+
+        return self._publish(key, flight, result)
+
+    async def run_async(self, key: Hashable, start: datetime, end: datetime,
+                        func: Callable[[], Awaitable[pd.DataFrame]],
+                        priority: int = PRIORITY_NORMAL) -> pd.DataFrame:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Run func once for overlapping identical requests (asyncio)
+        Parameters: Same as run, but func returns an awaitable
+        Returns: DataFrame - Result for [start, end]
+        Note: Shares flights with threaded callers of run()
+        """
+        flight, is_leader = self._join(key, start, end, priority)
+
+        if not is_leader:
+            result = await asyncio.wrap_future(flight.future)
+            return self._slice(result, start, end)
+
+        try:
+            result = await func()
+        except BaseException as e:
+            self._finish(key, flight)
+            flight.future.set_exception(e)
+            raise
+
+        return self._publish(key, flight, result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Get coalescing statistics
+        Returns: dict - In-flight count and leader/follower totals
+        """
+        with self._lock:
+            return {
+                'in_flight': sum(len(flights) for flights in self._inflight.values()),
+                'leaders': self._leaders,
+                'followers': self._followers,
+                'requests_saved': self._followers
+            }
+
+    def _join(self, key: Hashable, start: datetime, end: datetime,
+              priority: int) -> Tuple[_Flight, bool]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Attach to a covering flight or register a new one
+        Returns: tuple - (flight, is_leader)
+        Note: Flights of a lower priority than the caller's are skipped
+        """
+        with self._lock:
+            for flight in self._inflight.get(key, ()):
+                if flight.covers(start, end) and flight.priority <= priority:
+                    flight.waiters += 1
+                    self._followers += 1
+                    return flight, False
+
+            flight = _Flight(start, end, priority)
+            self._inflight.setdefault(key, []).append(flight)
+            self._leaders += 1
+            return flight, True
+
+    def _finish(self, key: Hashable, flight: _Flight) -> int:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Remove a flight so no new followers can attach
+        Returns: int - Number of followers waiting on it
+        """
+        with self._lock:
+            flights = self._inflight.get(key)
+            if flights is not None:
+                if flight in flights:
+                    flights.remove(flight)
+                if not flights:
+                    del self._inflight[key]
+            return flight.waiters
+
+    def _publish(self, key: Hashable, flight: _Flight, result: pd.DataFrame) -> pd.DataFrame:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Hand the leader's result to followers
+        Returns: DataFrame - Leader's own result (a copy if it is shared)
+        """
+        shared = self._finish(key, flight) > 0
+        flight.future.set_result(result)
+
+        # Followers slice the shared frame, so the leader's caller gets its own copy
+        return result.copy() if shared else result
+
+    @staticmethod
+    def _slice(df: pd.DataFrame, start: datetime, end: datetime) -> pd.DataFrame:
+        """Slice a sorted frame to [start, end] and return a copy"""
+        if df is None or df.empty:
+            return pd.DataFrame() if df is None else df.copy()
+
+        lo = df.index.searchsorted(start, side='left')
+        hi = df.index.searchsorted(end, side='right')
+        return df.iloc[lo:hi].copy()
+
+
+# Public convenience functions
+_coalescer: Optional[RequestCoalescer] = None
+
+
+def get_request_coalescer() -> RequestCoalescer:
+    """
+    [FUNCTION SUMMARY]
+    Purpose: Get or create the process-wide request coalescer
+    Returns: RequestCoalescer - Shared by sync and async fetchers
+    Example: coalescer = get_request_coalescer()
+    """
+    global _coalescer
+    if _coalescer is None:
+        _coalescer = RequestCoalescer()
+    return _coalescer
+
+
+__all__ = [
+    'RequestCoalescer',
+    'get_request_coalescer'
+]
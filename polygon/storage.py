@@ -1,26 +1,131 @@
 # polygon/storage.py - Local storage and caching for the Polygon module
 """
 Storage management for local caching of market data.
-Uses SQLite for metadata and parquet files for OHLCV data.
+Uses SQLite for metadata and partitioned parquet files for OHLCV data.
+
+Layout: parquet/symbols/{SYMBOL}/{timeframe}/{partition_key}.parquet
+Intraday bars are partitioned by day, hourly bars by month and daily or
+longer bars by year, so incremental saves only rewrite the partitions that
+received new bars and range reads only open the partitions they overlap.
+optimize_cache() later merges old day partitions into month partitions,
+builds 5/15-minute tiers from old 1-minute bars and keeps the cache within
+its disk budget by evicting least recently read symbol/timeframes.
 """
 
 import os
+import shutil
 import sqlite3
 import json
-import hashlib
+import zlib
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, time as dt_time
 from typing import Dict, List, Tuple, Optional, Any, Union
+import numpy as np
 import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
 from contextlib import contextmanager
 import threading
+import time
+import queue
+import atexit
 import logging
 
 from .config import get_config, POLYGON_TIMEZONE
 from .exceptions import PolygonStorageError, PolygonDataError
-from .utils import parse_date, parse_timeframe, format_date_for_api, normalize_ohlcv_data
+from .utils import parse_date, parse_timeframe, format_date_for_api, normalize_ohlcv_data, resample_ohlcv
+from .bar_cache import get_bar_cache
+from .calendar import trading_days, session_bounds
+
+try:
+    import xxhash
+    _HASH_ALGORITHM = 'xxh64'
+except ImportError:
+    xxhash = None
+    _HASH_ALGORITHM = 'crc32'
+
+
+class _Crc32Hasher:
+    """Streaming zlib.crc32 with the hashlib update/hexdigest interface"""
+    
+    def __init__(self):
+        self._value = 0
+        
+    def update(self, data):
+        self._value = zlib.crc32(data, self._value)
+        
+    def hexdigest(self) -> str:
+        return f"{self._value:08x}"
+
+
+def _new_hasher():
+    """Create a fast non-cryptographic hasher (xxh64 if installed, else crc32)"""
+    return xxhash.xxh64() if xxhash is not None else _Crc32Hasher()
+
+
+# Cache layout version - '1.0' is the legacy single-file-per-timeframe layout
+CACHE_LAYOUT_VERSION = '2.0'
+
+# Partition granularity by Polygon timespan -> strftime format of the partition key
+PARTITION_FORMATS = {
+    'second': '%Y-%m-%d',
+    'minute': '%Y-%m-%d',
+    'hour': '%Y-%m',
+    'day': '%Y',
+    'week': '%Y',
+    'month': '%Y',
+    'quarter': '%Y',
+    'year': '%Y'
+}
+
+# Compacted day partitions are merged into month partitions keyed like this
+COMPACTED_PARTITION_FORMAT = '%Y-%m'
+
+# Timeframe that lower-resolution cache tiers are built from
+TIER_SOURCE_TIMEFRAME = '1min'
+
+# Superseded partition files are deleted by a later compaction pass once they
+# are this old, so a reader that listed them just before can still open them
+_ORPHAN_GRACE_SECONDS = 600
+
+
+# Hot-path statements kept as constants so each pooled connection's
+# statement cache reuses the prepared form
+_SQL_SELECT_METADATA = '''
+    SELECT * FROM cache_metadata
+    WHERE symbol = ? AND timeframe = ?
+'''
+
+_SQL_REPLACE_METADATA = '''
+    REPLACE INTO cache_metadata (
+        symbol, timeframe, start_date, end_date, last_updated,
+        row_count, file_path, file_size, checksum, compression, version
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_REPLACE_PARTITION = '''
+    REPLACE INTO cache_partitions (
+        symbol, timeframe, partition_key, start_date, end_date,
+        row_count, file_path, file_size, checksum, last_updated
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_INSERT_ACCESS_LOG = '''
+    INSERT INTO cache_access_log
+    (symbol, timeframe, access_time, access_type, rows_accessed)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+
+def _to_db_time(value: Union[str, datetime, pd.Timestamp]) -> str:
+    """
+    [FUNCTION SUMMARY]
+    Purpose: Format a timestamp for SQLite range comparisons
+    Parameters:
+        - value: Timestamp in any format accepted by parse_date
+    Returns: str - UTC ISO string with second precision (sortable as text)
+    """
+    return parse_date(value).strftime('%Y-%m-%dT%H:%M:%S+00:00')
 
 
 class CacheMetadata:
@@ -34,9 +139,10 @@ class CacheMetadata:
         - end_date: End of cached data
         - last_updated: When cache was last updated
         - row_count: Number of rows cached
-        - file_path: Path to parquet file
-        - file_size: Size in bytes
+        - file_path: Path to partition directory (legacy: parquet file)
+        - file_size: Size in bytes (sum of all partitions)
         - checksum: Data integrity checksum
+        - partition_count: Number of parquet partitions
     """
     
     def __init__(self, **kwargs):
@@ -51,7 +157,8 @@ class CacheMetadata:
         self.file_size = kwargs.get('file_size', 0)
         self.checksum = kwargs.get('checksum')
         self.compression = kwargs.get('compression', 'snappy')
-        self.version = kwargs.get('version', '1.0')
+        self.version = kwargs.get('version', CACHE_LAYOUT_VERSION)
+        self.partition_count = kwargs.get('partition_count', 0)
         
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
@@ -66,7 +173,8 @@ class CacheMetadata:
             'file_size': self.file_size,
             'checksum': self.checksum,
             'compression': self.compression,
-            'version': self.version
+            'version': self.version,
+            'partition_count': self.partition_count
         }
 
 
@@ -97,8 +205,25 @@ class StorageManager:
         self.config = config or get_config()
         self.logger = self.config.get_logger(__name__)
         
-        # Thread lock for database operations
-        self._db_lock = threading.Lock()
+        # Pooled SQLite connections (WAL mode allows concurrent readers)
+        self._pool: 'queue.LifoQueue[sqlite3.Connection]' = queue.LifoQueue()
+        self._pool_lock = threading.Lock()
+        self._pool_created = 0
+        self._closed = False
+        
+        # Per symbol/timeframe write locks so concurrent saves never race on a partition
+        self._write_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._write_locks_guard = threading.Lock()
+        
+        # Buffered access log, flushed in batches by a background timer
+        self._access_buffer: List[Tuple] = []
+        self._access_lock = threading.Lock()
+        self._flush_event = threading.Event()
+        self._flush_thread: Optional[threading.Thread] = None
+        
+        # Background compactor (see start_compactor)
+        self._compactor_stop = threading.Event()
+        self._compactor_thread: Optional[threading.Thread] = None
         
         # Initialize storage paths
         self._init_storage_paths()
@@ -106,6 +231,9 @@ class StorageManager:
         # Initialize database
         self._init_database()
         
+        # Flush buffered log rows and close connections at interpreter exit
+        atexit.register(self.close)
+        
     def _init_storage_paths(self):
         """
         [FUNCTION SUMMARY]
@@ -156,6 +284,42 @@ class StorageManager:
                 ON cache_metadata(symbol, timeframe)
             ''')
             
+            # Create partition table (one row per parquet partition file)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS cache_partitions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    symbol TEXT NOT NULL,
+                    timeframe TEXT NOT NULL,
+                    partition_key TEXT NOT NULL,
+                    start_date TEXT NOT NULL,
+                    end_date TEXT NOT NULL,
+                    row_count INTEGER NOT NULL,
+                    file_path TEXT NOT NULL,
+                    file_size INTEGER NOT NULL,
+                    checksum TEXT,
+                    last_updated TEXT NOT NULL,
+                    UNIQUE(symbol, timeframe, partition_key)
+                )
+            ''')
+
+            # Index for range lookups
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_partitions_range
+                ON cache_partitions(symbol, timeframe, start_date, end_date)
+            ''')
+
+            # Create coverage index: one bitmap of covered days per symbol/timeframe/year
+            # (bit n = day-of-year n, set once that day was fetched completely)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS cache_coverage (
+                    symbol TEXT NOT NULL,
+                    timeframe TEXT NOT NULL,
+                    year INTEGER NOT NULL,
+                    bitmap BLOB NOT NULL,
+                    PRIMARY KEY(symbol, timeframe, year)
+                )
+            ''')
+            
             # Create cache access log table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS cache_access_log (
@@ -168,6 +332,12 @@ class StorageManager:
                 )
             ''')
             
+            # Index for LRU lookups (last read per symbol/timeframe)
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_access_log_entry
+                ON cache_access_log(symbol, timeframe, access_time)
+            ''')
+            
             # Create cleanup log table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS cleanup_log (
@@ -183,65 +353,324 @@ class StorageManager:
             
         self.logger.debug("Database initialized successfully")
         
+    def _create_db_connection(self) -> sqlite3.Connection:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Open a new SQLite connection configured for pooled use
+        Returns: sqlite3.Connection - WAL-mode connection
+        Note: sqlite3 keeps a per-connection cache of prepared statements keyed
+              by SQL text, so the constant queries below are parsed once
+        """
+        conn = sqlite3.connect(
+            str(self.config.cache_db_path),
+            check_same_thread=False,
+            timeout=30.0,
+            cached_statements=256
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA busy_timeout=30000')
+        return conn
+        
     @contextmanager
     def _get_db_connection(self):
         """
         [FUNCTION SUMMARY]
-        Purpose: Get thread-safe database connection
+        Purpose: Borrow a pooled database connection
         Yields: sqlite3.Connection - Database connection
-        Note: Uses context manager for automatic cleanup
+        Note: Connections are created on demand up to cache_db_pool_size and
+              returned to the pool afterwards; callers never share one
         """
         conn = None
         try:
-            with self._db_lock:
-                conn = sqlite3.connect(
-                    str(self.config.cache_db_path),
-                    check_same_thread=False
-                )
-                conn.row_factory = sqlite3.Row
-                yield conn
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                with self._pool_lock:
+                    can_create = self._pool_created < self.config.cache_db_pool_size
+                    if can_create:
+                        self._pool_created += 1
+                if can_create:
+                    try:
+                        conn = self._create_db_connection()
+                    except sqlite3.Error:
+                        with self._pool_lock:
+                            self._pool_created -= 1
+                        raise
+                else:
+                    conn = self._pool.get()
+                    
+            yield conn
+            
         except sqlite3.Error as e:
+            if conn is not None:
+                conn.rollback()
             raise PolygonStorageError(
                 f"Database error: {str(e)}",
                 operation='connect',
                 path=str(self.config.cache_db_path)
             )
         finally:
-            if conn:
-                conn.close()
+            if conn is not None:
+                if conn.in_transaction:
+                    conn.rollback()
+                self._pool.put(conn)
+                
+    def close(self):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Flush buffered access log rows and close pooled connections
+        Example: storage.close()
+        """
+        if self._closed:
+            return
+            
+        self.stop_compactor()
+        
+        # Stop the flush timer, then write whatever is still buffered
+        self._flush_event.set()
+        if self._flush_thread is not None and self._flush_thread.is_alive():
+            self._flush_thread.join(timeout=5)
+            
+        try:
+            self.flush_access_log()
+        except PolygonStorageError as e:
+            self.logger.warning(f"Failed to flush access log on close: {e}")
+            
+        self._closed = True
+        
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
                 
+        with self._pool_lock:
+            self._pool_created = 0
+            
     def _get_cache_filepath(self, symbol: str, timeframe: str) -> Path:
         """
         [FUNCTION SUMMARY]
-        Purpose: Generate consistent file path for cached data
+        Purpose: Generate file path of the legacy single-file cache
         Parameters:
             - symbol (str): Stock symbol
             - timeframe (str): Data timeframe
-        Returns: Path - Full path to parquet file
+        Returns: Path - Full path to legacy parquet file
         Example: path = _get_cache_filepath('AAPL', '5min')
+        Note: Only used to migrate caches written before partitioning
         """
-        # Create symbol-specific directory
         symbol_path = self.symbol_dir / symbol.upper()
-        symbol_path.mkdir(exist_ok=True)
-        
-        # Generate filename
         filename = f"{symbol.upper()}_{timeframe}.parquet"
         return symbol_path / filename
-        
+
+    def _get_partition_dir(self, symbol: str, timeframe: str) -> Path:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Get directory holding all partitions for symbol/timeframe
+        Parameters:
+            - symbol (str): Stock symbol
+            - timeframe (str): Data timeframe
+        Returns: Path - Partition directory (created if missing)
+        Example: path = _get_partition_dir('AAPL', '5min')
+        """
+        partition_dir = self.symbol_dir / symbol.upper() / timeframe
+        partition_dir.mkdir(parents=True, exist_ok=True)
+        return partition_dir
+
+    def _get_partition_filepath(self, symbol: str, timeframe: str,
+                                partition_key: str) -> Path:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Generate file path for a single partition
+        Parameters:
+            - symbol (str): Stock symbol
+            - timeframe (str): Data timeframe
+            - partition_key (str): Partition key (e.g., '2024-01-15')
+        Returns: Path - Full path to partition parquet file
+        Example: path = _get_partition_filepath('AAPL', '5min', '2024-01-15')
+        """
+        return self._get_partition_dir(symbol, timeframe) / f"{partition_key}.parquet"
+
+    def _partition_keys(self, index: pd.DatetimeIndex, timeframe: str) -> pd.Index:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Compute partition key for every timestamp in an index
+        Parameters:
+            - index (DatetimeIndex): UTC timestamps
+            - timeframe (str): Data timeframe
+        Returns: Index - Partition key per row
+        """
+        multiplier, timespan = parse_timeframe(timeframe)
+        return index.strftime(PARTITION_FORMATS.get(timespan, '%Y'))
+
     def _calculate_checksum(self, df: pd.DataFrame) -> str:
         """
         [FUNCTION SUMMARY]
         Purpose: Calculate checksum for data integrity
         Parameters:
-            - df (DataFrame): Data to checksum
-        Returns: str - MD5 checksum
+            - df (DataFrame): Data to checksum (typically one partition)
+        Returns: str - '<algorithm>:<hexdigest>' checksum
+        Note: Hashes the raw numpy buffers of the index and each column in a
+              single streaming pass (xxh64 if installed, else crc32)
+        """
+        hasher = _new_hasher()
+        
+        # Index timestamps as raw int64 ticks (unit is part of the digest)
+        if isinstance(df.index, pd.DatetimeIndex):
+            hasher.update(str(df.index.dtype).encode())
+            hasher.update(np.ascontiguousarray(df.index.asi8).data)
+        else:
+            hasher.update(pd.util.hash_array(df.index.to_numpy()).data)
+            
+        for column in df.columns:
+            hasher.update(str(column).encode())
+            values = df[column].to_numpy()
+            if values.dtype.kind in 'biufcmM':
+                hasher.update(np.ascontiguousarray(values).data)
+            else:
+                # Object/string columns have no stable raw buffer
+                hasher.update(pd.util.hash_array(values.astype(object)).data)
+                
+        return f"{_HASH_ALGORITHM}:{hasher.hexdigest()}"
+        
+    def _combine_checksums(self, checksums: List[str]) -> str:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Derive a summary checksum from ordered partition checksums
+        Parameters:
+            - checksums (list): Partition checksums ordered by partition key
+        Returns: str - '<algorithm>:<hexdigest>' checksum
+        """
+        hasher = _new_hasher()
+        for checksum in checksums:
+            hasher.update(checksum.encode())
+        return f"{_HASH_ALGORITHM}:{hasher.hexdigest()}"
+        
+    def _verify_partition(self, partition: Dict[str, Any],
+                          df: Optional[pd.DataFrame] = None) -> Optional[bool]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Check a partition file against its stored checksum
+        Parameters:
+            - partition (dict): Partition record from get_partitions
+            - df (DataFrame, optional): Already-loaded partition contents
+        Returns: bool or None - True/False, None if checksum is from another algorithm
+        """
+        stored = partition.get('checksum') or ''
+        algorithm = stored.split(':', 1)[0] if ':' in stored else None
+        
+        # Legacy MD5 or checksums from a different hash library
+        if algorithm != _HASH_ALGORITHM:
+            return None
+            
+        if df is None:
+            df = self._read_parquet_file(Path(partition['file_path']))
+            
+        return self._calculate_checksum(df) == stored
+        
+    def verify_checksums(self, symbol: Optional[str] = None,
+                         timeframe: Optional[str] = None,
+                         start_date: Optional[Union[str, datetime]] = None,
+                         end_date: Optional[Union[str, datetime]] = None,
+                         repair: bool = False) -> Dict[str, Any]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Verify partition checksums, optionally only within a range
+        Parameters:
+            - symbol (str, optional): Limit to symbol
+            - timeframe (str, optional): Limit to timeframe
+            - start_date (datetime, optional): Only partitions ending after this
+            - end_date (datetime, optional): Only partitions starting before this day ends
+            - repair (bool): Drop corrupt/missing partitions so they are refetched
+        Returns: dict - Counts of verified, corrupt, missing and skipped partitions
+        Example: report = storage.verify_checksums('AAPL', '1min', '2024-01-02', '2024-01-02')
+        """
+        query = "SELECT * FROM cache_partitions WHERE 1=1"
+        params: List[Any] = []
+        
+        if symbol:
+            query += " AND symbol = ?"
+            params.append(symbol.upper())
+        if timeframe:
+            query += " AND timeframe = ?"
+            params.append(timeframe)
+        if start_date:
+            query += " AND end_date >= ?"
+            params.append(_to_db_time(start_date))
+        if end_date:
+            query += " AND start_date < ?"
+            params.append(_to_db_time(parse_date(end_date) + timedelta(days=1)))
+            
+        with self._get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query + " ORDER BY symbol, timeframe, partition_key", params)
+            partitions = [dict(row) for row in cursor.fetchall()]
+            
+        report = {'checked': 0, 'verified': 0, 'corrupt': [], 'missing': [], 'skipped': 0}
+        
+        for partition in partitions:
+            name = f"{partition['symbol']}_{partition['timeframe']}_{partition['partition_key']}"
+            report['checked'] += 1
+            
+            if not Path(partition['file_path']).exists():
+                report['missing'].append(name)
+            else:
+                try:
+                    result = self._verify_partition(partition)
+                except PolygonStorageError:
+                    result = False
+                    
+                if result is None:
+                    report['skipped'] += 1
+                    continue
+                if result:
+                    report['verified'] += 1
+                    continue
+                report['corrupt'].append(name)
+                
+            if repair:
+                self._drop_partition(partition)
+                
+        if report['corrupt'] or report['missing']:
+            self.logger.warning(
+                f"Checksum verification found {len(report['corrupt'])} corrupt and "
+                f"{len(report['missing'])} missing partition(s)"
+            )
+            
+        return report
+        
+    def _drop_partition(self, partition: Dict[str, Any]):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Delete a partition file and record and refresh the summary
+        Parameters:
+            - partition (dict): Partition record
         """
-        # Convert DataFrame to bytes for hashing
-        df_bytes = pd.util.hash_pandas_object(df).values.tobytes()
-        return hashlib.md5(df_bytes).hexdigest()
+        file_path = Path(partition['file_path'])
+        if file_path.exists():
+            file_path.unlink()
+            
+        self._remove_partition(partition['symbol'], partition['timeframe'], partition['partition_key'])
+        
+        # Sessions in the dropped partition must be fetched again
+        dropped_days = np.arange(
+            np.datetime64(parse_date(partition['start_date']).date(), 'D'),
+            np.datetime64(parse_date(partition['end_date']).date(), 'D') + 1
+        )
+        self._update_coverage(partition['symbol'], partition['timeframe'], dropped_days, covered=False)
+        
+        metadata = self._build_cache_metadata(partition['symbol'], partition['timeframe'])
+        if metadata:
+            self._update_cache_metadata(metadata)
+        else:
+            self._remove_cache_metadata(partition['symbol'], partition['timeframe'])
+            
+        get_bar_cache().invalidate(partition['symbol'], partition['timeframe'])
         
     def save_data(self, df: pd.DataFrame, symbol: str, timeframe: str,
-                  update_metadata: bool = True) -> CacheMetadata:
+                  update_metadata: bool = True,
+                  overwrite: bool = True) -> CacheMetadata:
         """
         [FUNCTION SUMMARY]
         Purpose: Save OHLCV data to local cache
@@ -250,8 +679,11 @@ class StorageManager:
             - symbol (str): Stock symbol
             - timeframe (str): Data timeframe
             - update_metadata (bool): Update database metadata
+            - overwrite (bool): Replace cached bars with the same timestamp;
+              when False, bars already in the cache are kept
         Returns: CacheMetadata - Metadata about saved cache
         Example: metadata = storage.save_data(df, 'AAPL', '5min')
+        Note: Only partitions that receive new bars are read and rewritten
         """
         if df.empty:
             raise PolygonDataError("Cannot save empty DataFrame")
@@ -260,61 +692,33 @@ class StorageManager:
         symbol = symbol.upper()
         
         try:
-            # Get file path
-            file_path = self._get_cache_filepath(symbol, timeframe)
-            
-            # Ensure DataFrame is sorted by time
+            # Ensure DataFrame is sorted by time without duplicate bars
             df_sorted = df.sort_index()
+            df_sorted = df_sorted[~df_sorted.index.duplicated(keep='last')]
             
-            # Check if cache exists and merge if needed
-            if file_path.exists() and self.config.cache_enabled:
-                existing_df = self._read_parquet_file(file_path)
-                if not existing_df.empty:
-                    # Merge with existing data
-                    df_sorted = self._merge_dataframes(existing_df, df_sorted)
-                    self.logger.debug(f"Merged with existing cache for {symbol} {timeframe}")
-            
-            # Calculate metadata
-            start_date = df_sorted.index.min()
-            end_date = df_sorted.index.max()
-            row_count = len(df_sorted)
-            checksum = self._calculate_checksum(df_sorted)
-            
-            # Save to parquet
-            compression = 'snappy' if self.config.use_compression else None
-            pq.write_table(
-                pa.Table.from_pandas(df_sorted, preserve_index=True),
-                file_path,
-                compression=compression
-            )
-            
-            # Get file size
-            file_size = file_path.stat().st_size
-            
-            # Create metadata object
-            metadata = CacheMetadata(
-                symbol=symbol,
-                timeframe=timeframe,
-                start_date=start_date,
-                end_date=end_date,
-                last_updated=datetime.now(POLYGON_TIMEZONE),
-                row_count=row_count,
-                file_path=str(file_path),
-                file_size=file_size,
-                checksum=checksum,
-                compression=compression or 'none'
-            )
-            
-            # Update database if requested
-            if update_metadata:
-                self._update_cache_metadata(metadata)
+            with self._get_write_lock(symbol, timeframe):
+                # Convert any legacy single-file cache before touching partitions
+                self._ensure_partitioned(symbol, timeframe)
+                
+                # Write every affected partition
+                partitions = self._write_partitions(df_sorted, symbol, timeframe, overwrite=overwrite)
+                
+                # Decoded copies held in memory are now stale
+                get_bar_cache().invalidate(symbol, timeframe)
+                
+                # Refresh summary metadata from the partition table
+                metadata = self._build_cache_metadata(symbol, timeframe)
+                
+                # Update database if requested
+                if update_metadata and metadata:
+                    self._update_cache_metadata(metadata)
                 
             # Log access
-            self._log_cache_access(symbol, timeframe, 'write', row_count)
+            self._log_cache_access(symbol, timeframe, 'write', len(df_sorted))
             
             self.logger.info(
-                f"Saved {row_count} rows for {symbol} {timeframe} "
-                f"({file_size / 1024 / 1024:.2f} MB)"
+                f"Saved {len(df_sorted)} rows for {symbol} {timeframe} "
+                f"into {len(partitions)} partition(s)"
             )
             
             return metadata
@@ -323,128 +727,507 @@ class StorageManager:
             raise PolygonStorageError(
                 f"Failed to save data: {str(e)}",
                 operation='write',
-                path=str(file_path) if 'file_path' in locals() else None
+                path=str(self.symbol_dir / symbol / timeframe)
             )
             
-    def load_data(self, symbol: str, timeframe: str,
-                  start_date: Optional[Union[str, datetime]] = None,
-                  end_date: Optional[Union[str, datetime]] = None) -> Optional[pd.DataFrame]:
+    def save_realtime_bars(self, df: pd.DataFrame, symbol: str,
+                           timeframe: str) -> CacheMetadata:
         """
         [FUNCTION SUMMARY]
-        Purpose: Load cached data for symbol and timeframe
+        Purpose: Save bars built from the WebSocket stream
         Parameters:
+            - df (DataFrame): Closed real-time bars
             - symbol (str): Stock symbol
             - timeframe (str): Data timeframe
-            - start_date (datetime, optional): Filter start date
-            - end_date (datetime, optional): Filter end date
-        Returns: DataFrame or None - Cached data if available
-        Example: df = storage.load_data('AAPL', '5min', start_date, end_date)
+        Returns: CacheMetadata - Metadata about saved cache
+        Example: storage.save_realtime_bars(df, 'AAPL', '1min')
+        Note: Cached API bars win over streamed bars with the same timestamp,
+              and streamed bars never count as coverage: the coverage index
+              is settled before they are written, so their sessions are
+              still fetched from the API
         """
-        if not self.config.cache_enabled:
-            return None
-            
         symbol = symbol.upper()
+        self._ensure_coverage_index(symbol, timeframe)
+        self._seal_coverage_index(symbol, timeframe)
+        return self.save_data(df, symbol, timeframe, overwrite=False)
         
-        try:
-            # Check if cache exists
-            metadata = self.get_cache_metadata(symbol, timeframe)
-            if not metadata:
-                return None
-                
-            # Load parquet file
-            file_path = Path(metadata.file_path)
-            if not file_path.exists():
-                self.logger.warning(f"Cache file missing: {file_path}")
-                self._remove_cache_metadata(symbol, timeframe)
-                return None
-                
-            # Read data
-            df = self._read_parquet_file(file_path)
-            
-            if df.empty:
-                return None
-                
-            # Apply date filters if provided
-            if start_date or end_date:
-                df = self._filter_by_date_range(df, start_date, end_date)
-                
-            # Log access
-            self._log_cache_access(symbol, timeframe, 'read', len(df))
-            
-            self.logger.debug(
-                f"Loaded {len(df)} rows from cache for {symbol} {timeframe}"
-            )
-            
-            return df
-            
-        except Exception as e:
-            self.logger.error(f"Failed to load cache: {str(e)}")
-            return None
+    def _get_write_lock(self, symbol: str, timeframe: str) -> threading.Lock:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Get the lock serializing writes to one symbol/timeframe
+        Parameters:
+            - symbol (str): Stock symbol (uppercase)
+            - timeframe (str): Data timeframe
+        Returns: threading.Lock - Write lock
+        """
+        key = (symbol, timeframe)
+        with self._write_locks_guard:
+            lock = self._write_locks.get(key)
+            if lock is None:
+                lock = self._write_locks[key] = threading.Lock()
+            return lock
             
-    def _read_parquet_file(self, file_path: Path) -> pd.DataFrame:
+    def _write_partitions(self, df: pd.DataFrame, symbol: str,
+                          timeframe: str, overwrite: bool = True) -> List[Dict[str, Any]]:
         """
         [FUNCTION SUMMARY]
-        Purpose: Read parquet file with error handling
+        Purpose: Merge new bars into their partitions and write them to disk
         Parameters:
-            - file_path (Path): Path to parquet file
-        Returns: DataFrame - Loaded data
+            - df (DataFrame): Sorted, de-duplicated OHLCV data
+            - symbol (str): Stock symbol (uppercase)
+            - timeframe (str): Data timeframe
+            - overwrite (bool): New bars replace cached bars with the same timestamp
+        Returns: list - Partition records that were written
+        Note: Bars for a month that compact_partitions() already merged go
+              into its month partition instead of a new day partition
         """
-        try:
-            df = pd.read_parquet(file_path)
+        compression = 'snappy' if self.config.use_compression else None
+        keys = self._partition_keys(df.index, timeframe)
+        
+        compacted = self._compacted_months(symbol, timeframe)
+        if compacted:
+            months = keys.str[:7]
+            keys = pd.Index(np.where(months.isin(compacted), months, keys))
             
-            # Ensure datetime index
-            if not isinstance(df.index, pd.DatetimeIndex):
-                if 'datetime' in df.columns:
-                    df = df.set_index('datetime')
-                elif 'timestamp' in df.columns:
-                    df['datetime'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
-                    df = df.set_index('datetime')
-                    
-            # Ensure UTC timezone
-            if df.index.tz is None:
-                df.index = df.index.tz_localize(POLYGON_TIMEZONE)
-            elif df.index.tz != POLYGON_TIMEZONE:
-                df.index = df.index.tz_convert(POLYGON_TIMEZONE)
-                
-            return df
+        written = []
+        
+        for partition_key, part_df in df.groupby(keys, sort=False):
+            file_path = self._get_partition_filepath(symbol, timeframe, partition_key)
             
-        except Exception as e:
-            raise PolygonStorageError(
-                f"Failed to read parquet file: {str(e)}",
-                operation='read',
-                path=str(file_path)
+            # Merge with bars already in this partition
+            if file_path.exists() and self.config.cache_enabled:
+                existing_df = self._read_parquet_file(file_path)
+                if not existing_df.empty:
+                    part_df = self._merge_dataframes(existing_df, part_df, overwrite=overwrite)
+                    
+            pq.write_table(
+                pa.Table.from_pandas(part_df, preserve_index=True),
+                file_path,
+                compression=compression,
+                row_group_size=(
+                    self.config.compaction_row_group_size if partition_key in compacted
+                    else self.config.parquet_row_group_size
+                )
             )
             
-    def _merge_dataframes(self, existing_df: pd.DataFrame, 
-                         new_df: pd.DataFrame) -> pd.DataFrame:
+            record = self._partition_record(part_df, symbol, timeframe, partition_key, file_path)
+            self._update_partition(record)
+            written.append(record)
+            
+        return written
+        
+    def _partition_record(self, part_df: pd.DataFrame, symbol: str, timeframe: str,
+                          partition_key: str, file_path: Path) -> Dict[str, Any]:
         """
         [FUNCTION SUMMARY]
-        Purpose: Merge existing and new data, handling overlaps
+        Purpose: Build the partition record for a file just written
         Parameters:
-            - existing_df (DataFrame): Existing cached data
-            - new_df (DataFrame): New data to merge
-        Returns: DataFrame - Merged data
+            - part_df (DataFrame): Sorted contents of the partition
+            - symbol (str): Stock symbol (uppercase)
+            - timeframe (str): Data timeframe
+            - partition_key (str): Partition key
+            - file_path (Path): Partition file
+        Returns: dict - Record for _update_partition
         """
-        # Combine and remove duplicates (keep latest)
-        combined = pd.concat([existing_df, new_df])
-        
-        # Remove duplicates, keeping the last (most recent) entry
-        combined = combined[~combined.index.duplicated(keep='last')]
-        
-        # Sort by index
-        combined = combined.sort_index()
-        
-        return combined
+        return {
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'partition_key': partition_key,
+            'start_date': _to_db_time(part_df.index[0]),
+            'end_date': _to_db_time(part_df.index[-1]),
+            'row_count': len(part_df),
+            'file_path': str(file_path),
+            'file_size': file_path.stat().st_size,
+            'checksum': self._calculate_checksum(part_df),
+            'last_updated': datetime.now(POLYGON_TIMEZONE).isoformat()
+        }
         
-    def _filter_by_date_range(self, df: pd.DataFrame,
-                             start_date: Optional[Union[str, datetime]],
-                             end_date: Optional[Union[str, datetime]]) -> pd.DataFrame:
+    def _compacted_months(self, symbol: str, timeframe: str) -> set:
         """
         [FUNCTION SUMMARY]
-        Purpose: Filter DataFrame by date range
+        Purpose: List month partitions of a day-partitioned timeframe
         Parameters:
-            - df (DataFrame): Data to filter
-            - start_date: Start date (inclusive)
+            - symbol (str): Stock symbol (uppercase)
+            - timeframe (str): Data timeframe
+        Returns: set - 'YYYY-MM' keys written by compact_partitions()
+        """
+        multiplier, timespan = parse_timeframe(timeframe)
+        if PARTITION_FORMATS.get(timespan) != '%Y-%m-%d':
+            return set()
+            
+        with self._get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT partition_key FROM cache_partitions
+                WHERE symbol = ? AND timeframe = ? AND length(partition_key) = 7
+            ''', (symbol, timeframe))
+            return {row['partition_key'] for row in cursor.fetchall()}
+            
+    def _update_partition(self, record: Dict[str, Any]):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Insert or replace a partition record
+        Parameters:
+            - record (dict): Partition fields as built by _write_partitions
+        """
+        with self._get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_SQL_REPLACE_PARTITION, (
+                record['symbol'],
+                record['timeframe'],
+                record['partition_key'],
+                record['start_date'],
+                record['end_date'],
+                record['row_count'],
+                record['file_path'],
+                record['file_size'],
+                record['checksum'],
+                record['last_updated']
+            ))
+            conn.commit()
+            
+    def get_partitions(self, symbol: str, timeframe: str,
+                       start_date: Optional[Union[str, datetime]] = None,
+                       end_date: Optional[Union[str, datetime]] = None) -> List[Dict[str, Any]]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: List partitions overlapping a time range
+        Parameters:
+            - symbol (str): Stock symbol
+            - timeframe (str): Data timeframe
+            - start_date (datetime, optional): Range start (inclusive)
+            - end_date (datetime, optional): Range end (exclusive)
+        Returns: list - Partition records ordered by start time
+        Example: parts = storage.get_partitions('AAPL', '5min', start, end)
+        """
+        query = "SELECT * FROM cache_partitions WHERE symbol = ? AND timeframe = ?"
+        params: List[Any] = [symbol.upper(), timeframe]
+        
+        if start_date is not None:
+            query += " AND end_date >= ?"
+            params.append(_to_db_time(start_date))
+            
+        if end_date is not None:
+            query += " AND start_date < ?"
+            params.append(_to_db_time(end_date))
+            
+        query += " ORDER BY start_date"
+        
+        with self._get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
+            
+    def _remove_partition(self, symbol: str, timeframe: str, partition_key: str):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Remove a partition record from the database
+        Parameters:
+            - symbol (str): Stock symbol
+            - timeframe (str): Data timeframe
+            - partition_key (str): Partition key
+        """
+        with self._get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                DELETE FROM cache_partitions
+                WHERE symbol = ? AND timeframe = ? AND partition_key = ?
+            ''', (symbol.upper(), timeframe, partition_key))
+            conn.commit()
+            
+    def _build_cache_metadata(self, symbol: str, timeframe: str) -> Optional[CacheMetadata]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Aggregate partition records into symbol/timeframe metadata
+        Parameters:
+            - symbol (str): Stock symbol
+            - timeframe (str): Data timeframe
+        Returns: CacheMetadata or None - Summary if any partition exists
+        """
+        with self._get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT MIN(start_date) AS start_date, MAX(end_date) AS end_date,
+                       SUM(row_count) AS row_count, SUM(file_size) AS file_size,
+                       COUNT(*) AS partition_count
+                FROM cache_partitions
+                WHERE symbol = ? AND timeframe = ?
+            ''', (symbol.upper(), timeframe))
+            summary = cursor.fetchone()
+            
+            cursor.execute('''
+                SELECT checksum FROM cache_partitions
+                WHERE symbol = ? AND timeframe = ?
+                ORDER BY partition_key
+            ''', (symbol.upper(), timeframe))
+            checksums = [row['checksum'] or '' for row in cursor.fetchall()]
+            
+        if not summary or not summary['partition_count']:
+            return None
+            
+        return CacheMetadata(
+            symbol=symbol.upper(),
+            timeframe=timeframe,
+            start_date=parse_date(summary['start_date']),
+            end_date=parse_date(summary['end_date']),
+            last_updated=datetime.now(POLYGON_TIMEZONE),
+            row_count=summary['row_count'],
+            file_path=str(self._get_partition_dir(symbol, timeframe)),
+            file_size=summary['file_size'],
+            checksum=self._combine_checksums(checksums),
+            compression='snappy' if self.config.use_compression else 'none',
+            version=CACHE_LAYOUT_VERSION,
+            partition_count=summary['partition_count']
+        )
+        
+    def _ensure_partitioned(self, symbol: str, timeframe: str) -> Optional[CacheMetadata]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Migrate a legacy single-file cache into partitions
+        Parameters:
+            - symbol (str): Stock symbol
+            - timeframe (str): Data timeframe
+        Returns: CacheMetadata or None - Current (partitioned) metadata
+        Note: Only a metadata lookup once the cache uses the partitioned layout.
+              Caller must hold the symbol/timeframe write lock while migrating.
+        """
+        metadata = self.get_cache_metadata(symbol, timeframe)
+        if not metadata or metadata.version == CACHE_LAYOUT_VERSION:
+            return metadata
+            
+        legacy_path = Path(metadata.file_path)
+        if not legacy_path.is_file():
+            self._remove_cache_metadata(symbol, timeframe)
+            return None
+            
+        self.logger.info(f"Migrating legacy cache for {symbol} {timeframe} to partitions")
+        legacy_df = self._read_parquet_file(legacy_path)
+        
+        if not legacy_df.empty:
+            legacy_df = legacy_df.sort_index()
+            legacy_df = legacy_df[~legacy_df.index.duplicated(keep='last')]
+            self._write_partitions(legacy_df, symbol.upper(), timeframe)
+            
+        new_metadata = self._build_cache_metadata(symbol, timeframe)
+        if new_metadata:
+            self._update_cache_metadata(new_metadata)
+        else:
+            self._remove_cache_metadata(symbol, timeframe)
+            
+        legacy_path.unlink()
+        
+        return new_metadata
+        
+    def load_data(self, symbol: str, timeframe: str,
+                  start_date: Optional[Union[str, datetime]] = None,
+                  end_date: Optional[Union[str, datetime]] = None,
+                  columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Load cached data for symbol and timeframe
+        Parameters:
+            - symbol (str): Stock symbol
+            - timeframe (str): Data timeframe
+            - start_date (datetime, optional): Filter start date
+            - end_date (datetime, optional): Filter end date (inclusive day)
+            - columns (list, optional): Columns to load, defaults to all
+        Returns: DataFrame or None - Cached data if available
+        Example: df = storage.load_data('AAPL', '5min', start_date, end_date)
+        Note: Only overlapping partitions are opened; the time predicate is
+              pushed into pyarrow so non-matching row groups are skipped
+        """
+        if not self.config.cache_enabled:
+            return None
+            
+        symbol = symbol.upper()
+        
+        try:
+            # Check if cache exists
+            metadata = self.get_cache_metadata(symbol, timeframe)
+            if metadata and metadata.version != CACHE_LAYOUT_VERSION:
+                # Migrate under the write lock; another thread may have done it already
+                with self._get_write_lock(symbol, timeframe):
+                    metadata = self._ensure_partitioned(symbol, timeframe)
+            if not metadata:
+                return None
+                
+            # End date is inclusive of the whole day (see _filter_by_date_range)
+            range_start = parse_date(start_date) if start_date else None
+            range_end = parse_date(end_date) + timedelta(days=1) if end_date else None
+            
+            # Read only partitions that overlap the range
+            frames = []
+            for partition in self.get_partitions(symbol, timeframe, range_start, range_end):
+                file_path = Path(partition['file_path'])
+                if not file_path.exists():
+                    self.logger.warning(f"Cache partition missing: {file_path}")
+                    self._drop_partition(partition)
+                    continue
+                    
+                if self.config.verify_cache_checksums:
+                    # Verify mode reads the whole partition, then slices it
+                    part_df = self._read_parquet_file(file_path)
+                    if self._verify_partition(partition, part_df) is False:
+                        self.logger.warning(f"Checksum mismatch, dropping partition: {file_path}")
+                        self._drop_partition(partition)
+                        continue
+                    part_df = self._filter_by_date_range(part_df, start_date, end_date)
+                    if columns is not None:
+                        part_df = part_df[[col for col in columns if col in part_df.columns]]
+                    frames.append(part_df)
+                    continue
+                    
+                frames.append(self._read_parquet_file(
+                    file_path, range_start, range_end, columns
+                ))
+                
+            frames = [frame for frame in frames if not frame.empty]
+            if not frames:
+                return None
+                
+            df = pd.concat(frames) if len(frames) > 1 else frames[0]
+            if not df.index.is_monotonic_increasing:
+                df = df.sort_index()
+                
+            # Log access
+            self._log_cache_access(symbol, timeframe, 'read', len(df))
+            
+            self.logger.debug(
+                f"Loaded {len(df)} rows from {len(frames)} partition(s) "
+                f"for {symbol} {timeframe}"
+            )
+            
+            return df
+            
+        except Exception as e:
+            self.logger.error(f"Failed to load cache: {str(e)}")
+            return None
+            
+    def _read_parquet_file(self, file_path: Path,
+                          start: Optional[datetime] = None,
+                          end: Optional[datetime] = None,
+                          columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Read parquet file with error handling
+        Parameters:
+            - file_path (Path): Path to parquet file
+            - start (datetime, optional): Keep rows at or after this time
+            - end (datetime, optional): Keep rows strictly before this time
+            - columns (list, optional): Data columns to project
+        Returns: DataFrame - Loaded data
+        Note: Range and column filters are applied by pyarrow, which skips
+              row groups whose min/max statistics fall outside the range
+        """
+        try:
+            if start is None and end is None and columns is None:
+                df = pd.read_parquet(file_path)
+            else:
+                df = self._read_parquet_range(file_path, start, end, columns)
+                
+            # Ensure datetime index
+            if not isinstance(df.index, pd.DatetimeIndex):
+                if 'datetime' in df.columns:
+                    df = df.set_index('datetime')
+                elif 'timestamp' in df.columns:
+                    df['datetime'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
+                    df = df.set_index('datetime')
+                    
+            # Ensure UTC timezone
+            if df.index.tz is None:
+                df.index = df.index.tz_localize(POLYGON_TIMEZONE)
+            elif df.index.tz != POLYGON_TIMEZONE:
+                df.index = df.index.tz_convert(POLYGON_TIMEZONE)
+                
+            # Bound check for files whose time column could not be pushed down
+            if start is not None and len(df) and df.index[0] < start:
+                df = df[df.index >= start]
+            if end is not None and len(df) and df.index[-1] >= end:
+                df = df[df.index < end]
+                
+            return df
+            
+        except Exception as e:
+            raise PolygonStorageError(
+                f"Failed to read parquet file: {str(e)}",
+                operation='read',
+                path=str(file_path)
+            )
+            
+    def _read_parquet_range(self, file_path: Path,
+                            start: Optional[datetime],
+                            end: Optional[datetime],
+                            columns: Optional[List[str]]) -> pd.DataFrame:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Read a time slice of a parquet file with predicate pushdown
+        Parameters:
+            - file_path (Path): Path to parquet file
+            - start (datetime, optional): Inclusive lower bound
+            - end (datetime, optional): Exclusive upper bound
+            - columns (list, optional): Data columns to project
+        Returns: DataFrame - Matching rows (index not yet normalized)
+        """
+        schema = pq.read_schema(file_path)
+        time_column = 'datetime' if 'datetime' in schema.names else None
+        
+        filters = []
+        if time_column:
+            if start is not None:
+                filters.append((time_column, '>=', pd.Timestamp(start)))
+            if end is not None:
+                filters.append((time_column, '<', pd.Timestamp(end)))
+                
+        read_columns = None
+        if columns is not None:
+            read_columns = [col for col in columns if col in schema.names]
+            if time_column and time_column not in read_columns:
+                read_columns.append(time_column)
+                
+        table = pq.read_table(
+            file_path,
+            columns=read_columns,
+            filters=filters or None
+        )
+        df = table.to_pandas()
+        
+        if time_column and time_column in df.columns:
+            df = df.set_index(time_column)
+            
+        return df
+        
+    def _merge_dataframes(self, existing_df: pd.DataFrame, 
+                         new_df: pd.DataFrame,
+                         overwrite: bool = True) -> pd.DataFrame:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Merge existing and new data, handling overlaps
+        Parameters:
+            - existing_df (DataFrame): Existing cached data
+            - new_df (DataFrame): New data to merge
+            - overwrite (bool): Keep the new bar on overlap (else the existing one)
+        Returns: DataFrame - Merged data
+        """
+        # Combine and remove duplicates (keep latest)
+        combined = pd.concat([existing_df, new_df])
+        
+        # Remove duplicates, keeping the new entry unless told otherwise
+        combined = combined[~combined.index.duplicated(keep='last' if overwrite else 'first')]
+        
+        # Sort by index
+        combined = combined.sort_index()
+        
+        return combined
+        
+    def _filter_by_date_range(self, df: pd.DataFrame,
+                             start_date: Optional[Union[str, datetime]],
+                             end_date: Optional[Union[str, datetime]]) -> pd.DataFrame:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Filter DataFrame by date range
+        Parameters:
+            - df (DataFrame): Data to filter
+            - start_date: Start date (inclusive)
             - end_date: End date (inclusive)
         Returns: DataFrame - Filtered data
         """
@@ -474,10 +1257,7 @@ class StorageManager:
         
         with self._get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT * FROM cache_metadata 
-                WHERE symbol = ? AND timeframe = ?
-            ''', (symbol, timeframe))
+            cursor.execute(_SQL_SELECT_METADATA, (symbol, timeframe))
             
             row = cursor.fetchone()
             
@@ -509,12 +1289,7 @@ class StorageManager:
             cursor = conn.cursor()
             
             # Use REPLACE to update or insert
-            cursor.execute('''
-                REPLACE INTO cache_metadata (
-                    symbol, timeframe, start_date, end_date, last_updated,
-                    row_count, file_path, file_size, checksum, compression, version
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            cursor.execute(_SQL_REPLACE_METADATA, (
                 metadata.symbol,
                 metadata.timeframe,
                 metadata.start_date.isoformat() if isinstance(metadata.start_date, datetime) else metadata.start_date,
@@ -556,22 +1331,68 @@ class StorageManager:
             - timeframe (str): Data timeframe
             - access_type (str): 'read' or 'write'
             - rows_accessed (int): Number of rows
+        Note: Rows are buffered in memory and written in batches by a
+              background timer, when the buffer fills, or on close()
         """
-        with self._get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO cache_access_log 
-                (symbol, timeframe, access_time, access_type, rows_accessed)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                symbol.upper(),
-                timeframe,
-                datetime.now(POLYGON_TIMEZONE).isoformat(),
-                access_type,
-                rows_accessed
-            ))
-            conn.commit()
+        row = (
+            symbol.upper(),
+            timeframe,
+            datetime.now(POLYGON_TIMEZONE).isoformat(),
+            access_type,
+            rows_accessed
+        )
+        
+        with self._access_lock:
+            self._access_buffer.append(row)
+            buffer_full = len(self._access_buffer) >= self.config.access_log_batch_size
+            
+            if self._flush_thread is None and not self._closed:
+                self._flush_thread = threading.Thread(
+                    target=self._access_log_flush_loop,
+                    name='polygon-access-log',
+                    daemon=True
+                )
+                self._flush_thread.start()
+                
+        if buffer_full or self._closed:
+            self.flush_access_log()
+            
+    def flush_access_log(self) -> int:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Write buffered access log rows in one transaction
+        Returns: int - Number of rows written
+        Example: storage.flush_access_log()
+        """
+        with self._access_lock:
+            rows, self._access_buffer = self._access_buffer, []
             
+        if not rows:
+            return 0
+            
+        try:
+            with self._get_db_connection() as conn:
+                conn.executemany(_SQL_INSERT_ACCESS_LOG, rows)
+                conn.commit()
+        except PolygonStorageError:
+            # Put rows back so the next flush retries them
+            with self._access_lock:
+                self._access_buffer[:0] = rows
+            raise
+            
+        return len(rows)
+        
+    def _access_log_flush_loop(self):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Background loop flushing the access log on a timer
+        """
+        while not self._flush_event.wait(self.config.access_log_flush_seconds):
+            try:
+                self.flush_access_log()
+            except Exception as e:
+                self.logger.warning(f"Access log flush failed: {e}")
+                
     def has_cache(self, symbol: str, timeframe: str,
                   start_date: Optional[Union[str, datetime]] = None,
                   end_date: Optional[Union[str, datetime]] = None) -> bool:
@@ -625,9 +1446,15 @@ class StorageManager:
             - end_date: Requested end date
         Returns: list - List of (start, end) tuples for missing data
         Example: missing = storage.get_missing_ranges('AAPL', '5min', start, end)
+        Note: Uses the per-day coverage index and the market calendar, so
+              holes inside the cached span are found and weekends/holidays
+              never trigger API calls. Runs of missing sessions separated by
+              at most missing_range_merge_days covered sessions are merged
+              into one range to minimize requests.
         """
         start_dt = parse_date(start_date)
         end_dt = parse_date(end_date)
+        symbol = symbol.upper()
         
         # Get existing cache metadata
         metadata = self.get_cache_metadata(symbol, timeframe)
@@ -636,18 +1463,262 @@ class StorageManager:
         if not metadata or not Path(metadata.file_path).exists():
             return [(start_dt, end_dt)]
             
-        missing_ranges = []
+        self._ensure_coverage_index(symbol, timeframe)
         
-        # Check for missing data before cache start
-        if start_dt < metadata.start_date:
-            missing_ranges.append((start_dt, metadata.start_date - timedelta(seconds=1)))
+        sessions = trading_days(start_dt, end_dt)
+        if not len(sessions):
+            return []
             
-        # Check for missing data after cache end
-        if end_dt > metadata.end_date:
-            missing_ranges.append((metadata.end_date + timedelta(seconds=1), end_dt))
+        covered = self._covered_mask(symbol, timeframe, sessions)
+        missing_idx = np.flatnonzero(~covered)
+        if not len(missing_idx):
+            return []
+            
+        # Group missing sessions into runs, bridging short covered stretches
+        max_step = 1 + max(0, self.config.missing_range_merge_days)
+        breaks = np.flatnonzero(np.diff(missing_idx) > max_step)
+        run_starts = missing_idx[np.r_[0, breaks + 1]]
+        run_ends = missing_idx[np.r_[breaks, len(missing_idx) - 1]]
+        
+        missing_ranges = []
+        for first, last in zip(sessions[run_starts], sessions[run_ends]):
+            range_start = datetime.combine(first.astype(object), dt_time.min, tzinfo=POLYGON_TIMEZONE)
+            range_end = datetime.combine(last.astype(object), dt_time(23, 59, 59), tzinfo=POLYGON_TIMEZONE)
+            missing_ranges.append((max(range_start, start_dt), min(range_end, end_dt)))
             
         return missing_ranges
         
+    def mark_coverage(self, symbol: str, timeframe: str,
+                      start_date: Union[str, datetime],
+                      end_date: Union[str, datetime]) -> int:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Record that every session in a range was fetched from the API
+        Parameters:
+            - symbol (str): Stock symbol
+            - timeframe (str): Data timeframe
+            - start_date: First fetched day
+            - end_date: Last fetched day
+        Returns: int - Number of sessions marked
+        Example: storage.mark_coverage('AAPL', '5min', '2024-01-02', '2024-01-31')
+        Note: Sessions that may still receive bars (today, or yesterday before
+              its post-market bars have landed in UTC) are never marked
+        """
+        sessions = trading_days(start_date, end_date)
+        sessions = sessions[sessions <= np.datetime64(self.last_complete_day(), 'D')]
+        
+        if len(sessions):
+            self._update_coverage(symbol.upper(), timeframe, sessions, covered=True)
+            
+        return len(sessions)
+        
+    def last_complete_day(self) -> date:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Latest day whose bars can no longer change
+        Returns: date - Newest day mark_coverage() will record
+        Note: A UTC day is complete once post-market (20:00 ET, at most 01:00
+              UTC the next day) has passed for it
+        """
+        return (datetime.now(POLYGON_TIMEZONE) - timedelta(hours=26)).date()
+        
+    def get_coverage(self, symbol: str, timeframe: str,
+                     start_date: Union[str, datetime],
+                     end_date: Union[str, datetime]) -> Dict[str, Any]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Report which sessions in a range are cached
+        Parameters:
+            - symbol (str): Stock symbol
+            - timeframe (str): Data timeframe
+            - start_date: Range start
+            - end_date: Range end
+        Returns: dict - Session counts, coverage percentage and missing days
+        Example: report = storage.get_coverage('AAPL', '1min', '2024-01-01', '2024-06-30')
+        """
+        symbol = symbol.upper()
+        self._ensure_coverage_index(symbol, timeframe)
+        
+        sessions = trading_days(start_date, end_date)
+        covered = self._covered_mask(symbol, timeframe, sessions)
+        
+        return {
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'sessions': len(sessions),
+            'covered_sessions': int(covered.sum()),
+            'coverage_pct': float(covered.mean() * 100) if len(sessions) else 100.0,
+            'missing_days': [str(day) for day in sessions[~covered]]
+        }
+        
+    def _covered_mask(self, symbol: str, timeframe: str,
+                      days: np.ndarray) -> np.ndarray:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Look up coverage bits for an array of days
+        Parameters:
+            - symbol (str): Stock symbol (uppercase)
+            - timeframe (str): Data timeframe
+            - days (ndarray): datetime64[D] days
+        Returns: ndarray - Boolean mask, True where the day is covered
+        """
+        mask = np.zeros(len(days), dtype=bool)
+        if not len(days):
+            return mask
+            
+        years = days.astype('datetime64[Y]').astype(int) + 1970
+        bitmaps = self._read_coverage(symbol, timeframe, np.unique(years).tolist())
+        
+        for year, bits in bitmaps.items():
+            in_year = years == year
+            day_of_year = (days[in_year] - np.datetime64(f'{year}-01-01', 'D')).astype(int)
+            mask[in_year] = bits[day_of_year]
+            
+        return mask
+        
+    def _read_coverage(self, symbol: str, timeframe: str,
+                       years: List[int]) -> Dict[int, np.ndarray]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Load coverage bitmaps for the given years
+        Returns: dict - {year: bool array indexed by day-of-year}
+        """
+        if not years:
+            return {}
+            
+        placeholders = ','.join('?' * len(years))
+        with self._get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT year, bitmap FROM cache_coverage "
+                f"WHERE symbol = ? AND timeframe = ? AND year IN ({placeholders})",
+                [symbol, timeframe] + list(years)
+            )
+            return {
+                row['year']: np.unpackbits(
+                    np.frombuffer(row['bitmap'], dtype=np.uint8), count=366
+                ).astype(bool)
+                for row in cursor.fetchall()
+            }
+            
+    def _update_coverage(self, symbol: str, timeframe: str,
+                         days: np.ndarray, covered: bool):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Set or clear coverage bits for days in one transaction
+        Parameters:
+            - symbol (str): Stock symbol (uppercase)
+            - timeframe (str): Data timeframe
+            - days (ndarray): datetime64[D] days
+            - covered (bool): True to set bits, False to clear them
+        """
+        years = days.astype('datetime64[Y]').astype(int) + 1970
+        
+        with self._get_db_connection() as conn:
+            # IMMEDIATE takes the write lock up front so read-modify-write is atomic
+            conn.execute('BEGIN IMMEDIATE')
+            for year in np.unique(years).tolist():
+                row = conn.execute(
+                    "SELECT bitmap FROM cache_coverage WHERE symbol = ? AND timeframe = ? AND year = ?",
+                    (symbol, timeframe, year)
+                ).fetchone()
+                
+                if row is not None:
+                    bits = np.unpackbits(np.frombuffer(row['bitmap'], dtype=np.uint8), count=366).astype(bool)
+                elif covered:
+                    bits = np.zeros(366, dtype=bool)
+                else:
+                    continue
+                    
+                day_of_year = (days[years == year] - np.datetime64(f'{year}-01-01', 'D')).astype(int)
+                bits[day_of_year] = covered
+                
+                conn.execute(
+                    "REPLACE INTO cache_coverage (symbol, timeframe, year, bitmap) VALUES (?, ?, ?, ?)",
+                    (symbol, timeframe, year, np.packbits(bits).tobytes())
+                )
+            conn.commit()
+            
+    def _ensure_coverage_index(self, symbol: str, timeframe: str):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Build the coverage index for caches created before it existed
+        Parameters:
+            - symbol (str): Stock symbol (uppercase)
+            - timeframe (str): Data timeframe
+        Note: Marks complete sessions that have bars; sessions without bars are
+              treated as holes and fetched (then marked) once. The newest cached
+              session is only marked when its bars run past the regular close,
+              since a legacy cache may have stopped partway through that day.
+        """
+        with self._get_db_connection() as conn:
+            exists = conn.execute(
+                "SELECT 1 FROM cache_coverage WHERE symbol = ? AND timeframe = ? LIMIT 1",
+                (symbol, timeframe)
+            ).fetchone()
+            
+        if exists:
+            return
+            
+        partitions = self.get_partitions(symbol, timeframe)
+        if not partitions:
+            return
+            
+        if all(len(row['partition_key']) == 10 for row in partitions):
+            # Day partitions: keys are the days with bars
+            days = np.array([row['partition_key'] for row in partitions], dtype='datetime64[D]')
+            newest = max(partitions, key=lambda row: row['partition_key'])
+            newest_path = Path(newest['file_path'])
+            if not newest_path.exists():
+                return
+            last_bar = self._read_parquet_file(newest_path, columns=[]).index.values.max()
+        else:
+            frames = [
+                self._read_parquet_file(Path(row['file_path']), columns=[])
+                for row in partitions if Path(row['file_path']).exists()
+            ]
+            index = pd.DatetimeIndex(np.concatenate([frame.index.values for frame in frames])) if frames else None
+            if index is None or not len(index):
+                return
+            days = np.unique(index.values.astype('datetime64[D]'))
+            last_bar = index.values.max()
+            
+        # Sessions that may still receive bars are never covered
+        days = days[days <= np.datetime64(self.last_complete_day(), 'D')]
+        
+        # Keep the newest session open unless it reaches the close
+        if len(days):
+            newest_day = days.max()
+            _, _, closes = session_bounds(newest_day.astype(object), newest_day.astype(object), extended=False)
+            if len(closes) and np.datetime64(last_bar, 'ns') < closes[0]:
+                days = days[days != newest_day]
+                
+        if not len(days):
+            return
+            
+        self.logger.info(f"Building coverage index for {symbol} {timeframe} from {len(days)} cached days")
+        self._update_coverage(symbol, timeframe, days, covered=True)
+        
+    def _seal_coverage_index(self, symbol: str, timeframe: str):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Record that the coverage index exists, even with nothing covered
+        Parameters:
+            - symbol (str): Stock symbol (uppercase)
+            - timeframe (str): Data timeframe
+        Note: Stops _ensure_coverage_index() from later treating partitions
+              that were not fetched from the API as covered
+        """
+        with self._get_db_connection() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO cache_coverage (symbol, timeframe, year, bitmap) "
+                "SELECT ?, ?, ?, ? WHERE NOT EXISTS "
+                "(SELECT 1 FROM cache_coverage WHERE symbol = ? AND timeframe = ?)",
+                (symbol, timeframe, datetime.now(POLYGON_TIMEZONE).year,
+                 np.packbits(np.zeros(366, dtype=bool)).tobytes(), symbol, timeframe)
+            )
+            conn.commit()
+            
     def clear_cache(self, symbol: Optional[str] = None,
                    timeframe: Optional[str] = None,
                    older_than_days: Optional[int] = None) -> Dict[str, Any]:
@@ -692,44 +1763,185 @@ class StorageManager:
             
             # Remove files and metadata
             for row in rows:
-                file_path = Path(row['file_path'])
-                if file_path.exists():
-                    file_size = file_path.stat().st_size
-                    file_path.unlink()
-                    stats['files_removed'] += 1
-                    stats['space_freed_mb'] += file_size / 1024 / 1024
-                    
-                # Remove metadata
-                cursor.execute(
-                    "DELETE FROM cache_metadata WHERE id = ?",
-                    (row['id'],)
-                )
-                stats['entries_removed'] += 1
+                self._remove_cache_entry(cursor, row, stats)
                 
             conn.commit()
             
+        # Drop decoded copies of anything that may have been removed
+        get_bar_cache().invalidate(symbol, timeframe)
+        
         # Log cleanup
+        self._log_cleanup(
+            stats,
+            f"Manual cleanup: symbol={symbol}, timeframe={timeframe}, older_than={older_than_days}"
+        )
+        
+        self.logger.info(
+            f"Cache cleanup completed: removed {stats['files_removed']} files, "
+            f"freed {stats['space_freed_mb']:.2f} MB"
+        )
+        
+        return stats
+        
+    def _remove_cache_entry(self, cursor: sqlite3.Cursor, row: sqlite3.Row,
+                            stats: Dict[str, Any]):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Delete one symbol/timeframe's files and database rows
+        Parameters:
+            - cursor (Cursor): Cursor of the caller's open transaction
+            - row (Row): cache_metadata row
+            - stats (dict): Counters updated in place (files_removed,
+              space_freed_mb, entries_removed)
+        """
+        file_path = Path(row['file_path'])
+        if file_path.is_dir():
+            # Partitioned layout - remove every partition file
+            for partition_file in file_path.glob('*.parquet'):
+                stats['files_removed'] += 1
+                stats['space_freed_mb'] += partition_file.stat().st_size / 1024 / 1024
+            shutil.rmtree(file_path)
+        elif file_path.exists():
+            file_size = file_path.stat().st_size
+            file_path.unlink()
+            stats['files_removed'] += 1
+            stats['space_freed_mb'] += file_size / 1024 / 1024
+            
+        # Remove metadata
+        cursor.execute(
+            "DELETE FROM cache_metadata WHERE id = ?",
+            (row['id'],)
+        )
+        cursor.execute(
+            "DELETE FROM cache_partitions WHERE symbol = ? AND timeframe = ?",
+            (row['symbol'], row['timeframe'])
+        )
+        cursor.execute(
+            "DELETE FROM cache_coverage WHERE symbol = ? AND timeframe = ?",
+            (row['symbol'], row['timeframe'])
+        )
+        stats['entries_removed'] += 1
+        
+    def _log_cleanup(self, stats: Dict[str, Any], reason: str):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Record a cleanup run in cleanup_log
+        Parameters:
+            - stats (dict): Cleanup statistics with files_removed and space_freed_mb
+            - reason (str): Why files were removed
+        """
         with self._get_db_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
-                INSERT INTO cleanup_log 
+                INSERT INTO cleanup_log
                 (cleanup_time, files_removed, space_freed_mb, reason)
                 VALUES (?, ?, ?, ?)
             ''', (
                 datetime.now(POLYGON_TIMEZONE).isoformat(),
                 stats['files_removed'],
                 stats['space_freed_mb'],
-                f"Manual cleanup: symbol={symbol}, timeframe={timeframe}, older_than={older_than_days}"
+                reason
             ))
             conn.commit()
             
+    def enforce_disk_budget(self, max_disk_mb: Optional[float] = None) -> Dict[str, Any]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Evict least recently read symbol/timeframes until the cache fits its budget
+        Parameters:
+            - max_disk_mb (float, optional): Budget in MB (default: config.cache_max_disk_mb)
+        Returns: dict - Cleanup statistics plus size_mb after eviction
+        Example: stats = storage.enforce_disk_budget(max_disk_mb=2048)
+        Note: Recency is the newest 'read' row in cache_access_log; entries
+              never read fall back to their last write
+        """
+        if max_disk_mb is None:
+            max_disk_mb = self.config.cache_max_disk_mb
+            
+        stats = {
+            'files_removed': 0,
+            'space_freed_mb': 0,
+            'entries_removed': 0,
+            'evicted': []
+        }
+        
+        # Reads still in the buffer count towards recency
+        self.flush_access_log()
+        
+        with self._get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COALESCE(SUM(file_size), 0) AS total_size FROM cache_partitions")
+            total_size = cursor.fetchone()['total_size']
+            stats['size_mb'] = total_size / 1024 / 1024
+            
+            if max_disk_mb is None or total_size <= max_disk_mb * 1024 * 1024:
+                return stats
+                
+            cursor.execute('''
+                SELECT m.*, COALESCE(p.size, 0) AS partition_size,
+                       COALESCE(a.last_read, m.last_updated) AS last_used
+                FROM cache_metadata m
+                LEFT JOIN (
+                    SELECT symbol, timeframe, MAX(access_time) AS last_read
+                    FROM cache_access_log
+                    WHERE access_type = 'read'
+                    GROUP BY symbol, timeframe
+                ) a ON a.symbol = m.symbol AND a.timeframe = m.timeframe
+                LEFT JOIN (
+                    SELECT symbol, timeframe, SUM(file_size) AS size
+                    FROM cache_partitions
+                    GROUP BY symbol, timeframe
+                ) p ON p.symbol = m.symbol AND p.timeframe = m.timeframe
+                ORDER BY last_used
+            ''')
+            rows = cursor.fetchall()
+            
+        for row in rows:
+            if total_size <= max_disk_mb * 1024 * 1024:
+                break
+                
+            # Take the write lock before the transaction, like save_data
+            with self._get_write_lock(row['symbol'], row['timeframe']):
+                with self._get_db_connection() as conn:
+                    self._remove_cache_entry(conn.cursor(), row, stats)
+                    conn.commit()
+            get_bar_cache().invalidate(row['symbol'], row['timeframe'])
+            
+            total_size -= row['partition_size']
+            stats['evicted'].append(f"{row['symbol']}_{row['timeframe']}")
+            
+        stats['size_mb'] = total_size / 1024 / 1024
+        self._log_cleanup(stats, f"LRU eviction: cache over {max_disk_mb} MB budget")
+        
         self.logger.info(
-            f"Cache cleanup completed: removed {stats['files_removed']} files, "
-            f"freed {stats['space_freed_mb']:.2f} MB"
+            f"Cache over {max_disk_mb} MB budget: evicted {stats['entries_removed']} "
+            f"symbol/timeframe(s), freed {stats['space_freed_mb']:.2f} MB"
         )
         
         return stats
         
+    def prune_access_log(self, older_than_days: Optional[int] = None) -> int:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Delete old cache_access_log rows
+        Parameters:
+            - older_than_days (int, optional): Age cutoff (default: config.access_log_retention_days)
+        Returns: int - Rows deleted
+        """
+        if older_than_days is None:
+            older_than_days = self.config.access_log_retention_days
+            
+        cutoff_date = datetime.now(POLYGON_TIMEZONE) - timedelta(days=older_than_days)
+        
+        with self._get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "DELETE FROM cache_access_log WHERE access_time < ?",
+                (cutoff_date.isoformat(),)
+            )
+            conn.commit()
+            return cursor.rowcount
+            
     def get_cache_statistics(self) -> Dict[str, Any]:
         """
         [FUNCTION SUMMARY]
@@ -737,6 +1949,9 @@ class StorageManager:
         Returns: dict - Cache usage statistics
         Example: stats = storage.get_cache_statistics()
         """
+        # Include access log rows still waiting in the buffer
+        self.flush_access_log()
+        
         with self._get_db_connection() as conn:
             cursor = conn.cursor()
             
@@ -748,6 +1963,10 @@ class StorageManager:
             cursor.execute("SELECT SUM(file_size) as total_size FROM cache_metadata")
             total_size = cursor.fetchone()['total_size'] or 0
             
+            # Total partitions
+            cursor.execute("SELECT COUNT(*) as count FROM cache_partitions")
+            total_partitions = cursor.fetchone()['count']
+            
             # By symbol
             cursor.execute('''
                 SELECT symbol, COUNT(*) as count, SUM(file_size) as size
@@ -780,6 +1999,7 @@ class StorageManager:
             
         return {
             'total_entries': total_entries,
+            'total_partitions': total_partitions,
             'total_size_mb': total_size / 1024 / 1024,
             'top_symbols': top_symbols,
             'by_timeframe': by_timeframe,
@@ -788,58 +2008,368 @@ class StorageManager:
             'database_path': str(self.config.cache_db_path)
         }
         
-    def optimize_cache(self) -> Dict[str, Any]:
+    def optimize_cache(self, max_disk_mb: Optional[float] = None,
+                       stop: Optional[threading.Event] = None) -> Dict[str, Any]:
         """
         [FUNCTION SUMMARY]
-        Purpose: Optimize cache by removing duplicates and recompressing
+        Purpose: Compact, tier and trim the cache so reads stay fast as it grows
+        Parameters:
+            - max_disk_mb (float, optional): Disk budget (default: config.cache_max_disk_mb)
+            - stop (Event, optional): Checked between symbols; when set, the
+              pass ends early with stats['interrupted'] = True
         Returns: dict - Optimization statistics
         Example: stats = storage.optimize_cache()
+        Note: One pass builds 5/15-minute tiers from old 1-minute bars, merges
+              old day partitions into month partitions, evicts least recently
+              read entries above the disk budget, prunes the access log and
+              deletes partition files superseded by an earlier pass.
+              start_compactor() runs it periodically in the background.
         """
         stats = {
             'files_optimized': 0,
             'space_saved_mb': 0,
+            'months_compacted': 0,
+            'tier_sessions': 0,
+            'entries_evicted': 0,
+            'space_freed_mb': 0,
+            'orphans_removed': 0,
+            'access_rows_pruned': 0,
+            'interrupted': False,
             'errors': []
         }
         
+        def stopping() -> bool:
+            if stop is not None and stop.is_set():
+                stats['interrupted'] = True
+            return stats['interrupted']
+            
         with self._get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM cache_metadata")
+            cursor.execute("SELECT symbol, timeframe FROM cache_metadata ORDER BY symbol, timeframe")
+            entries = [(row['symbol'], row['timeframe']) for row in cursor.fetchall()]
             
-            for row in cursor.fetchall():
-                try:
-                    file_path = Path(row['file_path'])
-                    if not file_path.exists():
-                        continue
-                        
-                    # Read current file
-                    original_size = file_path.stat().st_size
-                    df = self._read_parquet_file(file_path)
+        # Tiers first so their day partitions are compacted in the same pass
+        for symbol in sorted({symbol for symbol, timeframe in entries if timeframe == TIER_SOURCE_TIMEFRAME}):
+            if stopping():
+                break
+            try:
+                stats['tier_sessions'] += self.build_tiers(symbol)
+            except Exception as e:
+                stats['errors'].append(f"{symbol} tiers: {str(e)}")
+                
+        with self._get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT symbol, timeframe FROM cache_metadata ORDER BY symbol, timeframe")
+            entries = [(row['symbol'], row['timeframe']) for row in cursor.fetchall()]
+            
+        for symbol, timeframe in entries:
+            if stopping():
+                break
+            try:
+                compacted = self.compact_partitions(symbol, timeframe)
+            except Exception as e:
+                stats['errors'].append(f"{symbol}_{timeframe}: {str(e)}")
+                continue
+            stats['months_compacted'] += compacted['months_compacted']
+            stats['files_optimized'] += compacted['partitions_merged']
+            stats['space_saved_mb'] += compacted['space_saved_mb']
+            
+        if stopping():
+            self.logger.info("Cache optimization stopped early")
+            return stats
+            
+        try:
+            evicted = self.enforce_disk_budget(max_disk_mb)
+            stats['entries_evicted'] = evicted['entries_removed']
+            stats['space_freed_mb'] = evicted['space_freed_mb']
+        except Exception as e:
+            stats['errors'].append(f"disk budget: {str(e)}")
+            
+        try:
+            stats['access_rows_pruned'] = self.prune_access_log()
+            stats['orphans_removed'] = self._sweep_orphans()
+        except Exception as e:
+            stats['errors'].append(f"cleanup: {str(e)}")
+            
+        self.logger.info(
+            f"Cache optimization completed: merged {stats['files_optimized']} partitions "
+            f"into {stats['months_compacted']} months, tiered {stats['tier_sessions']} sessions, "
+            f"evicted {stats['entries_evicted']} entries, saved {stats['space_saved_mb']:.2f} MB"
+        )
+        
+        return stats
+        
+    def compact_partitions(self, symbol: str, timeframe: str,
+                           before: Optional[Union[str, datetime, date]] = None) -> Dict[str, Any]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Merge old day partitions into one month partition each
+        Parameters:
+            - symbol (str): Stock symbol
+            - timeframe (str): Data timeframe (only day-partitioned ones are compacted)
+            - before (date, optional): Compact months that ended before this day
+              (default: config.compaction_age_days ago)
+        Returns: dict - months_compacted, partitions_merged, space_saved_mb
+        Example: storage.compact_partitions('AAPL', '1min')
+        Note: The month file is sorted, de-duplicated and written with
+              config.compaction_row_group_size rows per row group so range
+              reads skip most of it. Replaced day files are deleted by a
+              later pass (see _sweep_orphans) so in-flight reads still find them.
+        """
+        symbol = symbol.upper()
+        stats = {'months_compacted': 0, 'partitions_merged': 0, 'space_saved_mb': 0}
+        
+        multiplier, timespan = parse_timeframe(timeframe)
+        if PARTITION_FORMATS.get(timespan) != '%Y-%m-%d':
+            return stats
+            
+        if before is None:
+            before = datetime.now(POLYGON_TIMEZONE) - timedelta(days=self.config.compaction_age_days)
+        cutoff_month = pd.Timestamp(before).strftime(COMPACTED_PARTITION_FORMAT)
+        
+        months = sorted({
+            row['partition_key'][:7]
+            for row in self.get_partitions(symbol, timeframe)
+            if len(row['partition_key']) == 10 and row['partition_key'][:7] < cutoff_month
+        })
+        
+        for month in months:
+            with self._get_write_lock(symbol, timeframe):
+                # Re-list under the lock; a save may have landed since
+                partitions = [
+                    row for row in self.get_partitions(symbol, timeframe)
+                    if row['partition_key'][:7] == month
+                ]
+                partitions.sort(key=lambda row: row['partition_key'])
+                
+                frames = []
+                for partition in partitions:
+                    if Path(partition['file_path']).exists():
+                        frames.append(self._read_parquet_file(Path(partition['file_path'])))
+                    else:
+                        self.logger.warning(f"Cache partition missing: {partition['file_path']}")
+                        self._drop_partition(partition)
+                frames = [frame for frame in frames if not frame.empty]
+                if not frames:
+                    continue
                     
-                    # Remove any duplicates
-                    df = df[~df.index.duplicated(keep='last')]
+                df = pd.concat(frames)
+                df = df[~df.index.duplicated(keep='last')].sort_index()
+                
+                # Write next to the target and swap in atomically
+                file_path = self._get_partition_filepath(symbol, timeframe, month)
+                tmp_path = file_path.with_suffix('.parquet.tmp')
+                pq.write_table(
+                    pa.Table.from_pandas(df, preserve_index=True),
+                    tmp_path,
+                    compression='snappy' if self.config.use_compression else None,
+                    row_group_size=self.config.compaction_row_group_size
+                )
+                os.replace(tmp_path, file_path)
+                
+                record = self._partition_record(df, symbol, timeframe, month, file_path)
+                with self._get_db_connection() as conn:
+                    conn.execute('BEGIN IMMEDIATE')
+                    conn.execute(_SQL_REPLACE_PARTITION, (
+                        record['symbol'],
+                        record['timeframe'],
+                        record['partition_key'],
+                        record['start_date'],
+                        record['end_date'],
+                        record['row_count'],
+                        record['file_path'],
+                        record['file_size'],
+                        record['checksum'],
+                        record['last_updated']
+                    ))
+                    conn.executemany('''
+                        DELETE FROM cache_partitions
+                        WHERE symbol = ? AND timeframe = ? AND partition_key = ?
+                    ''', [
+                        (symbol, timeframe, row['partition_key'])
+                        for row in partitions if row['partition_key'] != month
+                    ])
+                    conn.commit()
                     
-                    # Rewrite with optimal compression
-                    pq.write_table(
-                        pa.Table.from_pandas(df, preserve_index=True),
-                        file_path,
-                        compression='snappy'
-                    )
+                get_bar_cache().invalidate(symbol, timeframe)
+                
+                metadata = self._build_cache_metadata(symbol, timeframe)
+                if metadata:
+                    self._update_cache_metadata(metadata)
                     
-                    # Calculate space saved
-                    new_size = file_path.stat().st_size
-                    if new_size < original_size:
-                        stats['files_optimized'] += 1
-                        stats['space_saved_mb'] += (original_size - new_size) / 1024 / 1024
+            merged = [row for row in partitions if row['partition_key'] != month]
+            stats['months_compacted'] += 1
+            stats['partitions_merged'] += len(merged)
+            stats['space_saved_mb'] += max(
+                0, sum(row['file_size'] or 0 for row in partitions) - record['file_size']
+            ) / 1024 / 1024
+            
+        if stats['months_compacted']:
+            self.logger.info(
+                f"Compacted {stats['partitions_merged']} partitions of {symbol} {timeframe} "
+                f"into {stats['months_compacted']} month(s)"
+            )
+            
+        return stats
+        
+    def build_tiers(self, symbol: str,
+                    before: Optional[Union[str, datetime, date]] = None,
+                    timeframes: Optional[List[str]] = None) -> int:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Downsample old cached 1-minute bars into coarser cached timeframes
+        Parameters:
+            - symbol (str): Stock symbol
+            - before (date, optional): Only sessions before this day
+              (default: config.cache_tier_age_days ago)
+            - timeframes (list, optional): Tier timeframes (default: config.cache_tier_timeframes)
+        Returns: int - Sessions added across all tiers
+        Example: storage.build_tiers('AAPL')
+        Note: Only sessions covered in 1min and not yet covered in the tier
+              are built; they are then marked covered so fetches of the tier
+              are served from the cache
+        """
+        symbol = symbol.upper()
+        timeframes = [
+            timeframe for timeframe in (timeframes or self.config.cache_tier_timeframes)
+            if timeframe != TIER_SOURCE_TIMEFRAME
+        ]
+        if before is None:
+            before = datetime.now(POLYGON_TIMEZONE) - timedelta(days=self.config.cache_tier_age_days)
+        last_day = pd.Timestamp(before).date() - timedelta(days=1)
+        
+        partitions = self.get_partitions(symbol, TIER_SOURCE_TIMEFRAME)
+        if not timeframes or not partitions:
+            return 0
+            
+        first_day = parse_date(partitions[0]['start_date']).date()
+        if first_day > last_day:
+            return 0
+            
+        self._ensure_coverage_index(symbol, TIER_SOURCE_TIMEFRAME)
+        sessions = trading_days(first_day, last_day)
+        sessions = sessions[self._covered_mask(symbol, TIER_SOURCE_TIMEFRAME, sessions)]
+        
+        added = 0
+        for timeframe in timeframes:
+            self._ensure_coverage_index(symbol, timeframe)
+            needed = sessions[~self._covered_mask(symbol, timeframe, sessions)]
+            needed_months = needed.astype('datetime64[M]')
+            
+            # One month of 1-minute bars at a time keeps memory bounded
+            for month in np.unique(needed_months):
+                days = needed[needed_months == month]
+                range_start = datetime.combine(days[0].astype(object), dt_time.min, tzinfo=POLYGON_TIMEZONE)
+                range_end = datetime.combine(days[-1].astype(object) + timedelta(days=1), dt_time.min, tzinfo=POLYGON_TIMEZONE)
+                
+                frames = [
+                    self._read_parquet_file(Path(row['file_path']), range_start, range_end)
+                    for row in self.get_partitions(symbol, TIER_SOURCE_TIMEFRAME, range_start, range_end)
+                    if Path(row['file_path']).exists()
+                ]
+                frames = [frame for frame in frames if not frame.empty]
+                if frames:
+                    df = pd.concat(frames).sort_index()
+                    df = df[np.isin(df.index.values.astype('datetime64[D]'), days)]
+                    bars = resample_ohlcv(df, timeframe, label='left', closed='left')
+                    if not bars.empty:
+                        self.save_data(bars, symbol, timeframe)
                         
-                except Exception as e:
-                    stats['errors'].append(f"{row['symbol']}_{row['timeframe']}: {str(e)}")
+                self._update_coverage(symbol, timeframe, days, covered=True)
+                added += len(days)
+                
+        if added:
+            self.logger.info(f"Built {added} tier session(s) for {symbol} from {TIER_SOURCE_TIMEFRAME} bars")
+            
+        return added
+        
+    def _sweep_orphans(self) -> int:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Delete partition files no partition record points to
+        Returns: int - Files deleted
+        Note: Files younger than _ORPHAN_GRACE_SECONDS are kept; they may be
+              mid-write or still open in a read that listed them before a
+              compaction swapped them out
+        """
+        with self._get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT file_path FROM cache_partitions")
+            referenced = {os.path.normcase(row['file_path']) for row in cursor.fetchall()}
+            
+        cutoff = time.time() - _ORPHAN_GRACE_SECONDS
+        removed = 0
+        
+        for pattern in ('*/*/*.parquet', '*/*/*.parquet.tmp'):
+            for file_path in self.symbol_dir.glob(pattern):
+                if os.path.normcase(str(file_path)) in referenced:
+                    continue
+                try:
+                    if file_path.stat().st_mtime < cutoff:
+                        file_path.unlink()
+                        removed += 1
+                except FileNotFoundError:
+                    continue
                     
-        self.logger.info(
-            f"Cache optimization completed: {stats['files_optimized']} files, "
-            f"saved {stats['space_saved_mb']:.2f} MB"
+        return removed
+        
+    def start_compactor(self, interval_minutes: Optional[float] = None) -> bool:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Run optimize_cache() periodically on a background thread
+        Parameters:
+            - interval_minutes (float, optional): Period (default: config.compaction_interval_minutes)
+        Returns: bool - True if the compactor is running
+        Example: storage.start_compactor()
+        Note: The first pass runs after min(interval, 5 minutes) so a
+              frequently restarted process still compacts
+        """
+        if interval_minutes is None:
+            interval_minutes = self.config.compaction_interval_minutes
+        if not interval_minutes or self._closed:
+            return False
+            
+        if self._compactor_thread is not None and self._compactor_thread.is_alive():
+            return True
+            
+        self._compactor_stop.clear()
+        self._compactor_thread = threading.Thread(
+            target=self._compactor_loop,
+            args=(interval_minutes * 60,),
+            name='polygon-compactor',
+            daemon=True
         )
+        self._compactor_thread.start()
+        return True
         
-        return stats
+    def stop_compactor(self, timeout: Optional[float] = 30.0):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Stop the background compactor
+        Parameters:
+            - timeout (float, optional): Seconds to wait for a running pass
+        Note: A running pass stops after the symbol it is working on. This
+              blocks, so async callers should run it with asyncio.to_thread
+        """
+        self._compactor_stop.set()
+        thread, self._compactor_thread = self._compactor_thread, None
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout)
+            
+    def _compactor_loop(self, interval_seconds: float):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Background loop running optimize_cache() on a timer
+        """
+        delay = min(interval_seconds, 300)
+        while not self._compactor_stop.wait(delay):
+            try:
+                stats = self.optimize_cache(stop=self._compactor_stop)
+                if stats['errors']:
+                    self.logger.warning(f"Background compaction errors: {stats['errors'][:5]}")
+            except Exception as e:
+                self.logger.warning(f"Background compaction failed: {e}")
+            delay = interval_seconds
 
 
 # Public convenience functions
@@ -0,0 +1,28 @@
+# polygon/tests/conftest.py - Shared setup for polygon unit tests
+"""
+Unit tests never call the Polygon API, but PolygonConfig refuses to load
+without a key, so provide a placeholder before anything imports polygon.
+"""
+
+import os
+
+import pytest
+
+os.environ.setdefault('POLYGON_API_KEY', 'test-key')
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """StorageManager whose database and parquet files live in tmp_path"""
+    from polygon.config import PolygonConfig
+    from polygon.storage import StorageManager
+    
+    config = PolygonConfig()
+    config.data_dir = tmp_path
+    config.cache_dir = tmp_path / 'cache'
+    config.parquet_dir = tmp_path / 'parquet'
+    config.cache_db_path = config.cache_dir / 'polygon_cache.db'
+    
+    manager = StorageManager(config)
+    yield manager
+    manager.close()
@@ -0,0 +1,46 @@
+# polygon/tests/test_calendar.py - NYSE holiday and early-close rules
+from datetime import date
+
+import pytest
+
+from polygon.calendar import early_closes, nyse_holidays, trading_days
+
+# Published NYSE schedules (ad hoc closures such as 2025-01-09 are not rule-based)
+HOLIDAYS = {
+    2021: ['01-01', '01-18', '02-15', '04-02', '05-31', '07-05', '09-06', '11-25', '12-24'],
+    2022: ['01-17', '02-21', '04-15', '05-30', '06-20', '07-04', '09-05', '11-24', '12-26'],
+    2023: ['01-02', '01-16', '02-20', '04-07', '05-29', '06-19', '07-04', '09-04', '11-23', '12-25'],
+    2024: ['01-01', '01-15', '02-19', '03-29', '05-27', '06-19', '07-04', '09-02', '11-28', '12-25'],
+    2025: ['01-01', '01-20', '02-17', '04-18', '05-26', '06-19', '07-04', '09-01', '11-27', '12-25'],
+    2026: ['01-01', '01-19', '02-16', '04-03', '05-25', '06-19', '07-03', '09-07', '11-26', '12-25'],
+}
+
+EARLY_CLOSES = {
+    2021: ['11-26'],
+    2022: ['11-25'],
+    2023: ['07-03', '11-24'],
+    2024: ['07-03', '11-29', '12-24'],
+    2025: ['07-03', '11-28', '12-24'],
+    2026: ['11-27', '12-24'],
+}
+
+
+def _dates(year, days):
+    return tuple(date.fromisoformat(f'{year}-{day}') for day in days)
+
+
+@pytest.mark.parametrize('year', sorted(HOLIDAYS))
+def test_nyse_holidays(year):
+    assert nyse_holidays(year) == _dates(year, HOLIDAYS[year])
+
+
+@pytest.mark.parametrize('year', sorted(EARLY_CLOSES))
+def test_early_closes(year):
+    assert early_closes(year) == _dates(year, EARLY_CLOSES[year])
+
+
+def test_trading_days_skip_weekends_and_holidays():
+    days = trading_days('2024-07-01', '2024-07-08')
+    assert [str(day) for day in days] == [
+        '2024-07-01', '2024-07-02', '2024-07-03', '2024-07-05', '2024-07-08'
+    ]
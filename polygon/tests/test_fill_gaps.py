@@ -0,0 +1,61 @@
+# polygon/tests/test_fill_gaps.py - Single-reindex gap filling
+import logging
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from polygon.fetcher import DataFetcher
+from polygon.utils import parse_timeframe
+from polygon.validators.gaps import detect_gaps
+
+_STEPS = {'minute': 'minutes', 'hour': 'hours', 'day': 'days'}
+
+
+def _fill_per_gap(df, timeframe):
+    """The original per-gap loop, kept as the reference result"""
+    gaps = detect_gaps(df, timeframe, market_hours_only=True)
+    multiplier, timespan = parse_timeframe(timeframe)
+    step = pd.Timedelta(**{_STEPS[timespan]: multiplier})
+    
+    for gap in gaps['gaps']:
+        if gap['missing_bars'] <= 5:
+            expected_index = pd.date_range(start=gap['start'], end=gap['end'], freq=step)
+            df = df.reindex(df.index.union(expected_index))
+            df[['open', 'high', 'low', 'close']] = df[['open', 'high', 'low', 'close']].ffill()
+            df['volume'] = df['volume'].fillna(0)
+    return df
+
+
+def _random_bars(rng, timeframe, periods=400):
+    """Bars on a regular grid with random runs of 1-8 bars removed"""
+    multiplier, timespan = parse_timeframe(timeframe)
+    step = pd.Timedelta(**{_STEPS[timespan]: multiplier})
+    start = '2024-03-04' if timespan == 'day' else '2024-03-04 14:30'
+    index = pd.date_range(start, periods=periods, freq=step, tz='UTC', name='timestamp')
+    if timespan == 'day':
+        index = index[index.dayofweek < 5]
+        
+    keep = np.ones(len(index), dtype=bool)
+    for begin in rng.choice(np.arange(1, len(index) - 10), size=12, replace=False):
+        keep[begin:begin + rng.integers(1, 9)] = False
+    index = index[keep]
+    
+    close = 100 + rng.standard_normal(len(index)).cumsum()
+    return pd.DataFrame({
+        'open': close, 'high': close + 1, 'low': close - 1, 'close': close,
+        'volume': rng.integers(1, 10_000, len(index)).astype(float)
+    }, index=index)
+
+
+@pytest.mark.parametrize('timeframe', ['1min', '3min', '5min', '1hour', '1day'])
+def test_single_reindex_matches_per_gap_loop(timeframe):
+    fetcher = SimpleNamespace(logger=logging.getLogger(__name__))
+    rng = np.random.default_rng(7)
+    
+    for _ in range(5):
+        df = _random_bars(rng, timeframe)
+        expected = _fill_per_gap(df.copy(), timeframe)
+        result = DataFetcher._fill_data_gaps(fetcher, df.copy(), timeframe)
+        pd.testing.assert_frame_equal(result, expected, check_freq=False)
@@ -0,0 +1,53 @@
+# polygon/tests/test_gaps.py - Gap detection against the session calendar
+import pandas as pd
+
+from polygon.validators.gaps import detect_gaps
+
+
+def _bars(*ranges, freq='5min'):
+    """Constant bars over [start, end) UTC ranges"""
+    index = pd.DatetimeIndex([], tz='UTC')
+    for start, end in ranges:
+        index = index.append(pd.date_range(start, end, freq=freq, tz='UTC', inclusive='left'))
+    return pd.DataFrame({'close': 1.0}, index=index)
+
+
+def test_overnight_and_weekend_are_closures():
+    # Full extended sessions (04:00-20:00 ET) Friday and Monday
+    df = _bars(('2024-03-08 09:00', '2024-03-09 01:00'),
+               ('2024-03-11 08:00', '2024-03-12 00:00'))
+    assert detect_gaps(df, '5min')['gap_count'] == 0
+
+
+def test_gap_inside_session_counts_every_bar():
+    df = _bars(('2024-03-05 14:30', '2024-03-05 16:00'),
+               ('2024-03-05 17:00', '2024-03-05 21:00'))
+    result = detect_gaps(df, '5min')
+    assert result['gap_count'] == 1
+    assert result['total_missing_bars'] == 12
+
+
+def test_session_that_stops_mid_day_is_reported():
+    # Bars stop at 11:00 ET and resume at the next regular open
+    df = _bars(('2024-03-05 09:00', '2024-03-05 16:00'),
+               ('2024-03-06 14:30', '2024-03-06 20:00'))
+    result = detect_gaps(df, '5min')
+    assert result['gap_count'] == 1
+    # 11:00-16:00 ET on the 5th
+    assert result['total_missing_bars'] == 60
+
+
+def test_skipped_session_counts_its_regular_bars():
+    # Regular-hours data with all of Tuesday 2024-03-05 missing
+    df = _bars(('2024-03-04 14:30', '2024-03-04 21:00'),
+               ('2024-03-06 14:30', '2024-03-06 21:00'))
+    result = detect_gaps(df, '5min')
+    assert result['gap_count'] == 1
+    assert result['total_missing_bars'] == 78
+
+
+def test_holiday_is_a_closure():
+    # 2024-07-04 is an exchange holiday
+    df = _bars(('2024-07-05 13:30', '2024-07-05 20:00'),
+               ('2024-07-03 13:30', '2024-07-03 17:00'))
+    assert detect_gaps(df, '5min')['gap_count'] == 0
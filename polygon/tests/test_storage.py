@@ -0,0 +1,147 @@
+# polygon/tests/test_storage.py - Partitioned parquet cache
+import threading
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from polygon.calendar import trading_days
+from polygon.config import POLYGON_TIMEZONE
+from polygon.storage import CacheMetadata, CACHE_LAYOUT_VERSION
+
+
+def _bars(start, periods, freq='5min'):
+    """OHLCV frame indexed like normalize_ohlcv_data() output"""
+    index = pd.date_range(start, periods=periods, freq=freq, tz='UTC', name='datetime')
+    close = np.linspace(100.0, 101.0, periods)
+    return pd.DataFrame({
+        'open': close, 'high': close + 0.5, 'low': close - 0.5,
+        'close': close, 'volume': np.full(periods, 1000.0)
+    }, index=index)
+
+
+def _legacy_cache(storage, tmp_path, df, symbol='AAPL', timeframe='5min'):
+    """Write a pre-partitioning single-file cache and its metadata row"""
+    legacy_path = tmp_path / f'{symbol}_{timeframe}.parquet'
+    df.to_parquet(legacy_path)
+    storage._update_cache_metadata(CacheMetadata(
+        symbol=symbol, timeframe=timeframe,
+        start_date=df.index[0].isoformat(), end_date=df.index[-1].isoformat(),
+        last_updated=datetime.now().isoformat(), row_count=len(df),
+        file_path=str(legacy_path), version='1.0'
+    ))
+    return legacy_path
+
+
+def test_save_and_load_round_trip(storage):
+    df = _bars('2024-03-04 14:30', 200)
+    storage.save_data(df, 'AAPL', '5min')
+    
+    loaded = storage.load_data('AAPL', '5min')
+    pd.testing.assert_frame_equal(loaded, df, check_freq=False, check_names=False)
+    assert len(storage.get_partitions('AAPL', '5min')) == 2
+
+
+def test_concurrent_readers_migrate_legacy_cache_once(storage, tmp_path):
+    df = _bars('2024-03-04 14:30', 200)
+    legacy_path = _legacy_cache(storage, tmp_path, df)
+    
+    results, errors = [], []
+    
+    def read():
+        try:
+            results.append(storage.load_data('AAPL', '5min'))
+        except Exception as e:
+            errors.append(e)
+            
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+        
+    assert not errors
+    assert all(result is not None and len(result) == len(df) for result in results)
+    assert not legacy_path.exists()
+    assert storage.get_cache_metadata('AAPL', '5min').version == CACHE_LAYOUT_VERSION
+
+
+def _session_days(ranges):
+    """(first, last) calendar dates of each missing range"""
+    return [(start.date(), end.date()) for start, end in ranges]
+
+
+def test_missing_ranges_without_cache_cover_the_request(storage):
+    missing = storage.get_missing_ranges('AAPL', '5min', '2024-03-04', '2024-03-08')
+    assert _session_days(missing) == [(date(2024, 3, 4), date(2024, 3, 8))]
+
+
+def test_missing_ranges_follow_marked_coverage(storage):
+    storage.save_data(_bars('2024-03-04 14:30', 78), 'AAPL', '5min')
+    assert storage.mark_coverage('AAPL', '5min', '2024-03-04', '2024-03-10') == 5
+    
+    missing = storage.get_missing_ranges('AAPL', '5min', '2024-03-04', '2024-03-15')
+    assert _session_days(missing) == [(date(2024, 3, 11), date(2024, 3, 15))]
+    
+    # Weekends never produce a range
+    assert storage.get_missing_ranges('AAPL', '5min', '2024-03-09', '2024-03-10') == []
+
+
+def test_missing_ranges_bridge_short_covered_stretches(storage):
+    storage.config.missing_range_merge_days = 2
+    storage.save_data(_bars('2024-03-04 14:30', 78), 'AAPL', '5min')
+    storage.mark_coverage('AAPL', '5min', '2024-03-04', '2024-03-06')
+    storage.mark_coverage('AAPL', '5min', '2024-03-08', '2024-03-08')
+    storage.mark_coverage('AAPL', '5min', '2024-03-12', '2024-03-22')
+    
+    # Mar 7 and Mar 11 are one covered session apart: refetch Mar 8 with them
+    missing = storage.get_missing_ranges('AAPL', '5min', '2024-03-04', '2024-03-22')
+    assert _session_days(missing) == [(date(2024, 3, 7), date(2024, 3, 11))]
+    
+    storage.config.missing_range_merge_days = 0
+    missing = storage.get_missing_ranges('AAPL', '5min', '2024-03-04', '2024-03-22')
+    assert _session_days(missing) == [
+        (date(2024, 3, 7), date(2024, 3, 7)), (date(2024, 3, 11), date(2024, 3, 11))
+    ]
+
+
+def test_mark_coverage_skips_incomplete_days(storage):
+    today = datetime.now(POLYGON_TIMEZONE).date()
+    last_complete = storage.last_complete_day()
+    assert last_complete < today
+    
+    start = today - timedelta(days=14)
+    marked = storage.mark_coverage('AAPL', '5min', start, today)
+    assert marked == len(trading_days(start, last_complete))
+    
+    recent = trading_days(last_complete + timedelta(days=1), today)
+    assert not storage._covered_mask('AAPL', '5min', recent).any()
+
+
+def test_legacy_coverage_leaves_partial_newest_session_open(storage):
+    # Mar 4 runs into post-market; Mar 5 stops at 17:00 UTC, before the close
+    storage.save_data(pd.concat([
+        _bars('2024-03-04 14:30', 90), _bars('2024-03-05 14:30', 30)
+    ]), 'AAPL', '5min')
+    
+    missing = storage.get_missing_ranges('AAPL', '5min', '2024-03-04', '2024-03-05')
+    assert _session_days(missing) == [(date(2024, 3, 5), date(2024, 3, 5))]
+
+
+def test_legacy_coverage_marks_complete_newest_session(storage):
+    storage.save_data(pd.concat([
+        _bars('2024-03-04 14:30', 90), _bars('2024-03-05 14:30', 90)
+    ]), 'AAPL', '5min')
+    
+    assert storage.get_missing_ranges('AAPL', '5min', '2024-03-04', '2024-03-05') == []
+
+
+def test_legacy_coverage_skips_days_that_may_still_change(storage):
+    today = datetime.now(POLYGON_TIMEZONE).date()
+    start = today - timedelta(days=7)
+    storage.save_data(_bars(pd.Timestamp(start), 8 * 24, freq='1h'), 'AAPL', '1hour')
+    
+    storage.get_missing_ranges('AAPL', '1hour', start.isoformat(), today.isoformat())
+    
+    recent = trading_days(storage.last_complete_day() + timedelta(days=1), today)
+    assert not storage._covered_mask('AAPL', '1hour', recent).any()
@@ -0,0 +1,35 @@
+# polygon/tests/test_utils.py - Bar normalization
+import numpy as np
+
+from polygon.utils import normalize_ohlcv_data
+
+
+def _bar(t, volume, transactions=10):
+    return {'t': t, 'o': 10, 'h': 11, 'l': 9.5, 'c': 10.5, 'v': volume, 'vw': 10.2, 'n': transactions}
+
+
+def test_numeric_columns_are_always_float64():
+    whole = normalize_ohlcv_data([_bar(1_709_562_600_000, 100), _bar(1_709_562_660_000, 200)])
+    fractional = normalize_ohlcv_data([_bar(1_709_562_720_000, 100.5)])
+    
+    for df in (whole, fractional):
+        assert (df.dtypes == np.float64).all()
+
+
+def test_bad_values_become_nan():
+    df = normalize_ohlcv_data([_bar(1_709_562_600_000, 'n/a', None), _bar(1_709_562_660_000, 100)])
+    
+    assert np.isnan(df['volume'].iloc[0])
+    assert np.isnan(df['transactions'].iloc[0])
+    assert df['volume'].iloc[1] == 100
+
+
+def test_overlapping_saves_keep_volume_dtype(storage):
+    first = normalize_ohlcv_data([_bar(1_709_562_600_000, 100.5), _bar(1_709_562_660_000, 200)])
+    second = normalize_ohlcv_data([_bar(1_709_562_660_000, 300), _bar(1_709_562_720_000, 400)])
+    storage.save_data(first, 'AAPL', '1min')
+    storage.save_data(second, 'AAPL', '1min')
+    
+    loaded = storage.load_data('AAPL', '1min')
+    assert loaded['volume'].dtype == np.float64
+    assert loaded['volume'].tolist() == [100.5, 300.0, 400.0]
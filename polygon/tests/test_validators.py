@@ -0,0 +1,37 @@
+# polygon/tests/test_validators.py - OHLCV integrity report
+import numpy as np
+import pandas as pd
+
+from polygon.validators import validate_ohlcv_integrity
+
+
+def _minute_bars(days=10):
+    """Round-the-clock 1min bars, so many fall outside trading sessions"""
+    rng = np.random.default_rng(3)
+    index = pd.date_range('2024-03-04', periods=days * 1440, freq='1min', tz='UTC')
+    close = 100 + rng.standard_normal(len(index)).cumsum() * 0.1
+    return pd.DataFrame({
+        'open': close,
+        'high': close + rng.random(len(index)),
+        'low': close - rng.random(len(index)),
+        'close': close,
+        'volume': rng.integers(1, 50, len(index)).astype(float)
+    }, index=index)
+
+
+def test_default_report_keeps_original_checks():
+    df = _minute_bars()
+    df.iloc[5, df.columns.get_loc('high')] = df['low'].iloc[5] - 1
+    
+    report = validate_ohlcv_integrity(df, 'AAPL', '1min')
+    
+    assert 'Invalid OHLC relationship (high < low): 1 rows' in report.issues
+    assert not any('session' in warning or 'spread' in warning for warning in report.warnings)
+    assert 'flagged_rows' not in report.metrics
+
+
+def test_all_checks_are_opt_in():
+    report = validate_ohlcv_integrity(_minute_bars(), 'AAPL', '1min', checks='all')
+    
+    assert any(warning.startswith('Bars outside trading sessions') for warning in report.warnings)
+    assert report.metrics['flagged_rows'] > 0
@@ -0,0 +1,25 @@
+# polygon/tests/test_warmup.py - Warmup spec parsing
+import pytest
+
+from polygon.exceptions import PolygonDataError
+from polygon.warmup import WarmupSpec
+
+
+@pytest.mark.parametrize('text, timeframe, sessions', [
+    ('5min:30', '5min', 30),
+    ('5minx30', '5min', 30),
+    ('5minX30', '5min', 30),
+    ('1day*60', '1day', 60),
+    ('1min×2', '1min', 2),
+    # Case is kept: the cache directory is keyed on the timeframe as written
+    ('1H:10', '1H', 10),
+    ('1D:60', '1D', 60),
+])
+def test_parse(text, timeframe, sessions):
+    assert WarmupSpec.parse(text) == WarmupSpec(timeframe, sessions)
+
+
+@pytest.mark.parametrize('text', ['5min', '5min:0', ':30', '5min:abc'])
+def test_parse_rejects_malformed_specs(text):
+    with pytest.raises(PolygonDataError):
+        WarmupSpec.parse(text)
@@ -4,9 +4,11 @@ Utility functions for data manipulation, validation, and conversion.
 Provides common operations used throughout the polygon module.
 """
 
+import json
 import re
 from datetime import datetime, timedelta, time as dt_time
 from typing import Union, Tuple, Optional, List, Dict, Any
+import numpy as np
 import pandas as pd
 import pytz
 from dateutil import parser as date_parser
@@ -14,6 +16,26 @@ from dateutil import parser as date_parser
 from .config import get_config, POLYGON_TIMEZONE
 from .exceptions import PolygonDataError, PolygonTimeRangeError
 
+# orjson decodes raw API bodies several times faster than the stdlib parser
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+# Polygon aggregate keys and the standard column names they map to
+OHLCV_FIELDS = [
+    ('o', 'open'),
+    ('h', 'high'),
+    ('l', 'low'),
+    ('c', 'close'),
+    ('v', 'volume'),
+    ('vw', 'vwap'),  # Volume weighted average price
+    ('n', 'transactions')  # Number of transactions
+]
+OHLCV_COLUMNS = [column for _, column in OHLCV_FIELDS]
+
 
 def parse_timeframe(timeframe: str) -> Tuple[int, str]:
     """
@@ -290,10 +312,10 @@ def is_market_open(check_time: Optional[datetime] = None) -> bool:
         - check_time (datetime, optional): Time to check (defaults to now)
     Returns: bool - True if market is open
     Example: is_market_open() -> True
-    Note: Checks regular trading hours only, not extended hours
+    Note: Checks regular trading hours only, not extended hours; DST, holidays
+          and early closes come from the exchange calendar
     """
-    # Get configuration
-    config = get_config()
+    from .calendar import session_mask
     
     # Use current time if not specified
     if check_time is None:
@@ -302,19 +324,7 @@ def is_market_open(check_time: Optional[datetime] = None) -> bool:
         # Ensure UTC
         check_time = parse_date(check_time)
     
-    # Check if it's a weekday (Monday=0, Sunday=6)
-    if check_time.weekday() not in config.trading_days:
-        return False
-    
-    # Get time component
-    current_time = check_time.time()
-    
-    # Check against market hours (accounting for DST if needed)
-    # Note: This is simplified and doesn't account for holidays
-    market_start = config.market_hours['regular_start']
-    market_end = config.market_hours['regular_end']
-    
-    return market_start <= current_time <= market_end
+    return bool(session_mask([check_time], 'regular', inclusive='both')[0])
 
 
 def is_extended_hours(check_time: Optional[datetime] = None) -> bool:
@@ -326,28 +336,14 @@ def is_extended_hours(check_time: Optional[datetime] = None) -> bool:
     Returns: bool - True if in pre-market or after-hours
     Example: is_extended_hours() -> False
     """
-    config = get_config()
+    from .calendar import session_mask
     
     if check_time is None:
         check_time = datetime.now(POLYGON_TIMEZONE)
     else:
         check_time = parse_date(check_time)
     
-    # Not extended hours on weekends
-    if check_time.weekday() not in config.trading_days:
-        return False
-    
-    current_time = check_time.time()
-    
-    # Check pre-market
-    if config.market_hours['pre_market_start'] <= current_time < config.market_hours['regular_start']:
-        return True
-    
-    # Check after-hours
-    if config.market_hours['regular_end'] < current_time <= config.market_hours['post_market_end']:
-        return True
-    
-    return False
+    return bool(session_mask([check_time], ['pre', 'post'])[0])
 
 
 def calculate_bars_in_range(start_date: Union[str, datetime], 
@@ -445,55 +441,91 @@ def split_large_date_range(start_date: Union[str, datetime],
     return chunks
 
 
-def normalize_ohlcv_data(data: List[Dict[str, Any]]) -> pd.DataFrame:
+def normalize_ohlcv_data(data: Union[List[Dict[str, Any]], Dict[str, Any], bytes, str]) -> pd.DataFrame:
     """
     [FUNCTION SUMMARY]
     Purpose: Normalize OHLCV data from Polygon API into DataFrame
     Parameters:
-        - data (list): List of bar dictionaries from API
+        - data (list | dict | bytes | str): List of bar dictionaries from API,
+          a response dict with 'results', or a raw JSON response body
     Returns: DataFrame - Normalized OHLCV data with UTC timestamps
     Example: df = normalize_ohlcv_data(api_response['results'])
+    Notes: Columns are built straight from the bars as float64 numpy arrays
+           (the same dtype for every chunk, so cached partitions share one
+           schema; non-numeric values become NaN) under a datetime64[ms, UTC]
+           index, sorted with duplicates dropped (last bar wins)
     """
+    if isinstance(data, (bytes, bytearray, memoryview, str)):
+        data = _loads(data)
+    if isinstance(data, dict):
+        data = data.get('results') or []
+    
     if not data:
         # Return empty DataFrame with correct structure
-        return pd.DataFrame(columns=['open', 'high', 'low', 'close', 'volume', 'vwap', 'transactions'])
-    
-    # Create DataFrame
-    df = pd.DataFrame(data)
-    
-    # Rename columns to standard names
-    column_mapping = {
-        'o': 'open',
-        'h': 'high',
-        'l': 'low',
-        'c': 'close',
-        'v': 'volume',
-        't': 'timestamp',
-        'vw': 'vwap',  # Volume weighted average price
-        'n': 'transactions'  # Number of transactions
-    }
-    
-    df = df.rename(columns=column_mapping)
-    
-    # Convert timestamp to datetime index
-    if 'timestamp' in df.columns:
-        df['datetime'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
-        df = df.set_index('datetime')
-        df = df.drop(columns=['timestamp'])
-    
-    # Ensure numeric types
-    numeric_columns = ['open', 'high', 'low', 'close', 'volume', 'vwap', 'transactions']
-    for col in numeric_columns:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-    
-    # Sort by time
-    df = df.sort_index()
-    
-    # Remove any duplicates
-    df = df[~df.index.duplicated(keep='last')]
-    
-    return df
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+    
+    # Build each column straight from the bars into a typed array
+    columns = {}
+    for key, column in [('t', 'timestamp')] + OHLCV_FIELDS:
+        values = _bar_field(data, key)
+        if values is None:
+            continue
+        if column != 'timestamp':
+            values = values.astype(np.float64, copy=False)
+        columns[column] = values
+    
+    timestamps = columns.pop('timestamp', None)
+    if timestamps is None:
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+    
+    # Bars without a timestamp cannot be placed
+    if timestamps.dtype != np.int64:
+        placed = ~np.isnan(timestamps)
+        timestamps = timestamps[placed].astype(np.int64)
+        columns = {column: values[placed] for column, values in columns.items()}
+    
+    # Sort by time and remove duplicates (keep the last bar for a timestamp)
+    if len(timestamps) > 1 and not (timestamps[1:] > timestamps[:-1]).all():
+        order = np.argsort(timestamps, kind='stable')
+        timestamps = timestamps[order]
+        keep = np.append(timestamps[1:] != timestamps[:-1], True)
+        order = order[keep]
+        timestamps = timestamps[keep]
+        columns = {column: values[order] for column, values in columns.items()}
+    
+    index = pd.DatetimeIndex(
+        timestamps.astype('datetime64[ms]'), name='datetime'
+    ).tz_localize('UTC')
+    return pd.DataFrame(columns, index=index)
+
+
+def _bar_field(data: List[Dict[str, Any]], key: str) -> Optional[np.ndarray]:
+    """
+    [FUNCTION SUMMARY]
+    Purpose: Extract one field from a list of bars as a numpy array
+    Parameters:
+        - data (list): Bar dictionaries from the API
+        - key (str): Field key (e.g. 'o', 'v')
+    Returns: ndarray - int64 when every value is an integer, float64 otherwise
+             (missing or non-numeric values become NaN); None when no bar
+             has the field
+    """
+    try:
+        values = [bar[key] for bar in data]
+    except KeyError:
+        values = [bar.get(key) for bar in data]
+        if all(value is None for value in values):
+            return None
+    
+    array = np.array(values)
+    if array.dtype.kind not in 'if':
+        try:
+            array = np.array(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            array = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(
+                dtype=np.float64, na_value=np.nan
+            )
+    return array if array.dtype.kind == 'f' else array.astype(np.int64)
 
 
 def validate_ohlcv_data(df: pd.DataFrame, symbol: str = None) -> pd.DataFrame:
@@ -506,6 +538,8 @@ def validate_ohlcv_data(df: pd.DataFrame, symbol: str = None) -> pd.DataFrame:
     Returns: DataFrame - Validated data (may have removed invalid rows)
     Example: clean_df = validate_ohlcv_data(df, 'AAPL')
     Raises: PolygonDataError if critical issues found
+    Notes: All checks run on the raw numpy columns and build one keep mask;
+           each issue count covers rows not already removed by earlier checks
     """
     if df.empty:
         return df
@@ -523,57 +557,49 @@ def validate_ohlcv_data(df: pd.DataFrame, symbol: str = None) -> pd.DataFrame:
             symbol=symbol
         )
     
-    # Remove rows with any NaN in OHLC
-    ohlc_columns = ['open', 'high', 'low', 'close']
-    nan_mask = df[ohlc_columns].isna().any(axis=1)
-    if nan_mask.any():
-        issues.append(f"Removed {nan_mask.sum()} rows with NaN prices")
-        df = df[~nan_mask]
-    
-    # Check for negative prices
-    negative_mask = (df[ohlc_columns] < 0).any(axis=1)
-    if negative_mask.any():
-        issues.append(f"Removed {negative_mask.sum()} rows with negative prices")
-        df = df[~negative_mask]
-    
-    # Check for zero prices (likely bad data)
-    zero_mask = (df[ohlc_columns] == 0).any(axis=1)
-    if zero_mask.any():
-        issues.append(f"Removed {zero_mask.sum()} rows with zero prices")
-        df = df[~zero_mask]
-    
-    # Validate high/low logic
-    invalid_hl = df['high'] < df['low']
-    if invalid_hl.any():
-        issues.append(f"Removed {invalid_hl.sum()} rows where high < low")
-        df = df[~invalid_hl]
-    
-    # Validate OHLC relationships
-    invalid_oh = df['open'] > df['high']
-    invalid_ol = df['open'] < df['low']
-    invalid_ch = df['close'] > df['high']
-    invalid_cl = df['close'] < df['low']
-    
-    invalid_ohlc = invalid_oh | invalid_ol | invalid_ch | invalid_cl
-    if invalid_ohlc.any():
-        issues.append(f"Removed {invalid_ohlc.sum()} rows with invalid OHLC relationships")
-        df = df[~invalid_ohlc]
+    open_ = df['open'].to_numpy(dtype=np.float64, na_value=np.nan)
+    high = df['high'].to_numpy(dtype=np.float64, na_value=np.nan)
+    low = df['low'].to_numpy(dtype=np.float64, na_value=np.nan)
+    close = df['close'].to_numpy(dtype=np.float64, na_value=np.nan)
+    volume = df['volume'].to_numpy(dtype=np.float64, na_value=np.nan)
+    
+    # Comparisons with NaN are False, so every check below only flags real values
+    checks = [
+        ('with NaN prices',
+         np.isnan(open_) | np.isnan(high) | np.isnan(low) | np.isnan(close)),
+        ('with negative prices',
+         (open_ < 0) | (high < 0) | (low < 0) | (close < 0)),
+        ('with zero prices',  # likely bad data
+         (open_ == 0) | (high == 0) | (low == 0) | (close == 0)),
+        ('where high < low', high < low),
+        ('with invalid OHLC relationships',
+         (open_ > high) | (open_ < low) | (close > high) | (close < low))
+    ]
+    
+    keep = np.ones(original_len, dtype=bool)
+    for description, mask in checks:
+        removed = np.count_nonzero(mask & keep)
+        if removed:
+            issues.append(f"Removed {removed} rows {description}")
+            keep &= ~mask
     
     # Check for extreme price changes (possible data errors)
-    if len(df) > 1:
-        price_change = df['close'].pct_change().abs()
-        extreme_changes = price_change > 0.5  # 50% change
-        if extreme_changes.any():
-            extreme_count = extreme_changes.sum()
-            if extreme_count > len(df) * 0.01:  # More than 1% of data
-                issues.append(f"Warning: {extreme_count} rows with >50% price changes")
+    valid_close = close[keep]
+    if len(valid_close) > 1:
+        extreme_count = np.count_nonzero(
+            np.abs(valid_close[1:] / valid_close[:-1] - 1) > 0.5  # 50% change
+        )
+        if extreme_count > len(valid_close) * 0.01:  # More than 1% of data
+            issues.append(f"Warning: {extreme_count} rows with >50% price changes")
     
     # Validate volume (allow zero but not negative)
-    if 'volume' in df.columns:
-        negative_volume = df['volume'] < 0
-        if negative_volume.any():
-            issues.append(f"Removed {negative_volume.sum()} rows with negative volume")
-            df = df[~negative_volume]
+    negative_volume = np.count_nonzero((volume < 0) & keep)
+    if negative_volume:
+        issues.append(f"Removed {negative_volume} rows with negative volume")
+        keep &= ~(volume < 0)
+    
+    if not keep.all():
+        df = df[keep]
     
     # Log issues if any
     if issues:
@@ -604,14 +630,14 @@ def resample_ohlcv(df: pd.DataFrame, target_timeframe: str,
     
     # Convert to pandas frequency string
     freq_mapping = {
-        'second': 'S',
+        'second': 's',
         'minute': 'min',
-        'hour': 'H',
+        'hour': 'h',
         'day': 'D',
         'week': 'W',
-        'month': 'M',
-        'quarter': 'Q',
-        'year': 'Y'
+        'month': 'ME',
+        'quarter': 'QE',
+        'year': 'YE'
     }
     
     if timespan not in freq_mapping:
@@ -630,8 +656,8 @@ def resample_ohlcv(df: pd.DataFrame, target_timeframe: str,
     
     # Add vwap if present (volume-weighted calculation)
     if 'vwap' in df.columns and 'volume' in df.columns:
-        # Calculate dollar volume for proper VWAP resampling
-        df['dollar_volume'] = df['vwap'] * df['volume']
+        # Calculate dollar volume for proper VWAP resampling (without touching the caller's frame)
+        df = df.assign(dollar_volume=df['vwap'] * df['volume'])
         agg_rules['dollar_volume'] = 'sum'
     
     # Add transactions if present
@@ -654,6 +680,37 @@ def resample_ohlcv(df: pd.DataFrame, target_timeframe: str,
     return resampled
 
 
+def calculate_atr(df: pd.DataFrame, period: int = 14, method: str = 'sma') -> pd.Series:
+    """
+    [FUNCTION SUMMARY]
+    Purpose: Calculate Average True Range for each bar
+    Parameters:
+        - df (DataFrame): OHLC data in chronological order
+        - period (int): ATR period
+        - method (str): 'sma' (rolling mean), 'ema' (span=period) or
+                        'wilder' (alpha=1/period)
+    Returns: Series - ATR per bar (NaN until enough bars for 'sma')
+    Example: atr = calculate_atr(five_min_df, 14).iloc[-1]
+    """
+    prev_close = df['close'].shift(1)
+    true_range = pd.concat([
+        df['high'] - df['low'],
+        (df['high'] - prev_close).abs(),
+        (df['low'] - prev_close).abs()
+    ], axis=1).max(axis=1)
+    
+    if method == 'sma':
+        atr = true_range.rolling(window=period).mean()
+    elif method == 'ema':
+        atr = true_range.ewm(span=period, adjust=False).mean()
+    elif method == 'wilder':
+        atr = true_range.ewm(alpha=1 / period, adjust=False).mean()
+    else:
+        raise PolygonDataError(f"Unknown ATR method: {method}")
+        
+    return atr.rename('atr')
+
+
 def dataframe_to_dict(df: pd.DataFrame, orient: str = 'records') -> Union[List[Dict], Dict]:
     """
     [FUNCTION SUMMARY]
@@ -756,6 +813,7 @@ __all__ = [
     'normalize_ohlcv_data',
     'validate_ohlcv_data',
     'resample_ohlcv',
+    'calculate_atr',
     'dataframe_to_dict',
     'estimate_data_size'
 ]
\ No newline at end of file
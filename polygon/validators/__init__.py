@@ -6,6 +6,7 @@ Provides comprehensive data quality checks and anomaly detection.
 
 # Import all public functions from submodules
 from .data_quality import DataQualityReport, generate_validation_summary
+from .kernel import OHLCVScan, scan_ohlcv, session_codes
 from .symbol import validate_symbol_detailed
 from .ohlcv import validate_ohlcv_integrity, validate_data_continuity
 from .gaps import detect_gaps
@@ -16,6 +17,7 @@ from .market_hours import validate_market_hours_data
 __all__ = [
     # Core classes
     'DataQualityReport',
+    'OHLCVScan',
     
     # Validation functions
     'validate_symbol_detailed',
@@ -25,5 +27,7 @@ __all__ = [
     'validate_data_continuity',
     'validate_volume_profile',
     'validate_market_hours_data',
-    'generate_validation_summary'
+    'generate_validation_summary',
+    'scan_ohlcv',
+    'session_codes'
 ]
\ No newline at end of file
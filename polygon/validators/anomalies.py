@@ -6,10 +6,36 @@ Identifies outliers, extreme changes, and volume irregularities.
 
 import numpy as np
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, List, Optional, Any
 
 from ..config import get_config, POLYGON_TIMEZONE
 from ..exceptions import PolygonDataError
+from .kernel import OHLCVScan, scan_ohlcv
+
+
+def extreme_change_records(df: pd.DataFrame, scan: OHLCVScan,
+                           limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    [FUNCTION SUMMARY]
+    Purpose: Build extreme close-to-close change records from a scan
+    Parameters:
+        - df (DataFrame): Scanned OHLCV data
+        - scan (OHLCVScan): Result of scan_ohlcv(df)
+        - limit (int, optional): Maximum number of records
+    Returns: list - Dicts with timestamp, pct_change, close and prev_close
+    """
+    rows = scan.rows('extreme_change')[:limit]
+    close = df['close'].to_numpy()
+    pct_change = np.abs(scan.stats['pct_change'][rows]) * 100
+    return [
+        {
+            'timestamp': df.index[row],
+            'pct_change': pct_change[i],
+            'close': close[row],
+            'prev_close': close[row - 1]
+        }
+        for i, row in enumerate(rows)
+    ]
 
 
 def detect_price_anomalies(df: pd.DataFrame, 
@@ -24,6 +50,7 @@ def detect_price_anomalies(df: pd.DataFrame,
         - pct_change_threshold (float): Percentage change threshold (0.2 = 20%)
     Returns: dict - Detected anomalies and statistics
     Example: anomalies = detect_price_anomalies(df, zscore_threshold=3.0)
+    Notes: Z-scores use whole-frame mean/std, computed in one scan_ohlcv() pass
     """
     anomalies = {
         'extreme_changes': [],
@@ -35,81 +62,50 @@ def detect_price_anomalies(df: pd.DataFrame,
     if df.empty or len(df) < 10:  # Need minimum data for statistics
         return anomalies
     
+    scan = scan_ohlcv(df, checks='all', intraday=False, window=None,
+                      pct_change_threshold=pct_change_threshold,
+                      zscore_threshold=zscore_threshold)
+    timestamps = df.index
+    close = df['close'].to_numpy(dtype=np.float64)
+    
     # 1. Detect extreme price changes
-    close_pct_change = df['close'].pct_change(fill_method=None).abs()
-    extreme_mask = close_pct_change > pct_change_threshold
-    
-    if extreme_mask.any():
-        extreme_indices = df.index[extreme_mask].tolist()
-        for idx in extreme_indices:
-            loc = df.index.get_loc(idx)
-            if loc > 0:
-                anomalies['extreme_changes'].append({
-                    'timestamp': idx,
-                    'pct_change': close_pct_change.iloc[loc] * 100,
-                    'close': df['close'].iloc[loc],
-                    'prev_close': df['close'].iloc[loc - 1]
-                })
+    anomalies['extreme_changes'] = extreme_change_records(df, scan)
     
     # 2. Statistical outliers using z-score
-    close_mean = df['close'].mean()
-    close_std = df['close'].std()
-    
-    if close_std > 0:
-        z_scores = np.abs((df['close'] - close_mean) / close_std)
-        outlier_mask = z_scores > zscore_threshold
-        
-        if outlier_mask.any():
-            outlier_indices = df.index[outlier_mask].tolist()
-            for idx in outlier_indices:
-                loc = df.index.get_loc(idx)
-                anomalies['statistical_outliers'].append({
-                    'timestamp': idx,
-                    'close': df['close'].iloc[loc],
-                    'z_score': z_scores.iloc[loc],
-                    'deviation_from_mean': df['close'].iloc[loc] - close_mean
-                })
-    
-    # 3. Volume spikes
-    if 'volume' in df.columns:
-        volume_mean = df['volume'].mean()
-        volume_std = df['volume'].std()
-        
-        if volume_std > 0 and volume_mean > 0:
-            # Volume spikes: more than 3 standard deviations above mean
-            volume_z_scores = (df['volume'] - volume_mean) / volume_std
-            volume_spike_mask = volume_z_scores > 3
-            
-            if volume_spike_mask.any():
-                spike_indices = df.index[volume_spike_mask].tolist()
-                for idx in spike_indices:
-                    loc = df.index.get_loc(idx)
-                    anomalies['volume_spikes'].append({
-                        'timestamp': idx,
-                        'volume': df['volume'].iloc[loc],
-                        'volume_z_score': volume_z_scores.iloc[loc],
-                        'volume_vs_avg': df['volume'].iloc[loc] / volume_mean
-                    })
+    close_mean = scan.stats['close_mean']
+    close_z = np.abs(scan.stats['close_z'])
+    for row in scan.rows('price_outlier'):
+        anomalies['statistical_outliers'].append({
+            'timestamp': timestamps[row],
+            'close': close[row],
+            'z_score': close_z[row],
+            'deviation_from_mean': close[row] - close_mean
+        })
+    
+    # 3. Volume spikes: more than 3 standard deviations above mean
+    if 'volume' in df.columns and scan.stats['volume_mean'] > 0:
+        volume = df['volume'].to_numpy()
+        volume_mean = scan.stats['volume_mean']
+        volume_z = scan.stats['volume_z']
+        for row in scan.rows('volume_spike'):
+            anomalies['volume_spikes'].append({
+                'timestamp': timestamps[row],
+                'volume': volume[row],
+                'volume_z_score': volume_z[row],
+                'volume_vs_avg': volume[row] / volume_mean
+            })
     
     # 4. Abnormal spreads (high-low)
-    df['spread_pct'] = ((df['high'] - df['low']) / df['close']) * 100
-    spread_mean = df['spread_pct'].mean()
-    spread_std = df['spread_pct'].std()
-    
-    if spread_std > 0:
-        spread_z_scores = (df['spread_pct'] - spread_mean) / spread_std
-        spread_anomaly_mask = spread_z_scores > 3
-        
-        if spread_anomaly_mask.any():
-            spread_indices = df.index[spread_anomaly_mask].tolist()
-            for idx in spread_indices:
-                loc = df.index.get_loc(idx)
-                anomalies['spread_anomalies'].append({
-                    'timestamp': idx,
-                    'spread_pct': df['spread_pct'].iloc[loc],
-                    'high': df['high'].iloc[loc],
-                    'low': df['low'].iloc[loc]
-                })
+    spread_pct = scan.stats['spread_pct']
+    high = df['high'].to_numpy()
+    low = df['low'].to_numpy()
+    for row in scan.rows('spread_anomaly'):
+        anomalies['spread_anomalies'].append({
+            'timestamp': timestamps[row],
+            'spread_pct': spread_pct[row],
+            'high': high[row],
+            'low': low[row]
+        })
     
     # Add summary statistics
     summary = {
@@ -138,26 +134,32 @@ def validate_volume_profile(df: pd.DataFrame) -> Dict[str, Any]:
     if 'volume' not in df.columns or df.empty:
         return {'error': 'No volume data available'}
     
-    volume_data = df['volume'].copy()
+    volume_data = df['volume']
+    volume = volume_data.to_numpy(dtype=np.float64, na_value=np.nan)
+    zero_volume_count = int(np.count_nonzero(volume == 0))
+    
+    # Median and distribution percentiles in one pass
+    percentiles = [10, 25, 50, 75, 90, 95, 99]
+    valid = volume[~np.isnan(volume)]
+    if len(valid):
+        quantiles = dict(zip(percentiles, np.percentile(valid, percentiles)))
+    else:
+        quantiles = dict.fromkeys(percentiles, np.nan)
     
     # Basic statistics
     profile = {
-        'mean_volume': volume_data.mean(),
-        'median_volume': volume_data.median(),
-        'std_volume': volume_data.std(),
-        'min_volume': volume_data.min(),
-        'max_volume': volume_data.max(),
-        'zero_volume_count': (volume_data == 0).sum(),
-        'zero_volume_pct': ((volume_data == 0).sum() / len(volume_data)) * 100
+        'mean_volume': valid.mean() if len(valid) else np.nan,
+        'median_volume': quantiles[50],
+        'std_volume': valid.std(ddof=1) if len(valid) > 1 else np.nan,
+        'min_volume': valid.min() if len(valid) else np.nan,
+        'max_volume': valid.max() if len(valid) else np.nan,
+        'zero_volume_count': zero_volume_count,
+        'zero_volume_pct': (zero_volume_count / len(volume)) * 100
     }
     
     # Volume distribution analysis
     if len(volume_data) > 100:
-        # Calculate percentiles
-        percentiles = [10, 25, 50, 75, 90, 95, 99]
-        profile['percentiles'] = {
-            f'p{p}': volume_data.quantile(p/100) for p in percentiles
-        }
+        profile['percentiles'] = {f'p{p}': quantiles[p] for p in percentiles}
         
         # Detect unusual distribution
         # Check if volume is heavily skewed
@@ -196,11 +198,11 @@ def validate_volume_profile(df: pd.DataFrame) -> Dict[str, Any]:
     
     # Anomaly detection
     if profile['std_volume'] > 0:
-        z_scores = np.abs((volume_data - profile['mean_volume']) / profile['std_volume'])
-        anomaly_count = (z_scores > 3).sum()
+        z_scores = np.abs((volume - profile['mean_volume']) / profile['std_volume'])
+        anomaly_count = int(np.count_nonzero(z_scores > 3))
         profile['volume_anomalies'] = {
             'count': anomaly_count,
-            'percentage': (anomaly_count / len(volume_data)) * 100
+            'percentage': (anomaly_count / len(volume)) * 100
         }
     
     return profile
\ No newline at end of file
@@ -4,13 +4,21 @@ Gap detection and analysis for time series data in the Polygon module.
 Identifies missing data points and market closure gaps.
 """
 
+import numpy as np
 import pandas as pd
-from datetime import datetime, time as dt_time
 from typing import Dict, Any
 
-from ..config import get_config
+from ..calendar import session_id, session_bounds, holidays_between
 from ..utils import parse_timeframe
 
+# Bar length per intraday timespan, in nanoseconds
+_TIMESPAN_NS = {
+    'second': 1_000_000_000,
+    'minute': 60_000_000_000,
+    'hour': 3_600_000_000_000,
+    'day': 86_400_000_000_000
+}
+
 
 def detect_gaps(df: pd.DataFrame, timeframe: str, 
                 market_hours_only: bool = True) -> Dict[str, Any]:
@@ -23,6 +31,12 @@ def detect_gaps(df: pd.DataFrame, timeframe: str,
         - market_hours_only (bool): Only check during market hours
     Returns: dict - Gap analysis results
     Example: gaps = detect_gaps(df, '5min')
+    Notes: Works on the int64 index in numpy. With market_hours_only, gaps
+           inside one (extended) trading session count every missing bar. A
+           gap that crosses sessions only counts the bars it misses inside
+           regular sessions, so the close-to-open span is a closure but a
+           session that stops early is still reported. Daily gaps count
+           trading days only
     """
     if df.empty or len(df) < 2:
         return {'gaps': [], 'gap_count': 0, 'total_missing_bars': 0}
@@ -30,92 +44,116 @@ def detect_gaps(df: pd.DataFrame, timeframe: str,
     # Parse timeframe
     multiplier, timespan = parse_timeframe(timeframe)
     
-    # Get expected frequency
-    freq_mapping = {
-        'second': f'{multiplier}S',
-        'minute': f'{multiplier}min',
-        'hour': f'{multiplier}H',
-        'day': f'{multiplier}D'
-    }
-    
-    if timespan not in freq_mapping:
+    if timespan not in _TIMESPAN_NS:
         return {'error': f"Gap detection not supported for timespan: {timespan}"}
     
-    freq = freq_mapping[timespan]
-    
-    # Sort index
-    df_sorted = df.sort_index()
+    freq_ns = multiplier * _TIMESPAN_NS[timespan]
     
-    gaps = []
-    config = get_config()
-    
-    # Check each consecutive pair
-    for i in range(len(df_sorted) - 1):
-        current_time = df_sorted.index[i]
-        next_time = df_sorted.index[i + 1]
-        
-        # Calculate expected next time
-        expected_next = current_time + pd.Timedelta(freq)
+    # Naive UTC nanoseconds, sorted
+    index = pd.DatetimeIndex(df.index)
+    tz = index.tz
+    if tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    times = index.as_unit('ns').asi8
+    if not (times[1:] >= times[:-1]).all():
+        times = np.sort(times)
         
-        # If there's a gap
-        if next_time > expected_next:
-            # For intraday data, check if gap spans non-market hours
-            if market_hours_only and timespan in ['second', 'minute', 'hour']:
-                # Check if gap is just market closure
-                if is_market_closure_gap(current_time, next_time, config):
-                    continue
-            
-            # Calculate gap size
-            gap_duration = next_time - current_time
-            expected_duration = pd.Timedelta(freq)
-            missing_bars = int(gap_duration / expected_duration) - 1
+    deltas = np.diff(times)
+    positions = np.flatnonzero(deltas > freq_ns)
+    
+    if timespan == 'day' and market_hours_only:
+        # Weekends and exchange holidays are not missing days
+        days = times.astype('datetime64[ns]').astype('datetime64[D]')
+        holidays = holidays_between(days[0].item(), days[-1].item())
+        sessions_between = np.busday_count(
+            days[positions] + 1, days[positions + 1], holidays=holidays
+        )
+        missing = sessions_between // multiplier
+    else:
+        missing = deltas[positions] // freq_ns - 1
+        if market_hours_only and timespan != 'day':
+            # Gaps between sessions (overnight, weekends, holidays) are closures
+            start_session = session_id(times[positions])
+            end_session = session_id(times[positions + 1])
+            in_session = (start_session >= 0) & (start_session == end_session)
+            if not in_session.all():
+                missing = np.where(
+                    in_session, missing,
+                    _session_bars_between(times[positions], times[positions + 1], freq_ns)
+                )
             
-            if missing_bars > 0:
-                gaps.append({
-                    'start': current_time,
-                    'end': next_time,
-                    'duration': str(gap_duration),
-                    'missing_bars': missing_bars
-                })
+    keep = missing > 0
+    positions, missing = positions[keep], missing[keep]
+    
+    gaps = []
+    if len(positions):
+        starts = _to_index(times[positions], tz)
+        ends = _to_index(times[positions + 1], tz)
+        durations = pd.TimedeltaIndex(deltas[positions])
+        gaps = [
+            {
+                'start': start,
+                'end': end,
+                'duration': str(duration),
+                'missing_bars': int(count)
+            }
+            for start, end, duration, count in zip(starts, ends, durations, missing)
+        ]
     
     # Summary statistics
-    total_missing = sum(gap['missing_bars'] for gap in gaps)
+    total_missing = int(missing.sum())
     
     return {
         'gaps': gaps,
         'gap_count': len(gaps),
         'total_missing_bars': total_missing,
         'data_completeness_pct': (len(df) / (len(df) + total_missing)) * 100 if total_missing > 0 else 100,
-        'largest_gap': max(gaps, key=lambda x: x['missing_bars']) if gaps else None
+        'largest_gap': gaps[int(np.argmax(missing))] if gaps else None
     }
 
 
-def is_market_closure_gap(time1: datetime, time2: datetime, config) -> bool:
+def _session_bars_between(starts: np.ndarray, ends: np.ndarray,
+                          freq_ns: int) -> np.ndarray:
     """
     [FUNCTION SUMMARY]
-    Purpose: Check if a time gap is due to market closure
+    Purpose: Count bars expected strictly between gap ends during regular sessions
     Parameters:
-        - time1 (datetime): Earlier time
-        - time2 (datetime): Later time
-        - config: Configuration object
-    Returns: bool - True if gap is expected market closure
+        - starts (ndarray): Naive-UTC int64 ns of the bar before each gap
+        - ends (ndarray): Naive-UTC int64 ns of the bar after each gap
+        - freq_ns (int): Bar length in nanoseconds
+    Returns: ndarray - Missing bars per gap: the rest of the first session,
+             the start of the last one and every whole session in between
     """
-    # If gap spans different days
-    if time1.date() != time2.date():
-        # Check if it's weekend
-        if time1.weekday() == 4 and time2.weekday() == 0:  # Friday to Monday
-            return True
-        # Check if next day is weekend
-        if time1.weekday() >= 5 or time2.weekday() >= 5:
-            return True
+    first_day = (starts.min().astype('datetime64[ns]').astype('datetime64[D]') - 1).item()
+    last_day = (ends.max().astype('datetime64[ns]').astype('datetime64[D]') + 1).item()
+    _, opens, closes = session_bounds(first_day, last_day, extended=False)
+    if not len(opens):
+        return np.zeros(len(starts), dtype=np.int64)
+    opens, closes = opens.astype(np.int64), closes.astype(np.int64)
+    
+    # Bars in [max(open, lo), min(close, hi)) of session i, rounding partial bars up
+    def overlap(i, lo, hi):
+        span = np.minimum(closes[i], hi) - np.maximum(opens[i], lo)
+        return np.maximum(-(-span // freq_ns), 0)
+        
+    full = -(-(closes - opens) // freq_ns)
+    cumulative = np.concatenate([[0], np.cumsum(full)])
+    
+    # First session still open after the gap starts, last one opening before it ends
+    first = np.searchsorted(closes, starts, side='right')
+    last = np.searchsorted(opens, ends, side='left') - 1
+    valid = first <= last
+    first_c = np.clip(first, 0, len(opens) - 1)
+    last_c = np.clip(last, 0, len(opens) - 1)
     
-    # Check if gap is around market close/open times
-    time1_time = time1.time()
-    time2_time = time2.time()
+    lo, hi = starts + freq_ns, ends
+    head = overlap(first_c, lo, hi)
+    tail = np.where(last_c > first_c, overlap(last_c, lo, hi), 0)
+    middle = np.maximum(cumulative[last_c] - cumulative[np.minimum(first_c + 1, last_c)], 0)
+    return np.where(valid, head + tail + middle, 0)
     
-    # If first time is after market close and second is pre-market or regular hours
-    if (time1_time >= config.market_hours['regular_end'] and 
-        time2_time >= config.market_hours['pre_market_start']):
-        return True
     
-    return False
\ No newline at end of file
+def _to_index(values: np.ndarray, tz) -> pd.DatetimeIndex:
+    """Naive-UTC nanoseconds back to timestamps in the data's timezone"""
+    index = pd.DatetimeIndex(values.astype('datetime64[ns]'))
+    return index.tz_localize('UTC').tz_convert(tz) if tz is not None else index
@@ -0,0 +1,286 @@
+# polygon/validators/kernel.py - Fused OHLCV validation kernel
+"""
+Single-pass vectorized checks over an OHLCV frame for the Polygon module.
+Every check sets one bit in a per-row flag array, so the validators build
+their reports from counts and row positions instead of re-scanning the data.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Any
+
+from ..calendar import EXCHANGE_TIMEZONE, holidays_between, session_mask
+
+PRICE_COLUMNS = ['open', 'high', 'low', 'close']
+REQUIRED_COLUMNS = PRICE_COLUMNS + ['volume']
+
+# Check names in bit order; everything before 'price_outlier' is a cheap row check
+CHECKS = (
+    'nan_open', 'nan_high', 'nan_low', 'nan_close', 'nan_volume',
+    'negative_open', 'negative_high', 'negative_low', 'negative_close',
+    'zero_open', 'zero_high', 'zero_low', 'zero_close',
+    'high_below_low', 'open_above_high', 'open_below_low',
+    'close_above_high', 'close_below_low',
+    'duplicate_timestamp', 'negative_volume', 'zero_volume', 'extreme_change',
+    'price_outlier', 'volume_spike', 'spread_anomaly', 'zero_volume_run',
+    'non_trading_day', 'out_of_session'
+)
+CHECK_BITS = {name: np.uint32(1 << bit) for bit, name in enumerate(CHECKS)}
+CHEAP_CHECKS = frozenset(CHECKS[:CHECKS.index('price_outlier')])
+
+# Compact issues array: one entry per flagged row
+ISSUE_DTYPE = np.dtype([('row', np.int64), ('flags', np.uint32)])
+
+# Session codes returned by session_codes()
+SESSION_NON_TRADING_DAY = -1
+SESSION_OVERNIGHT = 0
+SESSION_PRE_MARKET = 1
+SESSION_REGULAR = 2
+SESSION_AFTER_HOURS = 3
+
+_DAY_NS = 86_400_000_000_000
+
+
+class OHLCVScan:
+    """
+    [CLASS SUMMARY]
+    Purpose: Result of one fused validation pass over an OHLCV frame
+    Attributes:
+        - flags: uint32 per row, one bit per failed check (see CHECKS)
+        - issues: Structured (row, flags) array of flagged rows only
+        - counts: Rows failing each check that ran
+        - stats: Aggregates and per-row arrays computed along the way
+        - sessions: int8 session code per row when session checks ran, else None
+        - mode: 'cheap' or 'all'
+    Usage:
+        scan = scan_ohlcv(df, checks='cheap')
+        bad_rows = scan.rows('high_below_low')
+    """
+    
+    def __init__(self, flags: np.ndarray, counts: Dict[str, int],
+                 stats: Dict[str, Any], sessions: Optional[np.ndarray], mode: str):
+        self.flags = flags
+        self.counts = counts
+        self.stats = stats
+        self.sessions = sessions
+        self.mode = mode
+        
+        flagged = np.flatnonzero(flags)
+        self.issues = np.empty(len(flagged), dtype=ISSUE_DTYPE)
+        self.issues['row'] = flagged
+        self.issues['flags'] = flags[flagged]
+    
+    def count(self, check: str) -> int:
+        """Rows failing a check (0 if it did not run)"""
+        return self.counts.get(check, 0)
+    
+    def mask(self, check: str) -> np.ndarray:
+        """Boolean row mask for a check"""
+        return (self.flags & CHECK_BITS[check]) != 0
+    
+    def rows(self, check: str) -> np.ndarray:
+        """Row positions failing a check"""
+        return np.flatnonzero(self.mask(check))
+    
+    @property
+    def is_clean(self) -> bool:
+        """True when no row failed any check"""
+        return len(self.issues) == 0
+
+
+def scan_ohlcv(df: pd.DataFrame, checks: str = 'all',
+               intraday: Optional[bool] = None,
+               pct_change_threshold: float = 0.2,
+               zscore_threshold: float = 3.0,
+               spike_threshold: float = 3.0,
+               window: Optional[int] = 20,
+               zero_volume_run: int = 5) -> OHLCVScan:
+    """
+    [FUNCTION SUMMARY]
+    Purpose: Run every OHLCV check in one vectorized pass
+    Parameters:
+        - df (DataFrame): OHLCV data with datetime index (missing columns count as NaN)
+        - checks (str): 'cheap' for row-local checks only (NaN, sign, OHLC
+          ordering, duplicates, volume, extreme changes) or 'all' to add
+          rolling-stat spikes, zero-volume runs and session checks
+        - intraday (bool, optional): Run session checks; inferred from the
+          index (any bar off UTC midnight) when None
+        - pct_change_threshold (float): Close-to-close change flagged as extreme (0.2 = 20%)
+        - zscore_threshold (float): |z| of close flagged as a price outlier
+        - spike_threshold (float): z of volume / high-low spread flagged as a spike
+        - window (int, optional): Trailing bars for rolling stats; None uses
+          whole-frame mean/std
+        - zero_volume_run (int): Consecutive zero-volume bars flagged as a run
+    Returns: OHLCVScan - Flags, compact issues array, counts and stats
+    Example: scan = scan_ohlcv(df, checks='cheap'); scan.count('high_below_low')
+    """
+    if checks not in ('cheap', 'all'):
+        raise ValueError(f"checks must be 'cheap' or 'all', got {checks!r}")
+    
+    n = len(df)
+    flags = np.zeros(n, dtype=np.uint32)
+    counts: Dict[str, int] = {}
+    stats: Dict[str, Any] = {}
+    
+    def mark(check: str, mask: np.ndarray):
+        count = int(np.count_nonzero(mask))
+        counts[check] = count
+        if count:
+            np.bitwise_or(flags, CHECK_BITS[check], out=flags, where=mask)
+    
+    columns = {
+        column: df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        if column in df.columns else np.full(n, np.nan)
+        for column in REQUIRED_COLUMNS
+    }
+    open_, high, low, close, volume = (columns[column] for column in REQUIRED_COLUMNS)
+    
+    # Row-local checks (comparisons with NaN are False)
+    for column in REQUIRED_COLUMNS:
+        mark(f'nan_{column}', np.isnan(columns[column]))
+    for column in PRICE_COLUMNS:
+        mark(f'negative_{column}', columns[column] < 0)
+    for column in PRICE_COLUMNS:
+        mark(f'zero_{column}', columns[column] == 0)
+    
+    mark('high_below_low', high < low)
+    mark('open_above_high', open_ > high)
+    mark('open_below_low', open_ < low)
+    mark('close_above_high', close > high)
+    mark('close_below_low', close < low)
+    
+    times = pd.DatetimeIndex(df.index).as_unit('ns').asi8 if n else np.zeros(0, dtype=np.int64)
+    if n > 1 and (times[1:] >= times[:-1]).all():
+        mark('duplicate_timestamp', np.concatenate(([False], times[1:] == times[:-1])))
+    else:
+        mark('duplicate_timestamp', df.index.duplicated())
+    
+    mark('negative_volume', volume < 0)
+    mark('zero_volume', volume == 0)
+    
+    # Close-to-close change (first bar has none)
+    pct_change = np.full(n, np.nan)
+    if n > 1:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct_change[1:] = close[1:] / close[:-1] - 1
+    mark('extreme_change', np.abs(pct_change) > pct_change_threshold)
+    
+    stats['pct_change'] = pct_change
+    stats['volume_mean'] = _nan_mean(volume)
+    stats['volume_std'] = _nan_std(volume)
+    stats['close_mean'] = _nan_mean(close)
+    stats['close_std'] = _nan_std(close)
+    
+    sessions = None
+    if checks == 'all':
+        with np.errstate(divide='ignore', invalid='ignore'):
+            spread_pct = (high - low) / close * 100
+        
+        close_z = _zscores(close, window)
+        volume_z = _zscores(volume, window)
+        spread_z = _zscores(spread_pct, window)
+        mark('price_outlier', np.abs(close_z) > zscore_threshold)
+        mark('volume_spike', volume_z > spike_threshold)
+        mark('spread_anomaly', spread_z > spike_threshold)
+        
+        runs, in_run = _runs(volume == 0, zero_volume_run)
+        mark('zero_volume_run', in_run)
+        
+        stats.update({
+            'spread_pct': spread_pct,
+            'close_z': close_z,
+            'volume_z': volume_z,
+            'spread_z': spread_z,
+            'zero_volume_runs': runs,
+            'window': window
+        })
+        
+        if intraday is None:
+            intraday = bool(n) and bool((times % _DAY_NS).any())
+        if intraday and n:
+            sessions = session_codes(df.index)
+            mark('non_trading_day', sessions == SESSION_NON_TRADING_DAY)
+            mark('out_of_session', sessions == SESSION_OVERNIGHT)
+    
+    return OHLCVScan(flags, counts, stats, sessions, checks)
+
+
+def session_codes(index) -> np.ndarray:
+    """
+    [FUNCTION SUMMARY]
+    Purpose: Classify every timestamp by exchange session in one pass
+    Parameters:
+        - index: DatetimeIndex or datetime array (naive values are UTC)
+    Returns: ndarray - int8 codes: -1 non-trading day, 0 overnight,
+             1 pre-market, 2 regular, 3 after-hours
+    """
+    index = pd.DatetimeIndex(index)
+    if index.tz is None:
+        index = index.tz_localize('UTC')
+    if not len(index):
+        return np.zeros(0, dtype=np.int8)
+    
+    codes = np.full(len(index), SESSION_OVERNIGHT, dtype=np.int8)
+    codes[session_mask(index, 'pre')] = SESSION_PRE_MARKET
+    codes[session_mask(index, 'regular')] = SESSION_REGULAR
+    codes[session_mask(index, 'post')] = SESSION_AFTER_HOURS
+    
+    # Weekends and holidays by exchange-local date
+    local_days = index.tz_convert(EXCHANGE_TIMEZONE).tz_localize(None).values.astype('datetime64[D]')
+    valid = ~np.isnat(local_days)
+    if valid.any():
+        holidays = holidays_between(local_days[valid].min().item(), local_days[valid].max().item())
+        trading = np.zeros(len(index), dtype=bool)
+        trading[valid] = np.is_busday(local_days[valid], holidays=holidays)
+        codes[~trading] = SESSION_NON_TRADING_DAY
+    return codes
+
+
+def _nan_mean(values: np.ndarray) -> float:
+    """Mean ignoring NaN (NaN when nothing is left)"""
+    valid = values[~np.isnan(values)]
+    return float(valid.mean()) if len(valid) else float('nan')
+
+
+def _nan_std(values: np.ndarray) -> float:
+    """Sample standard deviation ignoring NaN/inf, like pandas std()"""
+    valid = values[np.isfinite(values)]
+    return float(valid.std(ddof=1)) if len(valid) > 1 else float('nan')
+
+
+def _zscores(values: np.ndarray, window: Optional[int]) -> np.ndarray:
+    """z-scores against trailing-window stats (previous bars only) or the whole series"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if window is None:
+            std = _nan_std(values)
+            if not std > 0:
+                return np.full(len(values), np.nan)
+            return (values - _nan_mean(values)) / std
+        
+        rolling = pd.Series(values).rolling(window, min_periods=window)
+        mean = rolling.mean().shift(1).to_numpy()
+        std = rolling.std().shift(1).to_numpy(copy=True)
+        std[std <= 0] = np.nan
+        return (values - mean) / std
+
+
+def _runs(mask: np.ndarray, min_length: int):
+    """Count runs of True at least min_length long and mark their rows"""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    long_runs = (ends - starts) >= min_length
+    
+    marker = np.zeros(len(mask) + 1, dtype=np.int64)
+    marker[starts[long_runs]] += 1
+    marker[ends[long_runs]] -= 1
+    return int(long_runs.sum()), np.cumsum(marker[:-1]) > 0
+
+
+__all__ = [
+    'CHECKS',
+    'CHEAP_CHECKS',
+    'OHLCVScan',
+    'scan_ohlcv',
+    'session_codes'
+]
@@ -4,12 +4,15 @@ Market hours validation for intraday data in the Polygon module.
 Validates that data falls within expected trading sessions.
 """
 
+import numpy as np
 import pandas as pd
-from datetime import time as dt_time
 from typing import Dict, Any
 
-from ..config import get_config
 from .data_quality import DataQualityReport
+from .kernel import (
+    SESSION_NON_TRADING_DAY, SESSION_OVERNIGHT, SESSION_PRE_MARKET,
+    SESSION_REGULAR, SESSION_AFTER_HOURS, session_codes
+)
 
 
 def validate_market_hours_data(df: pd.DataFrame, strict: bool = True) -> DataQualityReport:
@@ -21,41 +24,23 @@ def validate_market_hours_data(df: pd.DataFrame, strict: bool = True) -> DataQua
         - strict (bool): If True, flag extended hours data as issues
     Returns: DataQualityReport - Market hours validation report
     Example: report = validate_market_hours_data(df, strict=False)
+    Notes: weekend_bars also counts exchange holidays; a bar starting at the
+           close belongs to after-hours
     """
     report = DataQualityReport()
-    config = get_config()
     
     if df.empty:
         report.add_issue("No data to validate")
         return report
     
-    # Count bars by market session
-    pre_market_count = 0
-    regular_hours_count = 0
-    after_hours_count = 0
-    weekend_count = 0
-    overnight_count = 0
-    
-    for timestamp in df.index:
-        # Check weekend
-        if timestamp.weekday() >= 5:
-            weekend_count += 1
-            continue
-        
-        # Get time component
-        time_only = timestamp.time()
-        
-        # Categorize by session
-        if time_only < config.market_hours['pre_market_start']:
-            overnight_count += 1
-        elif time_only < config.market_hours['regular_start']:
-            pre_market_count += 1
-        elif time_only <= config.market_hours['regular_end']:
-            regular_hours_count += 1
-        elif time_only <= config.market_hours['post_market_end']:
-            after_hours_count += 1
-        else:
-            overnight_count += 1
+    # Count bars by market session (exchange calendar, DST-aware)
+    codes = session_codes(df.index)
+    counts = np.bincount(codes.astype(np.intp) + 1, minlength=5)
+    weekend_count = int(counts[SESSION_NON_TRADING_DAY + 1])  # Weekends and holidays
+    overnight_count = int(counts[SESSION_OVERNIGHT + 1])
+    pre_market_count = int(counts[SESSION_PRE_MARKET + 1])
+    regular_hours_count = int(counts[SESSION_REGULAR + 1])
+    after_hours_count = int(counts[SESSION_AFTER_HOURS + 1])
     
     # Calculate percentages
     total_bars = len(df)
@@ -76,7 +61,7 @@ def validate_market_hours_data(df: pd.DataFrame, strict: bool = True) -> DataQua
     
     # Validation checks
     if weekend_count > 0:
-        issue_msg = f"Data contains {weekend_count} weekend bars"
+        issue_msg = f"Data contains {weekend_count} weekend/holiday bars"
         report.add_issue(issue_msg, critical=strict)
     
     if overnight_count > 0:
@@ -13,10 +13,12 @@ from ..config import get_config, POLYGON_TIMEZONE
 from ..exceptions import PolygonDataError
 from ..utils import parse_date, parse_timeframe, timestamp_to_datetime
 from .data_quality import DataQualityReport
+from .kernel import scan_ohlcv
 
 
 def validate_ohlcv_integrity(df: pd.DataFrame, symbol: Optional[str] = None,
-                           expected_timeframe: Optional[str] = None) -> DataQualityReport:
+                           expected_timeframe: Optional[str] = None,
+                           checks: str = 'cheap') -> DataQualityReport:
     """
     [FUNCTION SUMMARY]
     Purpose: Comprehensive OHLCV data integrity validation
@@ -24,8 +26,13 @@ def validate_ohlcv_integrity(df: pd.DataFrame, symbol: Optional[str] = None,
         - df (DataFrame): OHLCV data with datetime index
         - symbol (str, optional): Symbol for context
         - expected_timeframe (str, optional): Expected data timeframe
+        - checks (str): 'cheap' (default) for the original row checks, or
+          'all' to also report statistical and session checks
     Returns: DataQualityReport - Detailed validation report
     Example: report = validate_ohlcv_integrity(df, 'AAPL', '5min')
+    Notes: All checks come from one scan_ohlcv() pass. checks='all' adds
+           warnings for rolling-stat spikes, zero-volume runs and
+           out-of-session bars, plus a 'flagged_rows' metric
     """
     report = DataQualityReport()
     
@@ -45,16 +52,21 @@ def validate_ohlcv_integrity(df: pd.DataFrame, symbol: Optional[str] = None,
         report.add_issue(f"Missing required columns: {missing_cols}")
         return report
     
+    intraday = None
+    if expected_timeframe:
+        intraday = parse_timeframe(expected_timeframe)[1] in ('second', 'minute', 'hour')
+    scan = scan_ohlcv(df, checks=checks, intraday=intraday)
+    
     # 2. Check for NaN values only in required columns
-    nan_counts = df[required_cols].isna().sum()
-    if nan_counts.any():
-        report.add_issue(f"NaN values found: {nan_counts[nan_counts > 0].to_dict()}")
+    nan_counts = {col: scan.count(f'nan_{col}') for col in required_cols if scan.count(f'nan_{col}')}
+    if nan_counts:
+        report.add_issue(f"NaN values found: {nan_counts}")
     
     # 3. Check for negative or zero prices
     price_cols = ['open', 'high', 'low', 'close']
     for col in price_cols:
-        negative_count = (df[col] < 0).sum()
-        zero_count = (df[col] == 0).sum()
+        negative_count = scan.count(f'negative_{col}')
+        zero_count = scan.count(f'zero_{col}')
         
         if negative_count > 0:
             report.add_issue(f"Negative values in {col}: {negative_count} rows")
@@ -67,11 +79,11 @@ def validate_ohlcv_integrity(df: pd.DataFrame, symbol: Optional[str] = None,
     
     # 4. Validate OHLC relationships
     relationship_issues = {
-        'high < low': (df['high'] < df['low']).sum(),
-        'open > high': (df['open'] > df['high']).sum(),
-        'open < low': (df['open'] < df['low']).sum(),
-        'close > high': (df['close'] > df['high']).sum(),
-        'close < low': (df['close'] < df['low']).sum(),
+        'high < low': scan.count('high_below_low'),
+        'open > high': scan.count('open_above_high'),
+        'open < low': scan.count('open_below_low'),
+        'close > high': scan.count('close_above_high'),
+        'close < low': scan.count('close_below_low'),
     }
     
     for issue, count in relationship_issues.items():
@@ -79,40 +91,73 @@ def validate_ohlcv_integrity(df: pd.DataFrame, symbol: Optional[str] = None,
             report.add_issue(f"Invalid OHLC relationship ({issue}): {count} rows")
     
     # 5. Check for duplicate timestamps
-    duplicate_count = df.index.duplicated().sum()
+    duplicate_count = scan.count('duplicate_timestamp')
     if duplicate_count > 0:
         report.add_issue(f"Duplicate timestamps: {duplicate_count}")
     
     # 6. Volume validation
-    negative_volume = (df['volume'] < 0).sum()
+    negative_volume = scan.count('negative_volume')
     if negative_volume > 0:
         report.add_issue(f"Negative volume: {negative_volume} rows")
     
     # Zero volume check (warning only for some bars)
-    zero_volume = (df['volume'] == 0).sum()
+    zero_volume = scan.count('zero_volume')
     zero_volume_pct = (zero_volume / len(df)) * 100
     if zero_volume_pct > 50:
         report.add_issue(f"Excessive zero volume: {zero_volume} rows ({zero_volume_pct:.1f}%)")
     elif zero_volume > 0:
         report.add_issue(f"Zero volume bars: {zero_volume} rows ({zero_volume_pct:.1f}%)", critical=False)
     
-    # 7. Statistical anomaly detection (imported from anomalies module)
-    from .anomalies import detect_price_anomalies
-    anomalies = detect_price_anomalies(df)
-    if anomalies['extreme_changes']:
+    # 7. Extreme price changes (needs enough bars to be meaningful)
+    if len(df) >= 10 and scan.count('extreme_change'):
+        from .anomalies import extreme_change_records
         report.add_issue(
-            f"Extreme price changes detected: {len(anomalies['extreme_changes'])} instances",
+            f"Extreme price changes detected: {scan.count('extreme_change')} instances",
             critical=False
         )
-        report.add_metric('extreme_changes', anomalies['extreme_changes'][:5])  # First 5
+        report.add_metric('extreme_changes', extreme_change_records(df, scan, limit=5))  # First 5
+    
+    # 8. Statistical and session checks (full scan only)
+    if scan.mode == 'all':
+        window = scan.stats['window']
+        if scan.count('volume_spike'):
+            report.add_issue(
+                f"Volume spikes vs. trailing {window}-bar stats: {scan.count('volume_spike')} rows",
+                critical=False
+            )
+        if scan.count('spread_anomaly'):
+            report.add_issue(
+                f"Abnormal high-low spreads: {scan.count('spread_anomaly')} rows",
+                critical=False
+            )
+        if scan.count('zero_volume_run'):
+            report.add_issue(
+                f"Zero-volume runs: {scan.stats['zero_volume_runs']} runs "
+                f"({scan.count('zero_volume_run')} rows)",
+                critical=False
+            )
+        if scan.count('non_trading_day'):
+            report.add_issue(
+                f"Bars on non-trading days: {scan.count('non_trading_day')} rows",
+                critical=False
+            )
+        if scan.count('out_of_session'):
+            report.add_issue(
+                f"Bars outside trading sessions: {scan.count('out_of_session')} rows",
+                critical=False
+            )
     
-    # 8. Add quality metrics
-    report.add_metric('completeness', 100 - (nan_counts.sum() / (len(df) * len(required_cols)) * 100))
+    # 9. Add quality metrics
+    pct_change = scan.stats['pct_change']
+    pct_change = pct_change[~np.isnan(pct_change)]
+    report.add_metric('completeness', 100 - (sum(nan_counts.values()) / (len(df) * len(required_cols)) * 100))
     report.add_metric('zero_volume_pct', zero_volume_pct)
-    report.add_metric('avg_volume', df['volume'].mean())
-    report.add_metric('price_volatility', df['close'].pct_change(fill_method=None).std() * 100)
+    report.add_metric('avg_volume', scan.stats['volume_mean'])
+    report.add_metric('price_volatility', pct_change.std(ddof=1) * 100 if len(pct_change) > 1 else float('nan'))
+    if scan.mode == 'all':
+        report.add_metric('flagged_rows', len(scan.issues))
     
-    # 9. Suggestions
+    # 10. Suggestions
     if zero_volume_pct > 10:
         report.suggestions.append("Consider filtering out zero-volume bars for analysis")
     if report.metrics['price_volatility'] > 10:
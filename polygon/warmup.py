@@ -0,0 +1,436 @@
+# polygon/warmup.py - Bulk cache warmup for a watchlist
+"""
+Pre-open cache warmup for the Polygon module. Fills the parquet cache for a
+watchlist across several timeframe/lookback specs with concurrent chunk
+requests at bulk priority. Every chunk is saved and marked covered as soon as
+it lands, so an interrupted run resumes where it stopped and later
+interactive fetches are served from the cache.
+
+Usage:
+    python -m polygon.warmup AAPL SPY QQQ --spec 1day:60 --spec 5min:30
+    python -m polygon.warmup --watchlist watchlist.txt
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, time as dt_time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .config import get_config, POLYGON_TIMEZONE
+from .calendar import trading_days
+from .async_fetcher import AsyncDataFetcher
+from .rate_limiter import request_priority, PRIORITY_BULK
+from .utils import parse_date, parse_timeframe, validate_symbol
+from .exceptions import PolygonDataError, PolygonSymbolError
+
+
+@dataclass(frozen=True)
+class WarmupSpec:
+    """
+    [CLASS SUMMARY]
+    Purpose: One timeframe to warm and how far back
+    Attributes:
+        - timeframe: Bar timeframe (e.g. '5min')
+        - sessions: Trading sessions to cover, ending at the warmup end date
+    """
+    timeframe: str
+    sessions: int
+
+    @classmethod
+    def parse(cls, spec: Union[str, 'WarmupSpec']) -> 'WarmupSpec':
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Parse a 'timeframe:sessions' spec
+        Parameters:
+            - spec (str): e.g. '5min:30' ('5minx30', '5min*30' and '5min×30' also work)
+        Returns: WarmupSpec - Parsed spec
+        Raises: PolygonDataError for malformed specs or unknown timeframes
+        """
+        if isinstance(spec, WarmupSpec):
+            return spec
+
+        # Keep the timeframe's case: the cache directory is keyed on it as written
+        text = str(spec).strip()
+        for separator in ('×', '*', 'x', 'X'):
+            text = text.replace(separator, ':')
+        timeframe, _, sessions = text.rpartition(':')
+
+        if not timeframe or not sessions.isdigit() or int(sessions) < 1:
+            raise PolygonDataError(
+                f"Invalid warmup spec: {spec} (expected timeframe:sessions, e.g. 5min:30)",
+                field='spec',
+                value=spec
+            )
+
+        parse_timeframe(timeframe)
+        return cls(timeframe, int(sessions))
+
+    def date_range(self, end_day: date) -> Tuple[datetime, datetime]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Date range covering the last `sessions` trading days
+        Parameters:
+            - end_day (date): Last day of the range
+        Returns: tuple - (start, end) datetimes in UTC
+        """
+        days = trading_days(end_day - timedelta(days=self.sessions * 2 + 10), end_day)
+        first_day = days[-self.sessions].astype(object) if len(days) else end_day
+        return (
+            datetime.combine(first_day, dt_time.min, tzinfo=POLYGON_TIMEZONE),
+            datetime.combine(end_day, dt_time(23, 59, 59), tzinfo=POLYGON_TIMEZONE)
+        )
+
+    def __str__(self) -> str:
+        return f"{self.timeframe}:{self.sessions}"
+
+
+class CacheWarmer:
+    """
+    [CLASS SUMMARY]
+    Purpose: Fill the parquet cache for many symbols and timeframes at once
+    Responsibilities:
+        - Plan only the chunks the coverage index reports missing
+        - Fetch chunks concurrently at bulk priority through the shared rate limiter
+        - Save and mark each chunk as it lands (resumable)
+        - Report throughput and coverage
+    Usage:
+        warmer = CacheWarmer()
+        report = await warmer.run(['AAPL', 'SPY'], ['1day:60', '5min:30'])
+        await warmer.close()
+    Note: Sessions whose bars can still change (today, and yesterday until its
+          post-market has passed in UTC) are never marked covered, so they
+          are fetched again on every run
+    """
+
+    def __init__(self, config=None, fetcher: Optional[AsyncDataFetcher] = None,
+                 storage=None):
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Initialize the warmer
+        Parameters:
+            - config (PolygonConfig, optional): Configuration instance
+            - fetcher (AsyncDataFetcher, optional): Fetcher for chunk requests
+            - storage (StorageManager, optional): Cache to fill
+        """
+        self.config = config or get_config()
+        self.logger = self.config.get_logger(__name__)
+        self._owns_fetcher = fetcher is None
+        self.fetcher = fetcher or AsyncDataFetcher(config=self.config)
+        self.storage = storage or self.fetcher.storage
+        self._progress: Dict[str, Any] = {}
+        self._started: Optional[float] = None
+
+    def plan(self, symbols: Sequence[str], specs: Sequence[WarmupSpec],
+             end_date: Optional[Union[str, datetime]] = None) -> List[Dict[str, Any]]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: List the chunks each symbol/spec still needs
+        Parameters:
+            - symbols (list): Normalized symbols
+            - specs (list): Warmup specs
+            - end_date (optional): Last day to warm (default: today)
+        Returns: list - Jobs with symbol, spec, start, end and chunks, in
+                 spec order so the first spec is warmed first
+        """
+        end_day = parse_date(end_date).date() if end_date else datetime.now(POLYGON_TIMEZONE).date()
+
+        jobs = []
+        for spec in specs:
+            multiplier, timespan = parse_timeframe(spec.timeframe)
+            start, end = spec.date_range(end_day)
+            for symbol in symbols:
+                missing_ranges = self.storage.get_missing_ranges(symbol, spec.timeframe, start, end)
+                chunks = [
+                    chunk
+                    for missing_start, missing_end in missing_ranges
+                    for chunk in self.fetcher.plan_chunks(
+                        missing_start, missing_end, multiplier, timespan
+                    )
+                ]
+                jobs.append({
+                    'symbol': symbol,
+                    'spec': spec,
+                    'start': start,
+                    'end': end,
+                    'chunks': chunks
+                })
+        return jobs
+
+    async def run(self, symbols: Sequence[str],
+                  specs: Optional[Sequence[Union[str, WarmupSpec]]] = None,
+                  end_date: Optional[Union[str, datetime]] = None,
+                  max_concurrency: Optional[int] = None,
+                  progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Warm the cache for a watchlist
+        Parameters:
+            - symbols (list): Watchlist symbols
+            - specs (list, optional): 'timeframe:sessions' specs (default: config.warmup_specs)
+            - end_date (optional): Last day to warm (default: today)
+            - max_concurrency (int, optional): Chunk requests in flight (default: config.warmup_concurrency)
+            - progress_callback (callable, optional): Called with get_progress() after each chunk
+        Returns: dict - Job/chunk counts, throughput, per-spec coverage and failures
+        Example: report = await warmer.run(['AAPL', 'SPY'], ['1day:60', '5min:30'])
+        """
+        symbols = list(dict.fromkeys(validate_symbol(symbol) for symbol in symbols))
+        specs = [WarmupSpec.parse(spec) for spec in (specs or self.config.warmup_specs)]
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or self.config.warmup_concurrency))
+
+        self._started = time.monotonic()
+        self._progress = {
+            'jobs': 0, 'jobs_cached': 0, 'jobs_warmed': 0, 'jobs_failed': 0,
+            'chunks': 0, 'chunks_fetched': 0, 'chunks_failed': 0, 'bars': 0
+        }
+        failed_symbols: Dict[str, str] = {}
+
+        jobs = await asyncio.to_thread(self.plan, symbols, specs, end_date)
+        self._progress['jobs'] = len(jobs)
+        self._progress['chunks'] = sum(len(job['chunks']) for job in jobs)
+        self.logger.info(
+            f"Warmup: {len(symbols)} symbols x {len(specs)} specs, "
+            f"{self._progress['chunks']} chunks to fetch"
+        )
+
+        async def fetch_chunk(job: Dict[str, Any], chunk_start: datetime, chunk_end: datetime) -> bool:
+            symbol, timeframe = job['symbol'], job['spec'].timeframe
+            multiplier, timespan = parse_timeframe(timeframe)
+
+            async with semaphore:
+                # Unknown symbols fail once, not once per chunk
+                if symbol in failed_symbols:
+                    self._progress['chunks_failed'] += 1
+                    return False
+                try:
+                    df = await self.fetcher.fetch_chunk(
+                        symbol, multiplier, timespan, chunk_start, chunk_end
+                    )
+                    await asyncio.to_thread(self._store, df, symbol, timeframe, chunk_start, chunk_end)
+                except PolygonSymbolError as e:
+                    failed_symbols[symbol] = str(e)
+                    self._progress['chunks_failed'] += 1
+                    return False
+                except Exception as e:
+                    self.logger.warning(
+                        f"Warmup chunk failed for {symbol} {timeframe} "
+                        f"{chunk_start.date()} to {chunk_end.date()}: {e}"
+                    )
+                    self._progress['chunks_failed'] += 1
+                    return False
+
+            self._progress['chunks_fetched'] += 1
+            self._progress['bars'] += len(df)
+            if progress_callback:
+                progress_callback(self.get_progress())
+            return True
+
+        async def warm_job(job: Dict[str, Any]):
+            if not job['chunks']:
+                self._progress['jobs_cached'] += 1
+                return
+            results = await asyncio.gather(*(
+                fetch_chunk(job, chunk_start, chunk_end) for chunk_start, chunk_end in job['chunks']
+            ))
+            self._progress['jobs_warmed' if all(results) else 'jobs_failed'] += 1
+
+        with request_priority(PRIORITY_BULK, caller='warmup', override=False):
+            await asyncio.gather(*(warm_job(job) for job in jobs))
+
+        report = self.get_progress()
+        report.update({
+            'symbols': len(symbols),
+            'specs': [str(spec) for spec in specs],
+            'coverage': await asyncio.to_thread(self.coverage, symbols, jobs),
+            'failed_symbols': failed_symbols
+        })
+
+        self.logger.info(
+            f"Warmup complete: {report['chunks_fetched']}/{report['chunks']} chunks, "
+            f"{report['bars']} bars in {report['elapsed_seconds']}s "
+            f"({report['chunks_per_second']} chunks/s), "
+            f"{report['jobs_cached']} of {report['jobs']} jobs already cached"
+        )
+        return report
+
+    def _store(self, df, symbol: str, timeframe: str,
+               chunk_start: datetime, chunk_end: datetime):
+        """Save a fetched chunk and mark its sessions covered (runs in a worker thread)"""
+        if not df.empty:
+            self.storage.save_data(df, symbol, timeframe)
+        self.storage.mark_coverage(symbol, timeframe, chunk_start, chunk_end)
+
+    def coverage(self, symbols: Sequence[str], jobs: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Cache coverage per spec over completed sessions
+        Parameters:
+            - symbols (list): Warmed symbols
+            - jobs (list): Jobs from plan()
+        Returns: dict - {spec: sessions, covered_sessions, coverage_pct, complete_symbols}
+        Note: Sessions that cannot be marked yet (see class note) are excluded
+        """
+        last_complete = self.storage.last_complete_day()
+        coverage: Dict[str, Dict[str, Any]] = {}
+
+        for job in jobs:
+            entry = coverage.setdefault(str(job['spec']), {
+                'sessions': 0, 'covered_sessions': 0, 'complete_symbols': 0
+            })
+            end = min(job['end'].date(), last_complete)
+            if end < job['start'].date():
+                entry['complete_symbols'] += 1
+                continue
+
+            summary = self.storage.get_coverage(job['symbol'], job['spec'].timeframe, job['start'], end)
+            entry['sessions'] += summary['sessions']
+            entry['covered_sessions'] += summary['covered_sessions']
+            if summary['covered_sessions'] == summary['sessions']:
+                entry['complete_symbols'] += 1
+
+        for entry in coverage.values():
+            entry['coverage_pct'] = round(
+                entry['covered_sessions'] / entry['sessions'] * 100 if entry['sessions'] else 100.0, 2
+            )
+            entry['symbols'] = len(symbols)
+        return coverage
+
+    def get_progress(self) -> Dict[str, Any]:
+        """
+        [FUNCTION SUMMARY]
+        Purpose: Counters and throughput of the current (or last) run
+        Returns: dict - Job/chunk/bar counts, elapsed time and rates
+        """
+        progress = dict(self._progress)
+        elapsed = time.monotonic() - self._started if self._started else 0.0
+        progress['elapsed_seconds'] = round(elapsed, 2)
+        progress['chunks_per_second'] = round(progress.get('chunks_fetched', 0) / elapsed, 2) if elapsed else 0.0
+        progress['bars_per_second'] = round(progress.get('bars', 0) / elapsed, 1) if elapsed else 0.0
+        return progress
+
+    async def close(self):
+        """Close the fetcher's HTTP session if this warmer created it"""
+        if self._owns_fetcher:
+            await self.fetcher.close()
+
+
+def warmup_cache(symbols: Sequence[str],
+                 specs: Optional[Sequence[Union[str, WarmupSpec]]] = None,
+                 end_date: Optional[Union[str, datetime]] = None,
+                 max_concurrency: Optional[int] = None) -> Dict[str, Any]:
+    """
+    [FUNCTION SUMMARY]
+    Purpose: Synchronous wrapper around CacheWarmer.run
+    Parameters: Same as CacheWarmer.run
+    Returns: dict - Warmup report
+    Example: report = warmup_cache(['AAPL', 'SPY'], ['1day:60', '5min:30', '1min:2'])
+    """
+    async def run():
+        warmer = CacheWarmer()
+        try:
+            return await warmer.run(symbols, specs, end_date, max_concurrency)
+        finally:
+            await warmer.close()
+
+    return asyncio.run(run())
+
+
+def read_watchlist(path: str) -> List[str]:
+    """
+    [FUNCTION SUMMARY]
+    Purpose: Read symbols from a watchlist file
+    Parameters:
+        - path (str): File with symbols separated by newlines, commas or spaces
+    Returns: list - Symbols in file order ('#' starts a comment)
+    """
+    symbols = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.split('#', 1)[0]
+            symbols.extend(token for token in line.replace(',', ' ').split() if token)
+    return symbols
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point; returns the process exit code"""
+    config = get_config()
+    parser = argparse.ArgumentParser(
+        prog='python -m polygon.warmup',
+        description='Fill the Polygon parquet cache for a watchlist before the open',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Specs are timeframe:sessions (trading days back from --end), e.g. 5min:30.
+Re-running resumes: sessions already cached are skipped.
+When the data server is running, POST /api/v1/cache/warmup instead so the
+warmup shares the server's rate limiter.
+
+Examples:
+  python -m polygon.warmup AAPL SPY QQQ
+  python -m polygon.warmup --watchlist watchlist.txt --spec 1day:60 --spec 1min:2
+        """
+    )
+    parser.add_argument('symbols', nargs='*', help='Symbols to warm')
+    parser.add_argument('--watchlist', action='append', default=[],
+                        help='File of symbols (newline, comma or space separated)')
+    parser.add_argument('--spec', action='append', dest='specs',
+                        help=f"timeframe:sessions, repeatable (default: {' '.join(config.warmup_specs)})")
+    parser.add_argument('--end', default=None, help='Last day to warm (default: today)')
+    parser.add_argument('--concurrency', type=int, default=None,
+                        help=f'Chunk requests in flight (default: {config.warmup_concurrency})')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+
+    args = parser.parse_args(argv)
+
+    symbols = list(args.symbols)
+    for path in args.watchlist:
+        symbols.extend(read_watchlist(path))
+    if not symbols:
+        parser.error('no symbols given (pass symbols or --watchlist)')
+
+    try:
+        specs = [WarmupSpec.parse(spec) for spec in (args.specs or config.warmup_specs)]
+    except PolygonDataError as e:
+        parser.error(str(e))
+
+    report = warmup_cache(symbols, specs, args.end, args.concurrency)
+
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+    else:
+        print(f"Symbols: {report['symbols']}  Specs: {', '.join(report['specs'])}")
+        print(
+            f"Jobs: {report['jobs']} ({report['jobs_cached']} already cached, "
+            f"{report['jobs_warmed']} warmed, {report['jobs_failed']} failed)"
+        )
+        print(
+            f"Chunks: {report['chunks_fetched']}/{report['chunks']} fetched, "
+            f"{report['chunks_failed']} failed, {report['bars']} bars"
+        )
+        print(
+            f"Elapsed: {report['elapsed_seconds']}s "
+            f"({report['chunks_per_second']} chunks/s, {report['bars_per_second']} bars/s)"
+        )
+        for spec, entry in report['coverage'].items():
+            print(
+                f"  {spec:<10} {entry['coverage_pct']:6.2f}% of completed sessions, "
+                f"{entry['complete_symbols']}/{entry['symbols']} symbols complete"
+            )
+        for symbol, error in report['failed_symbols'].items():
+            print(f"  FAILED {symbol}: {error}")
+
+    return 1 if report['jobs_failed'] else 0
+
+
+__all__ = [
+    'WarmupSpec',
+    'CacheWarmer',
+    'warmup_cache',
+    'read_watchlist'
+]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,7 +2,7 @@
 import asyncio
 import websockets
 import json
-from typing import Dict, List, Callable, Optional, Set
+from typing import Dict, List, Callable, Optional, Set, Tuple
 from datetime import datetime
 import logging
 from collections import defaultdict
@@ -11,6 +11,15 @@ from .config import get_config, POLYGON_TIMEZONE
 from .exceptions import PolygonWebSocketError, PolygonAuthenticationError, PolygonNetworkError
 from .utils import normalize_ohlcv_data
 from .validators import validate_ohlcv_integrity
+from .bar_aggregator import get_bar_aggregator
+
+# orjson decodes market data several times faster than the stdlib parser
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
 
 
 class PolygonWebSocketClient:
@@ -21,16 +30,21 @@ class PolygonWebSocketClient:
     and real-time data streaming with automatic reconnection.
     """
     
-    def __init__(self, config=None, storage=None):
+    def __init__(self, config=None, storage=None, aggregator=None):
         """
         Initialize WebSocket client
         
         Args:
             config: Configuration object (uses default if None)
             storage: Optional StorageManager for caching real-time data
+            aggregator: RealtimeBarAggregator to build bars from trades/AM
+                (shared aggregator if None and realtime_bars_enabled)
         """
         self.config = config or get_config()
         self.storage = storage
+        if aggregator is None and getattr(self.config, 'realtime_bars_enabled', False):
+            aggregator = get_bar_aggregator()
+        self.aggregator = aggregator
         self.logger = self.config.get_logger(__name__)
         
         # Connection settings
@@ -42,6 +56,16 @@ class PolygonWebSocketClient:
         # Subscription management
         self.subscriptions = defaultdict(set)  # {symbol: {channels}}
         self.callbacks = defaultdict(list)      # {symbol: [callbacks]}
+        self.batch_subscriptions: Set[str] = set()  # sub_ids receiving lists
+        self._async_callbacks: Dict[Callable, bool] = {}
+        
+        # Event type -> processor
+        self._processors = {
+            'T': self._process_trade,
+            'Q': self._process_quote,
+            'A': self._process_aggregate,
+            'AM': self._process_aggregate
+        }
         
         # Reconnection settings
         self.reconnect_attempts = 0
@@ -51,6 +75,8 @@ class PolygonWebSocketClient:
         
         # Performance tracking
         self.message_count = 0
+        self.event_count = 0
+        self.skipped_count = 0  # Events for symbols without callbacks
         self.last_message_time = None
         self.connection_start_time = None
         
@@ -147,7 +173,8 @@ class PolygonWebSocketClient:
             raise PolygonAuthenticationError(f"Authentication failed: {data}")
     
     async def subscribe(self, symbols: List[str], channels: List[str], 
-                       callback: Callable, subscription_id: Optional[str] = None):
+                       callback: Callable, subscription_id: Optional[str] = None,
+                       batch: bool = False):
         """
         Subscribe to real-time data for symbols
         
@@ -157,6 +184,8 @@ class PolygonWebSocketClient:
                      T = Trades, Q = Quotes, A = Aggregates, AM = Aggregate Minute
             callback: Async function to call with data
             subscription_id: Optional ID to track this subscription
+            batch: Call back once per WebSocket frame with a list of events
+                   instead of once per event
             
         Returns:
             str: Subscription ID for later unsubscribe
@@ -172,8 +201,13 @@ class PolygonWebSocketClient:
         
         # Store callbacks
         sub_id = subscription_id or f"sub_{datetime.now().timestamp()}"
+        if batch:
+            self.batch_subscriptions.add(sub_id)
         for symbol in symbols:
-            self.callbacks[symbol].append((sub_id, callback))
+            # A callback already registered for the symbol (e.g. on resubscribe
+            # or when adding channels) must not be called twice per message
+            if not any(cb == callback for _, cb in self.callbacks[symbol]):
+                self.callbacks[symbol].append((sub_id, callback))
             self.subscriptions[symbol].update(channels)
         
         # Build subscription message
@@ -275,20 +309,17 @@ class PolygonWebSocketClient:
             message: Raw message string from WebSocket
         """
         try:
-            data = json.loads(message)
+            data = _loads(message)
             
             # Handle different message types
-            if isinstance(data, list):
-                for item in data:
-                    await self._process_data_item(item)
-            else:
-                await self._process_data_item(data)
+            await self._dispatch(data if isinstance(data, list) else [data])
             
             # Update metrics
             self.message_count += 1
             self.last_message_time = datetime.now()
             
-        except json.JSONDecodeError as e:
+        except ValueError as e:
+            # json and orjson decode errors are both ValueErrors
             self.logger.error(f"Failed to parse message: {e}")
         except Exception as e:
             self.logger.error(f"Error processing message: {e}")
@@ -300,46 +331,86 @@ class PolygonWebSocketClient:
         Args:
             data: Parsed data dictionary
         """
-        # Get event type and symbol
-        event_type = data.get('ev')
-        symbol = data.get('sym')
-        
-        if not event_type or not symbol:
-            return
-        
-        # Get callbacks for this symbol
-        callbacks = self.callbacks.get(symbol, [])
+        await self._dispatch([data])
+    
+    async def _dispatch(self, items: List[Dict]):
+        """
+        Process the events of one WebSocket frame
         
-        # Process based on event type
-        processed_data = None
+        Events for symbols without callbacks are skipped before any
+        processing. Per-event callbacks are called in order; batch
+        callbacks receive one list per frame.
         
-        if event_type == 'T':  # Trade
-            processed_data = self._process_trade(data)
-        elif event_type == 'Q':  # Quote
-            processed_data = self._process_quote(data)
-        elif event_type in ['A', 'AM']:  # Aggregate
-            processed_data = self._process_aggregate(data)
-        elif event_type == 'status':  # Status message
-            await self._handle_status_message(data)
-            return
+        Args:
+            items: Parsed event dictionaries
+        """
+        processors = self._processors
+        batches: Dict[Tuple[str, Callable], List[Dict]] = {}
+        bar_events: List[Dict] = []
         
-        # Call registered callbacks
-        if processed_data:
+        for data in items:
+            event_type = data.get('ev')
+            processor = processors.get(event_type)
+            
+            if processor is None:
+                if event_type == 'status':  # Status message
+                    await self._handle_status_message(data)
+                continue
+            
+            symbol = data.get('sym')
+            callbacks = self.callbacks.get(symbol)
+            if not callbacks:
+                self.skipped_count += 1
+                continue
+            
+            processed_data = processor(data)
+            self.event_count += 1
+            
+            # Call registered callbacks
             for sub_id, callback in callbacks:
+                if sub_id in self.batch_subscriptions:
+                    batches.setdefault((sub_id, callback), []).append(processed_data)
+                    continue
                 try:
-                    if asyncio.iscoroutinefunction(callback):
+                    if self._is_async(callback):
                         await callback(processed_data)
                     else:
                         callback(processed_data)
                 except Exception as e:
                     self.logger.error(f"Callback error for {symbol}: {e}")
             
+            if event_type != 'Q':
+                bar_events.append(processed_data)
+            
             # Optionally update storage
             if self.storage and hasattr(self.storage, 'update_realtime'):
                 try:
                     await self.storage.update_realtime(symbol, processed_data)
                 except Exception as e:
                     self.logger.error(f"Storage update error: {e}")
+        
+        for (sub_id, callback), batch in batches.items():
+            try:
+                if self._is_async(callback):
+                    await callback(batch)
+                else:
+                    callback(batch)
+            except Exception as e:
+                self.logger.error(f"Batch callback error for {sub_id}: {e}")
+        
+        # Build real-time bars (flushed to the parquet cache at bar close)
+        if self.aggregator and bar_events:
+            try:
+                await self.aggregator.update_realtime_batch(bar_events)
+            except Exception as e:
+                self.logger.error(f"Bar aggregation error: {e}")
+    
+    def _is_async(self, callback: Callable) -> bool:
+        """Cached check whether a callback is a coroutine function"""
+        is_async = self._async_callbacks.get(callback)
+        if is_async is None:
+            is_async = self._async_callbacks[callback] = asyncio.iscoroutinefunction(callback)
+        return is_async
     
     def _process_trade(self, data: Dict) -> Dict:
         """Process trade data"""
@@ -464,6 +535,8 @@ class PolygonWebSocketClient:
                 for symbol, channels in self.subscriptions.items()
             },
             'message_count': self.message_count,
+            'event_count': self.event_count,
+            'skipped_count': self.skipped_count,
             'last_message_time': self.last_message_time.isoformat() if self.last_message_time else None,
             'uptime_seconds': (
                 (datetime.now() - self.connection_start_time).total_seconds()